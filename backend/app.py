@@ -15,10 +15,11 @@ from models import db
 # Import models to register them
 from models.user import User
 from models.resume import Resume, Skill
-from models.job import Job
+from models.job import Job, JobSkill
 from models.application import Application, SavedJob
-from models.interview import InterviewSession, InterviewQA
+from models.interview import InterviewSession, InterviewQA, QuestionBankEntry
 from models.profile_links import ProfileLinks
+from services.llm_client import llm_metrics
 
 
 def create_app(config_name='development'):
@@ -64,6 +65,14 @@ def create_app(config_name='development'):
     def health_check():
         return jsonify({'status': 'healthy', 'message': 'API is running'})
     
+    @app.route('/api/health/llm')
+    def llm_health():
+        metrics = llm_metrics()
+        if metrics is None:
+            return jsonify({'status': 'idle', 'message': 'No LLM calls made yet'})
+        metrics['status'] = 'degraded' if metrics['circuit']['state'] != 'closed' else 'healthy'
+        return jsonify(metrics)
+    
     # Error handlers
     @app.errorhandler(404)
     def not_found(error):
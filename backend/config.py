@@ -37,6 +37,13 @@ class Config:
     ADZUNA_APP_ID = os.getenv('ADZUNA_APP_ID')
     ADZUNA_APP_KEY = os.getenv('ADZUNA_APP_KEY')
     
+    # Job Feed Ingestion
+    INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', 500))
+    INGEST_MAX_ROWS = int(os.getenv('INGEST_MAX_ROWS', 50000))
+    
+    # Job Board Facets
+    FACET_CACHE_TTL = int(os.getenv('FACET_CACHE_TTL', 60))  # seconds
+    
     # Security
     BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
     
@@ -51,6 +58,33 @@ class Config:
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
     MAIL_USE_TLS = True
     
+    # LLM Provider (openai, local or fake) - read by services.llm_providers
+    LLM_PROVIDER = os.getenv('LLM_PROVIDER', 'openai')
+    LLM_BASE_URL = os.getenv('LLM_BASE_URL')  # OpenAI-compatible server for the local provider
+    LLM_MODEL = os.getenv('LLM_MODEL', 'gpt-3.5-turbo')
+    FAKE_LLM_LATENCY = float(os.getenv('FAKE_LLM_LATENCY', 0))  # seconds
+    LLM_POOL_SIZE = int(os.getenv('LLM_POOL_SIZE', 50))  # HTTP connections to the LLM API
+    LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 32))  # In-flight LLM calls per process
+    LLM_QUEUE_TIMEOUT = float(os.getenv('LLM_QUEUE_TIMEOUT', 10))  # seconds waiting for a free slot
+    LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', 60))  # Deadline per call, including retries
+    LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 3))  # On 429, 5xx, timeouts
+    LLM_BREAKER_THRESHOLD = int(os.getenv('LLM_BREAKER_THRESHOLD', 5))  # Consecutive failures to open the circuit
+    LLM_BREAKER_RESET = float(os.getenv('LLM_BREAKER_RESET', 30))  # seconds before a trial call
+    LLM_USER_DAILY_TOKENS = int(os.getenv('LLM_USER_DAILY_TOKENS', 200000))  # Per job seeker per UTC day (0 = unlimited)
+    LLM_GLOBAL_DAILY_TOKENS = int(os.getenv('LLM_GLOBAL_DAILY_TOKENS', 0))  # Whole service per UTC day (0 = unlimited)
+    INTERVIEW_ANSWER_TOKEN_BUDGET = int(os.getenv('INTERVIEW_ANSWER_TOKEN_BUDGET', 600))  # Answer length sent for grading
+    INTERVIEW_FEEDBACK_ANSWER_TOKEN_BUDGET = int(os.getenv('INTERVIEW_FEEDBACK_ANSWER_TOKEN_BUDGET', 120))  # Per answer in final feedback
+    
+    # Mock Interviews
+    INTERVIEW_LLM_WORKERS = int(os.getenv('INTERVIEW_LLM_WORKERS', 8))
+    INTERVIEW_PREFETCH_QUESTIONS = os.getenv('INTERVIEW_PREFETCH_QUESTIONS', 'true').lower() == 'true'
+    QUESTION_BANK_ENABLED = os.getenv('QUESTION_BANK_ENABLED', 'true').lower() == 'true'
+    QUESTION_BANK_MAX_POOL = int(os.getenv('QUESTION_BANK_MAX_POOL', 200))  # Questions per prompt signature
+    EVALUATION_CACHE_ENABLED = os.getenv('EVALUATION_CACHE_ENABLED', 'true').lower() == 'true'
+    EVALUATION_CACHE_SIZE = int(os.getenv('EVALUATION_CACHE_SIZE', 5000))  # Cached evaluations per process (LRU)
+    EVALUATION_CACHE_TTL = int(os.getenv('EVALUATION_CACHE_TTL', 86400))  # seconds
+    EVALUATION_CACHE_SIMILARITY = float(os.getenv('EVALUATION_CACHE_SIMILARITY', 0.85))  # MinHash Jaccard for near-duplicates
+    
     # NLP Models
     SPACY_MODEL = 'en_core_web_lg'
     
@@ -60,6 +94,24 @@ class Config:
     EXPERIENCE_WEIGHT = 0.25
     FRESHNESS_WEIGHT = 0.15
     LOCATION_WEIGHT = 0.1
+    
+    # Profile Scraping
+    SCRAPE_WORKERS = int(os.getenv('SCRAPE_WORKERS', 8))  # Concurrent upstream calls per process
+    SCRAPE_DEADLINE = float(os.getenv('SCRAPE_DEADLINE', 15))  # seconds for all calls of one scrape
+    SCRAPE_GITHUB_MAX_PAGES = int(os.getenv('SCRAPE_GITHUB_MAX_PAGES', 100))  # 100 repositories per page
+    SCRAPE_GITHUB_PAGE_CONCURRENCY = int(os.getenv('SCRAPE_GITHUB_PAGE_CONCURRENCY', 4))  # Repository pages fetched at once
+    SCRAPE_CACHE_BACKEND = os.getenv('SCRAPE_CACHE_BACKEND', 'sqlite')  # memory, sqlite or redis - read by services.scrape_cache
+    SCRAPE_CACHE_PATH = os.getenv('SCRAPE_CACHE_PATH')  # sqlite backend, shared by workers on a host (default: instance/scrape_cache.db)
+    SCRAPE_CACHE_URL = os.getenv('SCRAPE_CACHE_URL') or os.getenv('REDIS_URL')  # redis backend
+    SCRAPE_CACHE_MAX_ENTRIES = int(os.getenv('SCRAPE_CACHE_MAX_ENTRIES', 10000))
+    SCRAPE_CACHE_TTL = int(os.getenv('SCRAPE_CACHE_TTL', 86400))  # seconds served without refreshing
+    SCRAPE_CACHE_STALE_TTL = int(os.getenv('SCRAPE_CACHE_STALE_TTL', 604800))  # then served stale while refreshing
+    PROFILE_ANALYSIS_TTL = int(os.getenv('PROFILE_ANALYSIS_TTL', 86400))  # seconds /scrape serves the stored analysis
+    PROFILE_BATCH_WORKERS = int(os.getenv('PROFILE_BATCH_WORKERS', 4))  # Background analyses for recruiter batch lookups
+    PROFILE_REFRESH_TTL = int(os.getenv('PROFILE_REFRESH_TTL', 72000))  # refresh_profiles.py re-analyzes older profiles
+    PROFILE_REFRESH_BATCH = int(os.getenv('PROFILE_REFRESH_BATCH', 50))  # Profiles per scheduler pass
+    PROFILE_REFRESH_GITHUB_RESERVE = int(os.getenv('PROFILE_REFRESH_GITHUB_RESERVE', 100))  # GitHub calls left for users
+    PROFILE_REFRESH_LEETCODE_INTERVAL = float(os.getenv('PROFILE_REFRESH_LEETCODE_INTERVAL', 2))  # seconds between LeetCode calls
 
 
 class DevelopmentConfig(Config):
@@ -77,7 +129,7 @@ class ProductionConfig(Config):
 class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = 'postgresql://localhost/job_portal_test'
+    SQLALCHEMY_DATABASE_URI = os.getenv('TEST_DATABASE_URL', 'sqlite://')  # In-memory SQLite unless set
 
 
 # Configuration dictionary
@@ -0,0 +1,103 @@
+"""
+Local OpenAI-compatible stand-in server for offline development and load tests
+
+Serves deterministic replies from services.llm_providers.FakeLLM over the
+/v1/chat/completions API (including streaming), so the real OpenAI client and
+HTTP path are exercised without network access or API cost.
+
+Usage:
+    python fake_llm_server.py --port 8001 --latency 0.8 --token-delay 0.02
+    LLM_PROVIDER=local LLM_BASE_URL=http://localhost:8001/v1 python app.py
+"""
+import argparse
+import json
+import sys
+import time
+import uuid
+from flask import Flask, Response, jsonify, request
+from services.llm_providers import FakeLLM
+
+
+def create_server(llm):
+    """Flask app exposing llm through the OpenAI chat completions API"""
+    server = Flask(__name__)
+
+    @server.route('/v1/models', methods=['GET'])
+    def list_models():
+        return jsonify({'object': 'list', 'data': [{'id': 'fake-llm', 'object': 'model', 'owned_by': 'local'}]})
+
+    @server.route('/v1/chat/completions', methods=['POST'])
+    def chat_completions():
+        data = request.get_json(silent=True) or {}
+        messages = data.get('messages')
+        if not messages:
+            return jsonify({'error': {'message': 'messages is required', 'type': 'invalid_request_error'}}), 400
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        model = data.get('model', 'fake-llm')
+
+        if data.get('stream'):
+            def generate():
+                for text in llm.stream(messages):
+                    yield _chunk(completion_id, created, model, {'content': text}, None)
+                yield _chunk(completion_id, created, model, {}, 'stop')
+                yield 'data: [DONE]\n\n'
+
+            return Response(generate(), mimetype='text/event-stream')
+
+        text = llm.complete(messages)
+        prompt_tokens = sum(llm.count_tokens(m.get('content') or '') for m in messages)
+        completion_tokens = llm.count_tokens(text)
+
+        return jsonify({
+            'id': completion_id,
+            'object': 'chat.completion',
+            'created': created,
+            'model': model,
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': text},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens
+            }
+        })
+
+    @server.route('/stats', methods=['GET'])
+    def stats():
+        return jsonify({'calls': llm.calls})
+
+    return server
+
+
+def _chunk(completion_id, created, model, delta, finish_reason):
+    """One streamed chat.completion.chunk as an SSE data line"""
+    payload = {
+        'id': completion_id,
+        'object': 'chat.completion.chunk',
+        'created': created,
+        'model': model,
+        'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]
+    }
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OpenAI-compatible fake LLM server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds before the first token')
+    parser.add_argument('--token-delay', type=float, default=0.0, help='Seconds between streamed chunks')
+    args = parser.parse_args()
+
+    llm = FakeLLM(latency=args.latency, token_delay=args.token_delay)
+    create_server(llm).run(host=args.host, port=args.port, threaded=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
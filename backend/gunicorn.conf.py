@@ -0,0 +1,36 @@
+"""
+Gunicorn configuration
+
+Interview requests spend nearly all their time waiting on the LLM. With the
+default sync workers every in-flight interview call pins a whole process, so
+gevent workers are used when gevent is installed: sockets are cooperative and
+one worker holds up to GUNICORN_WORKER_CONNECTIONS concurrent requests.
+Falls back to threaded (gthread) workers otherwise.
+
+Usage:
+    gunicorn -c gunicorn.conf.py 'app:create_app()'
+    GUNICORN_WORKER_CLASS=sync gunicorn -c gunicorn.conf.py 'app:create_app()'
+"""
+import multiprocessing
+import os
+
+try:
+    import gevent  # noqa: F401
+    GEVENT_AVAILABLE = True
+except ImportError:
+    GEVENT_AVAILABLE = False
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', 5000)}")
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gevent' if GEVENT_AVAILABLE else 'gthread')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))  # Streamed interview feedback can take a while
+graceful_timeout = 30
+keepalive = 5
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+
+if worker_class == 'gevent':
+    worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+    # Pipeline threads are greenlets under gevent, so size the LLM pool to the worker
+    os.environ.setdefault('INTERVIEW_LLM_WORKERS', str(worker_connections))
+elif worker_class == 'gthread':
+    threads = int(os.getenv('GUNICORN_THREADS', 32))
@@ -0,0 +1,65 @@
+"""
+Command-line job feed ingestion
+
+Usage:
+    python ingest_jobs.py feeds/adzuna.jsonl --source adzuna
+    python ingest_jobs.py feeds/jobs.csv --source partner --batch-size 1000
+    python ingest_jobs.py --reindex-skills
+"""
+from dotenv import load_dotenv
+load_dotenv()
+
+import argparse
+import sys
+import time
+from app import create_app
+from services.job_ingestion import JobIngestor
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk upsert jobs from a JSON Lines or CSV feed')
+    parser.add_argument('feed', nargs='?', help='Path to the feed file')
+    parser.add_argument('--source', help='Feed source name stored on each job (e.g. adzuna)')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help='Feed format (default: from file extension)')
+    parser.add_argument('--batch-size', type=int, help='Rows per INSERT/UPDATE batch')
+    parser.add_argument('--max-rows', type=int, help='Stop after this many rows')
+    parser.add_argument('--reindex-skills', action='store_true', help='Rebuild the skill index for all jobs')
+    parser.add_argument('--config', default='development', help='Config name (development/production/testing)')
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+
+    with app.app_context():
+        ingestor = JobIngestor(batch_size=args.batch_size or app.config['INGEST_BATCH_SIZE'])
+
+        if args.reindex_skills:
+            started = time.perf_counter()
+            count = ingestor.rebuild_skill_index()
+            print(f"Reindexed skills for {count} jobs in {time.perf_counter() - started:.2f}s")
+            if not args.feed:
+                return 0
+
+        if not args.feed or not args.source:
+            parser.error('feed and --source are required unless only --reindex-skills is given')
+
+        fmt = args.format or JobIngestor.detect_format(args.feed)
+        if fmt is None:
+            parser.error('Cannot detect feed format, pass --format')
+
+        started = time.perf_counter()
+        with open(args.feed, encoding='utf-8', newline='') as stream:
+            stats = ingestor.ingest_feed(stream, fmt, args.source, max_rows=args.max_rows)
+        elapsed = time.perf_counter() - started
+
+        print(f"Processed {stats['processed']} rows in {elapsed:.2f}s "
+              f"({stats['processed'] / elapsed if elapsed else 0:.0f} rows/s)")
+        print(f"  inserted: {stats['inserted']}  updated: {stats['updated']}  "
+              f"skipped: {stats['skipped']}  failed: {stats['failed']}")
+        for error in stats['errors']:
+            print(f"  line {error['line']}: {error['error']}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Mock interview load test
+
+Runs concurrent interview sessions (start, answer N questions, complete)
+against a running API server and reports throughput and latency per endpoint.
+Test users with a resume are created directly in the server's database, so
+run it with the same DATABASE_URL / JWT_SECRET_KEY as the server.
+
+Usage:
+    python fake_llm_server.py --port 8001 --latency 1.0 &
+    LLM_PROVIDER=local LLM_BASE_URL=http://localhost:8001/v1 \\
+        gunicorn -c gunicorn.conf.py -w 1 'app:create_app()' &
+    python load_test_interview.py --users 100 --answers 2
+
+    # Compare against one sync worker
+    GUNICORN_WORKER_CLASS=sync LLM_PROVIDER=local LLM_BASE_URL=http://localhost:8001/v1 \\
+        gunicorn -c gunicorn.conf.py -w 1 'app:create_app()' &
+"""
+from dotenv import load_dotenv
+load_dotenv()
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from flask_jwt_extended import create_access_token
+from app import create_app
+from models import db
+from models.user import User
+from models.resume import Resume, Skill
+
+LOAD_TEST_SKILLS = ['Python', 'SQL', 'Flask', 'Docker']
+
+
+def setup_users(app, count):
+    """
+    Create (or reuse) load test job seekers with an active resume
+    Returns: list of access tokens
+    """
+    with app.app_context():
+        tokens = []
+        for i in range(count):
+            email = f'loadtest-{i}@example.com'
+            user = User.query.filter_by(email=email).first()
+            if not user:
+                user = User(email=email, role='job_seeker', full_name=f'Load Test {i}')
+                user.set_password('load-test-password')
+                db.session.add(user)
+                db.session.flush()
+
+                resume = Resume(user_id=user.id, file_name='load-test.pdf', total_experience_months=24, is_active=True)
+                db.session.add(resume)
+                db.session.flush()
+                db.session.add_all([Skill(resume_id=resume.id, skill_name=name) for name in LOAD_TEST_SKILLS])
+
+            tokens.append(create_access_token(identity=str(user.id)))
+
+        db.session.commit()
+        return tokens
+
+
+class LoadStats:
+    """Thread-safe latency samples per endpoint"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def record(self, name, elapsed, ok):
+        with self.lock:
+            self.latencies[name].append(elapsed)
+            if not ok:
+                self.errors[name] += 1
+
+    def report(self, wall_time):
+        total = sum(len(samples) for samples in self.latencies.values())
+        print(f"{total} requests in {wall_time:.2f}s ({total / wall_time:.1f} req/s)")
+        print(f"  {'endpoint':<10} {'count':>6} {'errors':>6} {'p50':>8} {'p95':>8} {'max':>8}")
+        for name, samples in self.latencies.items():
+            ordered = sorted(samples)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            print(f"  {name:<10} {len(samples):>6} {self.errors[name]:>6} "
+                  f"{statistics.median(ordered):>7.2f}s {p95:>7.2f}s {ordered[-1]:>7.2f}s")
+
+
+def run_session(base_url, token, answers, stats, timeout):
+    """One interview: start, answer `answers` questions, complete"""
+    http = requests.Session()
+    http.headers['Authorization'] = f'Bearer {token}'
+
+    def call(name, path, payload=None):
+        started = time.perf_counter()
+        try:
+            response = http.post(f'{base_url}/api/interview{path}', json=payload, timeout=timeout)
+            ok = response.ok
+            body = response.json() if ok else None
+        except requests.RequestException:
+            ok, body = False, None
+        stats.record(name, time.perf_counter() - started, ok)
+        return body
+
+    started = call('start', '/start', {'job_role': 'Backend Developer', 'interview_type': 'Technical'})
+    if not started:
+        return
+
+    session_id = started['session_id']
+    for question_number in range(1, answers + 1):
+        answered = call('answer', '/answer', {
+            'session_id': session_id,
+            'question_number': question_number,
+            'answer': 'I would profile first, then fix the slowest query and add caching where reads dominate.'
+        })
+        if not answered or not answered.get('next_question'):
+            break
+
+    call('complete', f'/{session_id}/complete')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent mock interview load test')
+    parser.add_argument('--base-url', default='http://localhost:5000')
+    parser.add_argument('--users', type=int, default=50, help='Concurrent interview sessions')
+    parser.add_argument('--answers', type=int, default=2, help='Questions answered per session')
+    parser.add_argument('--timeout', type=float, default=300, help='Per-request timeout in seconds')
+    parser.add_argument('--config', default='development', help='Config name (development/production/testing)')
+    args = parser.parse_args()
+
+    tokens = setup_users(create_app(args.config), args.users)
+    stats = LoadStats()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as executor:
+        for token in tokens:
+            executor.submit(run_session, args.base_url.rstrip('/'), token, args.answers, stats, args.timeout)
+    stats.report(time.perf_counter() - started)
+
+    return 1 if any(stats.errors.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,2 @@
+-- Rank applicants by precomputed match score
+CREATE INDEX IF NOT EXISTS idx_applications_job_score ON applications(job_id, match_score);
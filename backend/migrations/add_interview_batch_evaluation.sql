@@ -0,0 +1,3 @@
+-- Batch ("exam mode") interviews: answers are graded together at completion
+ALTER TABLE interview_sessions
+    ADD COLUMN IF NOT EXISTS evaluation_mode VARCHAR(10) DEFAULT 'live';
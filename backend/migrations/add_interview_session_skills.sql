@@ -0,0 +1,3 @@
+-- Snapshot of candidate skills taken when an interview starts, so answer
+-- submission does not re-read the resume for every question
+ALTER TABLE interview_sessions ADD COLUMN IF NOT EXISTS skills JSONB;
@@ -0,0 +1,18 @@
+-- Incrementally maintained interview score totals per user, interview type ('all' = every type)
+-- and week ('all' = all time). A user's earlier sessions are counted before their first update
+-- or summary request; the ('all', 'all') row marks users whose totals are complete.
+CREATE TABLE IF NOT EXISTS interview_stats (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    interview_type VARCHAR(50) NOT NULL,
+    period VARCHAR(10) NOT NULL,
+    answers_count INTEGER DEFAULT 0,
+    score_sum DOUBLE PRECISION DEFAULT 0,
+    technical_sum DOUBLE PRECISION DEFAULT 0,
+    clarity_sum DOUBLE PRECISION DEFAULT 0,
+    relevance_sum DOUBLE PRECISION DEFAULT 0,
+    sessions_completed INTEGER DEFAULT 0,
+    overall_score_sum DOUBLE PRECISION DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT unique_interview_stats_scope UNIQUE(user_id, interview_type, period)
+);
@@ -0,0 +1,11 @@
+-- LLM token accounting for mock interviews
+ALTER TABLE interview_sessions
+    ADD COLUMN IF NOT EXISTS prompt_tokens INTEGER DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS completion_tokens INTEGER DEFAULT 0;
+
+ALTER TABLE interview_qa
+    ADD COLUMN IF NOT EXISTS prompt_tokens INTEGER DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS completion_tokens INTEGER DEFAULT 0;
+
+-- A user's sessions newest first (/api/interview/history)
+CREATE INDEX IF NOT EXISTS idx_interview_sessions_user_start ON interview_sessions(user_id, start_time);
@@ -0,0 +1,23 @@
+-- LLM tokens per user and UTC day they were spent, for daily budgets
+-- (a session running past midnight charges each day its own tokens)
+CREATE TABLE IF NOT EXISTS interview_token_usage (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    prompt_tokens INTEGER DEFAULT 0,
+    completion_tokens INTEGER DEFAULT 0,
+    CONSTRAINT unique_interview_token_usage_day UNIQUE(user_id, day)
+);
+
+CREATE INDEX IF NOT EXISTS idx_interview_token_usage_day ON interview_token_usage(day);
+
+-- Spend recorded before this table existed is attributed to the day its session started
+INSERT INTO interview_token_usage (user_id, day, prompt_tokens, completion_tokens)
+SELECT user_id, CAST(start_time AS DATE), SUM(COALESCE(prompt_tokens, 0)), SUM(COALESCE(completion_tokens, 0))
+FROM interview_sessions
+WHERE COALESCE(prompt_tokens, 0) + COALESCE(completion_tokens, 0) > 0
+GROUP BY user_id, CAST(start_time AS DATE)
+ON CONFLICT (user_id, day) DO NOTHING;
+
+-- Budgets no longer scan sessions by start time
+DROP INDEX IF EXISTS idx_interview_sessions_start;
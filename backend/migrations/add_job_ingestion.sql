@@ -0,0 +1,19 @@
+-- Bulk job feed ingestion: upsert key and normalized skill index
+
+-- Upserts from external feeds are keyed on (source, external_url)
+ALTER TABLE jobs
+    ADD CONSTRAINT unique_job_source_url UNIQUE (source, external_url);
+
+-- Skill index (one row per job/skill pair, skill_name lowercased)
+CREATE TABLE IF NOT EXISTS job_skills (
+    id SERIAL PRIMARY KEY,
+    job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    skill_name VARCHAR(100) NOT NULL,
+    UNIQUE(job_id, skill_name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_skills_job_id ON job_skills(job_id);
+CREATE INDEX IF NOT EXISTS idx_job_skills_skill_name ON job_skills(skill_name);
+
+-- Populate the index for existing jobs afterwards with:
+--   python ingest_jobs.py --reindex-skills
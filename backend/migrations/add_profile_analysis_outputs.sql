@@ -0,0 +1,7 @@
+-- Analyzer outputs stored at scrape time, so the profile report is a plain read.
+-- Rows without an analyzer_version (analyzed before this migration) are recomputed
+-- from their stored github_data / leetcode_data on their next report request.
+ALTER TABLE profile_links
+    ADD COLUMN IF NOT EXISTS github_analysis JSON,
+    ADD COLUMN IF NOT EXISTS leetcode_analysis JSON,
+    ADD COLUMN IF NOT EXISTS analyzer_version INTEGER;
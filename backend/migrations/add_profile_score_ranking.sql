@@ -0,0 +1,14 @@
+-- Number of analyzed profiles per overall score, overall ('all') and per primary GitHub
+-- language ('lang:<language>'), for percentile and rank queries without scanning profile_links.
+-- Existing analyses are counted when refresh_profiles.py next starts (or run it with --rebuild-ranking).
+CREATE TABLE IF NOT EXISTS profile_score_histogram (
+    id SERIAL PRIMARY KEY,
+    segment VARCHAR(100) NOT NULL,
+    score INTEGER NOT NULL,
+    count INTEGER DEFAULT 0,
+    CONSTRAINT unique_profile_score_bucket UNIQUE(segment, score)
+);
+
+ALTER TABLE profile_links
+    ADD COLUMN IF NOT EXISTS ranked_score INTEGER,
+    ADD COLUMN IF NOT EXISTS ranked_segment VARCHAR(100);
@@ -0,0 +1,21 @@
+-- Shared interview question bank keyed by normalized prompt signature
+CREATE TABLE IF NOT EXISTS interview_question_bank (
+    id SERIAL PRIMARY KEY,
+    signature VARCHAR(64) NOT NULL,
+    question TEXT NOT NULL,
+    question_hash VARCHAR(64) NOT NULL,
+    job_role VARCHAR(255),
+    interview_type VARCHAR(50),
+    difficulty_level VARCHAR(20),
+    times_served INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(signature, question_hash)
+);
+
+CREATE INDEX IF NOT EXISTS idx_question_bank_signature ON interview_question_bank(signature);
+
+-- Which bank entry each asked question came from (per-user de-duplication)
+ALTER TABLE interview_qa
+    ADD COLUMN IF NOT EXISTS bank_question_id INTEGER REFERENCES interview_question_bank(id) ON DELETE SET NULL;
+
+CREATE INDEX IF NOT EXISTS idx_interview_qa_bank_question ON interview_qa(bank_question_id);
@@ -21,6 +21,7 @@ class Application(db.Model):
     
     __table_args__ = (
         db.UniqueConstraint('user_id', 'job_id', name='unique_user_job_application'),
+        db.Index('idx_applications_job_score', 'job_id', 'match_score'),
     )
     
     def to_dict(self):
@@ -15,16 +15,24 @@ class InterviewSession(db.Model):
     job_role = db.Column(db.String(255))
     interview_type = db.Column(db.String(50))  # HR, Technical, Behavioral
     difficulty_level = db.Column(db.String(20))  # Easy, Medium, Hard
+    skills = db.Column(db.JSON)  # Candidate skills snapshot used for question generation
+    evaluation_mode = db.Column(db.String(10), default='live')  # live (per answer) or batch (graded at completion)
     start_time = db.Column(db.DateTime, default=datetime.utcnow)
     end_time = db.Column(db.DateTime)
     total_questions = db.Column(db.Integer)
     overall_score = db.Column(db.Numeric(4, 2))
     performance_level = db.Column(db.String(20))  # Beginner, Intermediate, Job-Ready
     feedback_summary = db.Column(db.Text)
+    prompt_tokens = db.Column(db.Integer, default=0)  # LLM tokens spent on this session
+    completion_tokens = db.Column(db.Integer, default=0)
     
     # Relationships
     questions = db.relationship('InterviewQA', backref='session', lazy=True, cascade='all, delete-orphan')
     
+    __table_args__ = (
+        db.Index('idx_interview_sessions_user_start', 'user_id', 'start_time'),  # /history, newest first
+    )
+    
     def to_dict(self):
         """Convert interview session to dictionary"""
         return {
@@ -33,12 +41,15 @@ class InterviewSession(db.Model):
             'job_role': self.job_role,
             'interview_type': self.interview_type,
             'difficulty_level': self.difficulty_level,
+            'evaluation_mode': self.evaluation_mode or 'live',
             'start_time': self.start_time.isoformat() if self.start_time else None,
             'end_time': self.end_time.isoformat() if self.end_time else None,
             'total_questions': self.total_questions,
             'overall_score': float(self.overall_score) if self.overall_score else None,
             'performance_level': self.performance_level,
-            'feedback_summary': self.feedback_summary
+            'feedback_summary': self.feedback_summary,
+            'prompt_tokens': self.prompt_tokens or 0,
+            'completion_tokens': self.completion_tokens or 0
         }
     
     def __repr__(self):
@@ -64,6 +75,11 @@ class InterviewQA(db.Model):
     strengths = db.Column(db.Text)
     improvements = db.Column(db.Text)
     answered_at = db.Column(db.DateTime, default=datetime.utcnow)
+    bank_question_id = db.Column(
+        db.Integer, db.ForeignKey('interview_question_bank.id', ondelete='SET NULL'), index=True
+    )  # Question bank entry this question was served from
+    prompt_tokens = db.Column(db.Integer, default=0)  # LLM tokens for generating and grading this question
+    completion_tokens = db.Column(db.Integer, default=0)
     
     def to_dict(self):
         """Convert QA to dictionary"""
@@ -81,8 +97,111 @@ class InterviewQA(db.Model):
             'feedback': self.feedback,
             'strengths': self.strengths,
             'improvements': self.improvements,
-            'answered_at': self.answered_at.isoformat() if self.answered_at else None
+            'answered_at': self.answered_at.isoformat() if self.answered_at else None,
+            'prompt_tokens': self.prompt_tokens or 0,
+            'completion_tokens': self.completion_tokens or 0
         }
     
     def __repr__(self):
         return f'<InterviewQA {self.id} - Q{self.question_number}>'
+
+
+class QuestionBankEntry(db.Model):
+    """Generated interview question shared across sessions with the same prompt signature"""
+    
+    __tablename__ = 'interview_question_bank'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    signature = db.Column(db.String(64), nullable=False, index=True)  # SHA-256 of normalized prompt
+    question = db.Column(db.Text, nullable=False)
+    question_hash = db.Column(db.String(64), nullable=False)  # SHA-256 of normalized question text
+    job_role = db.Column(db.String(255))
+    interview_type = db.Column(db.String(50))
+    difficulty_level = db.Column(db.String(20))
+    times_served = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint('signature', 'question_hash', name='unique_bank_signature_question'),
+    )
+    
+    def to_dict(self):
+        """Convert bank entry to dictionary"""
+        return {
+            'id': self.id,
+            'question': self.question,
+            'job_role': self.job_role,
+            'interview_type': self.interview_type,
+            'difficulty_level': self.difficulty_level,
+            'times_served': self.times_served,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+    
+    def __repr__(self):
+        return f'<QuestionBankEntry {self.id} - {self.signature[:8]}>'
+
+
+class InterviewTokenUsage(db.Model):
+    """LLM tokens a user spent on mock interviews per UTC day (when the tokens were used)"""
+    
+    __tablename__ = 'interview_token_usage'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    prompt_tokens = db.Column(db.Integer, default=0)
+    completion_tokens = db.Column(db.Integer, default=0)
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'day', name='unique_interview_token_usage_day'),
+        db.Index('idx_interview_token_usage_day', 'day'),  # Global daily budget
+    )
+    
+    def __repr__(self):
+        return f'<InterviewTokenUsage {self.user_id} - {self.day}>'
+
+
+class InterviewStats(db.Model):
+    """Incrementally maintained interview score totals per user, interview type and week"""
+    
+    __tablename__ = 'interview_stats'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    interview_type = db.Column(db.String(50), nullable=False)  # HR/Technical/Behavioral, or 'all'
+    period = db.Column(db.String(10), nullable=False)  # Monday of the session's week (YYYY-MM-DD), or 'all'
+    answers_count = db.Column(db.Integer, default=0)
+    score_sum = db.Column(db.Float, default=0)
+    technical_sum = db.Column(db.Float, default=0)
+    clarity_sum = db.Column(db.Float, default=0)
+    relevance_sum = db.Column(db.Float, default=0)
+    sessions_completed = db.Column(db.Integer, default=0)
+    overall_score_sum = db.Column(db.Float, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'interview_type', 'period', name='unique_interview_stats_scope'),
+    )
+    
+    def to_dict(self):
+        """Convert stats to dictionary of averages"""
+        answers = self.answers_count or 0
+        completed = self.sessions_completed or 0
+        
+        def average(total, count):
+            return round(total / count, 2) if count else None
+        
+        return {
+            'interview_type': self.interview_type,
+            'period': self.period,
+            'answers': answers,
+            'sessions_completed': completed,
+            'average_score': average(self.score_sum or 0, answers),
+            'average_technical': average(self.technical_sum or 0, answers),
+            'average_clarity': average(self.clarity_sum or 0, answers),
+            'average_relevance': average(self.relevance_sum or 0, answers),
+            'average_overall_score': average(self.overall_score_sum or 0, completed)
+        }
+    
+    def __repr__(self):
+        return f'<InterviewStats {self.user_id} - {self.interview_type} - {self.period}>'
@@ -29,9 +29,14 @@ class Job(db.Model):
     external_url = db.Column(db.Text)
     view_count = db.Column(db.Integer, default=0)
     
+    __table_args__ = (
+        db.UniqueConstraint('source', 'external_url', name='unique_job_source_url'),
+    )
+    
     # Relationships
     applications = db.relationship('Application', backref='job', lazy=True, cascade='all, delete-orphan')
     saved_by = db.relationship('SavedJob', backref='job', lazy=True, cascade='all, delete-orphan')
+    skills = db.relationship('JobSkill', backref='job', lazy=True, cascade='all, delete-orphan')
     
     def to_dict(self, include_description=True):
         """Convert job to dictionary"""
@@ -62,3 +67,20 @@ class Job(db.Model):
     
     def __repr__(self):
         return f'<Job {self.id} - {self.title}>'
+
+
+class JobSkill(db.Model):
+    """Normalized skill index for job postings (one row per job/skill pair)"""
+    
+    __tablename__ = 'job_skills'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), nullable=False, index=True)
+    skill_name = db.Column(db.String(100), nullable=False, index=True)  # Lowercased
+    
+    __table_args__ = (
+        db.UniqueConstraint('job_id', 'skill_name', name='unique_job_skill'),
+    )
+    
+    def __repr__(self):
+        return f'<JobSkill {self.job_id} - {self.skill_name}>'
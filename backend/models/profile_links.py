@@ -27,6 +27,15 @@ class ProfileLinks(db.Model):
     leetcode_score = db.Column(db.Integer, default=0)
     overall_score = db.Column(db.Integer, default=0)
     
+    # Analyzer outputs (score, insights, strengths, improvements) and the analyzer version that produced them
+    github_analysis = db.Column(JSON)
+    leetcode_analysis = db.Column(JSON)
+    analyzer_version = db.Column(db.Integer)
+    
+    # Score and segment currently counted in profile_score_histogram
+    ranked_score = db.Column(db.Integer)
+    ranked_segment = db.Column(db.String(100))
+    
     # AI-generated recommendations (JSON array)
     recommendations = db.Column(JSON)
     
@@ -53,7 +62,25 @@ class ProfileLinks(db.Model):
             'github_data': self.github_data,
             'leetcode_data': self.leetcode_data,
             'recommendations': self.recommendations,
+            'analyzer_version': self.analyzer_version,
             'last_analyzed_at': self.last_analyzed_at.isoformat() if self.last_analyzed_at else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+
+
+class ProfileScoreHistogram(db.Model):
+    """Number of analyzed profiles per overall score (0-100), overall and per skill segment"""
+    __tablename__ = 'profile_score_histogram'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    segment = db.Column(db.String(100), nullable=False)  # 'all', or 'lang:<primary GitHub language>'
+    score = db.Column(db.Integer, nullable=False)
+    count = db.Column(db.Integer, default=0)
+    
+    __table_args__ = (
+        db.UniqueConstraint('segment', 'score', name='unique_profile_score_bucket'),
+    )
+    
+    def __repr__(self):
+        return f'<ProfileScoreHistogram {self.segment} - {self.score}: {self.count}>'
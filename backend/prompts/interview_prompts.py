@@ -1,13 +1,20 @@
 """
 Interview prompts for AI mock interview system
 """
+import hashlib
+import os
+from utils.tokens import truncate_to_tokens
 
 
 class InterviewPrompts:
     """Structured prompts for AI interview system"""
     
+    # Prompt compaction budgets (tokens) - long answers are cut to these before being sent
+    ANSWER_TOKEN_BUDGET = int(os.getenv('INTERVIEW_ANSWER_TOKEN_BUDGET', 600))  # Per answer being graded
+    FEEDBACK_ANSWER_TOKEN_BUDGET = int(os.getenv('INTERVIEW_FEEDBACK_ANSWER_TOKEN_BUDGET', 120))  # Per answer in final feedback
+    
     @staticmethod
-    def generate_question_prompt(job_role, skills, experience_level, interview_type, question_number):
+    def generate_question_prompt(job_role, skills, experience_level, interview_type, question_number, avoid=None):
         """
         Generate prompt for creating interview questions
         
@@ -17,6 +24,7 @@ class InterviewPrompts:
             experience_level: Beginner/Intermediate/Expert
             interview_type: HR/Technical/Behavioral
             question_number: Current question number
+            avoid: Questions the candidate has already been asked
         """
         skills_str = ', '.join(skills[:10])  # Limit to top 10 skills
         
@@ -73,10 +81,32 @@ Generate ONE behavioral interview question using the STAR method (Situation, Tas
 
 Return ONLY the question, nothing else."""
         
+        if avoid:
+            asked = '\n'.join(f"- {question}" for question in avoid)
+            prompt += f"\n\nThe candidate has already been asked these questions; ask a different one:\n{asked}"
+        
         return prompt
     
-    @staticmethod
-    def evaluate_answer_prompt(question, user_answer, job_role, interview_type):
+    @classmethod
+    def question_signature(cls, job_role, skills, experience_level, interview_type):
+        """
+        Stable key for the question prompt of a candidate shape
+        
+        Role and skills are normalized and the question number is fixed, so every
+        session with the same role/type/level/skill set maps to the same signature.
+        Skills only count when the prompt for that interview type uses them, and
+        editing a prompt template changes its signatures.
+        """
+        normalized_role = ' '.join((job_role or '').lower().split())
+        normalized_skills = sorted({s.strip().lower() for s in (skills or []) if s and s.strip()})
+        
+        prompt = cls.generate_question_prompt(
+            normalized_role, normalized_skills, experience_level, interview_type, 0
+        )
+        return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def evaluate_answer_prompt(cls, question, user_answer, job_role, interview_type):
         """
         Generate prompt for evaluating candidate's answer
         
@@ -92,7 +122,7 @@ Interview Type: {interview_type}
 Question: {question}
 
 Candidate's Answer:
-{user_answer}
+{truncate_to_tokens(user_answer, cls.ANSWER_TOKEN_BUDGET)}
 
 Evaluate this answer and provide:
 
@@ -121,8 +151,8 @@ MODEL_ANSWER:
         
         return prompt
     
-    @staticmethod
-    def final_feedback_prompt(session_data):
+    @classmethod
+    def final_feedback_prompt(cls, session_data):
         """
         Generate prompt for final interview feedback
         
@@ -130,7 +160,9 @@ MODEL_ANSWER:
             session_data: Dict with job_role, questions, answers, scores
         """
         qa_summary = "\n\n".join([
-            f"Q{i+1}: {qa['question']}\nAnswer: {qa['answer']}\nScore: {qa['score']}/10"
+            f"Q{i+1}: {qa['question']}\n"
+            f"Answer: {truncate_to_tokens(qa['answer'], cls.FEEDBACK_ANSWER_TOKEN_BUDGET)}\n"
+            f"Score: {qa['score']}/10"
             for i, qa in enumerate(session_data['qa_pairs'])
         ])
         
@@ -161,3 +193,60 @@ Provide comprehensive final feedback including:
 Be encouraging but honest. Provide actionable advice."""
         
         return prompt
+    
+    @classmethod
+    def batch_evaluation_prompt(cls, session_data):
+        """
+        Generate prompt for grading a whole session and writing its final feedback in one call
+        
+        Args:
+            session_data: Dict with job_role, interview_type, qa_pairs (question_number, question, answer)
+        """
+        qa_summary = "\n\n".join([
+            f"Q{qa['question_number']}: {qa['question']}\n"
+            f"Answer: {truncate_to_tokens(qa['answer'], cls.ANSWER_TOKEN_BUDGET)}"
+            for qa in session_data['qa_pairs']
+        ])
+        
+        prompt = f"""You are an expert interview evaluator and career coach for a {session_data['job_role']} position.
+
+Interview Type: {session_data['interview_type']}
+Number of Questions: {len(session_data['qa_pairs'])}
+
+Questions and Candidate Answers:
+{qa_summary}
+
+Evaluate EVERY answer, then give final feedback on the whole interview.
+
+For each answer provide:
+- score (0-10): Overall quality of the answer
+- technical_correctness (0-10): How accurate is the answer (for technical questions)
+- clarity (0-10): How clear and well-structured is the answer
+- relevance (0-10): How relevant is the answer to the question
+- strengths: 2-3 things the candidate did well
+- improvements: 2-3 things that could be better
+- model_answer: A brief example of a strong answer
+
+For the interview overall provide:
+- feedback: Overall performance summary, key strengths, areas for improvement with specific advice, and next steps. Be encouraging but honest.
+- performance_level: One of "Beginner" (needs significant practice), "Intermediate" (good foundation, needs refinement) or "Job-Ready" (well-prepared for real interviews)
+
+Respond with a single JSON object EXACTLY in this shape:
+{{
+  "evaluations": [
+    {{
+      "question_number": 1,
+      "score": 7,
+      "technical_correctness": 6,
+      "clarity": 8,
+      "relevance": 7,
+      "strengths": ["..."],
+      "improvements": ["..."],
+      "model_answer": "..."
+    }}
+  ],
+  "feedback": "...",
+  "performance_level": "Intermediate"
+}}"""
+        
+        return prompt
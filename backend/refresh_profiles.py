@@ -0,0 +1,75 @@
+"""
+Background profile refresh
+
+Re-scrapes and re-analyzes GitHub/LeetCode profiles whose analysis is older
+than PROFILE_REFRESH_TTL, oldest first, within the GitHub rate limit window
+and LeetCode pacing, so /api/profile-analysis/scrape answers from stored
+analyses. Run one instance per deployment (e.g. as a systemd service), or
+--once from cron. On start it also counts profiles analyzed before the score
+histograms existed into them (--rebuild-ranking recounts every profile and exits).
+
+Usage:
+    python refresh_profiles.py
+    python refresh_profiles.py --once --batch-size 200
+    python refresh_profiles.py --rebuild-ranking
+"""
+from dotenv import load_dotenv
+load_dotenv()
+
+import argparse
+import logging
+import signal
+import sys
+import threading
+from datetime import timedelta
+from app import create_app
+from routes.profile_analysis import get_scraper, get_analyzer
+from services.profile_refresh import ProfileRefreshScheduler, ranking
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh stale profile analyses in the background')
+    parser.add_argument('--once', action='store_true', help='Run a single pass and exit')
+    parser.add_argument('--batch-size', type=int, help='Profiles refreshed per pass')
+    parser.add_argument('--rebuild-ranking', action='store_true',
+                        help='Recount every analyzed profile into the score histograms and exit')
+    parser.add_argument('--config', default='development', help='Config name (development/production/testing)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    app = create_app(args.config)
+
+    with app.app_context():
+        if args.rebuild_ranking or ranking.has_unranked_profiles():
+            print(f"Counted {ranking.rebuild()} analyzed profiles into the score histograms")
+            if args.rebuild_ranking:
+                return 0
+
+        scheduler = ProfileRefreshScheduler(
+            get_scraper(),
+            get_analyzer(),
+            ttl=timedelta(seconds=app.config['PROFILE_REFRESH_TTL']),
+            batch_size=args.batch_size or app.config['PROFILE_REFRESH_BATCH'],
+            github_reserve=app.config['PROFILE_REFRESH_GITHUB_RESERVE'],
+            leetcode_interval=app.config['PROFILE_REFRESH_LEETCODE_INTERVAL']
+        )
+
+        if args.once:
+            refreshed, _ = scheduler.run_once()
+            print(f"Refreshed {refreshed} profiles, {len(scheduler.queue)} still queued "
+                  f"(GitHub quota: {scheduler.scraper.rate_limits['github'].to_dict()}, "
+                  f"conditional requests: {scheduler.scraper.conditional_stats})")
+            return 0
+
+        stop_event = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+        try:
+            scheduler.run_forever(stop_event)
+        except KeyboardInterrupt:
+            pass
+        print(f"Stopped: {scheduler.stats}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
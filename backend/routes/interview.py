@@ -1,13 +1,21 @@
 """
 Mock interview routes
 """
-from flask import Blueprint, request, jsonify
+import json
+from concurrent.futures import Future
+from flask import Blueprint, request, jsonify, Response, stream_with_context, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 from models import db
 from models.interview import InterviewSession, InterviewQA
 from models.user import User
+from services.evaluation_cache import EvaluationCache
 from services.interview_ai import InterviewAI
+from services.interview_analytics import InterviewAnalytics
+from services.interview_pipeline import InterviewPipeline
+from services.question_bank import QuestionBank, QuestionAlreadyAsked
+from services.token_budget import TokenBudget, TokenBudgetExceeded
+from utils.tokens import TokenUsage
 
 interview_bp = Blueprint('interview', __name__)
 
@@ -25,35 +33,475 @@ def get_ai_service():
     return ai_service
 
 
+pipeline = None
+
+def get_pipeline():
+    """Lazy initialization of the concurrent LLM pipeline"""
+    global pipeline
+    if pipeline is None:
+        pipeline = InterviewPipeline(
+            get_ai_service(),
+            max_workers=current_app.config['INTERVIEW_LLM_WORKERS'],
+            prefetch=current_app.config['INTERVIEW_PREFETCH_QUESTIONS']
+        )
+    return pipeline
+
+
+question_bank = None
+
+def get_question_bank():
+    """Lazy initialization of the shared question bank (None when disabled)"""
+    global question_bank
+    if question_bank is None and current_app.config['QUESTION_BANK_ENABLED']:
+        question_bank = QuestionBank(max_pool_size=current_app.config['QUESTION_BANK_MAX_POOL'])
+    return question_bank
+
+
+token_budget = None
+
+def get_token_budget():
+    """Lazy initialization of the daily LLM token budget"""
+    global token_budget
+    if token_budget is None:
+        token_budget = TokenBudget(
+            user_daily_limit=current_app.config['LLM_USER_DAILY_TOKENS'],
+            global_daily_limit=current_app.config['LLM_GLOBAL_DAILY_TOKENS']
+        )
+    return token_budget
+
+
+evaluation_cache = None
+
+def get_evaluation_cache():
+    """Lazy initialization of the answer evaluation cache (None when disabled)"""
+    global evaluation_cache
+    if evaluation_cache is None and current_app.config['EVALUATION_CACHE_ENABLED']:
+        evaluation_cache = EvaluationCache(
+            max_entries=current_app.config['EVALUATION_CACHE_SIZE'],
+            ttl=current_app.config['EVALUATION_CACHE_TTL'],
+            similarity=current_app.config['EVALUATION_CACHE_SIMILARITY']
+        )
+    return evaluation_cache
+
+
+analytics = InterviewAnalytics()
+
+MAX_QUESTIONS = 5  # Limit questions per session
+QUESTION_RETRIES = 2  # New questions requested when the LLM repeats one the user was asked
+EVALUATION_MODES = ('live', 'batch')  # batch: answers are graded together at completion
+
+
+def sse_event(event, data):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def sse_response(generator):
+    """Wrap an event generator in a streaming text/event-stream response"""
+    return Response(
+        stream_with_context(generator),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+def check_token_budget(user_id):
+    """Returns: 429 error response if the user or the service is over today's token budget, else None"""
+    try:
+        get_token_budget().check(user_id)
+    except TokenBudgetExceeded as e:
+        return jsonify({'error': str(e)}), 429
+    return None
+
+
+def record_token_usage(user_id, session_id, usage, qa=None):
+    """Add LLM token usage to the session totals, the QA it was spent on and the user's daily budget"""
+    if usage is None or not usage.calls:
+        return
+    
+    if qa is not None:
+        qa.prompt_tokens = (qa.prompt_tokens or 0) + usage.prompt_tokens
+        qa.completion_tokens = (qa.completion_tokens or 0) + usage.completion_tokens
+    
+    # Increment in SQL so concurrent requests on one session don't lose updates
+    InterviewSession.query.filter_by(id=session_id).update({
+        'prompt_tokens': db.func.coalesce(InterviewSession.prompt_tokens, 0) + usage.prompt_tokens,
+        'completion_tokens': db.func.coalesce(InterviewSession.completion_tokens, 0) + usage.completion_tokens
+    }, synchronize_session=False)
+    get_token_budget().record(user_id, usage.prompt_tokens, usage.completion_tokens)
+
+
+def store_evaluation(qa, user_answer, evaluation):
+    """Update QA with answer and evaluation, keeping the user's score aggregates in step"""
+    previous = None
+    if qa.score is not None:
+        # Re-answered question: replace its earlier grade in the aggregates
+        previous = {column: getattr(qa, column) for column in (
+            'score', 'technical_correctness', 'clarity_score', 'relevance_score'
+        )}
+    
+    qa.user_answer = user_answer
+    qa.score = evaluation['score']
+    qa.technical_correctness = evaluation['technical_correctness']
+    qa.clarity_score = evaluation['clarity_score']
+    qa.relevance_score = evaluation['relevance_score']
+    qa.feedback = evaluation['feedback']
+    qa.strengths = evaluation['strengths']
+    qa.improvements = evaluation['improvements']
+    qa.model_answer = evaluation['model_answer']
+    
+    analytics.record_answer(qa.session, previous, evaluation)
+
+
+def evaluation_payload(evaluation, cache_match=None):
+    """Evaluation fields returned to the client (cache_match: 'exact' or 'near' when served from the cache)"""
+    payload = {
+        'score': float(evaluation['score']),
+        'technical_correctness': float(evaluation['technical_correctness']),
+        'clarity': float(evaluation['clarity_score']),
+        'relevance': float(evaluation['relevance_score']),
+        'strengths': evaluation['strengths'],
+        'improvements': evaluation['improvements'],
+        'model_answer': evaluation['model_answer'],
+        'cached': cache_match is not None
+    }
+    if cache_match:
+        payload['cache_match'] = cache_match
+    return payload
+
+
+def cached_evaluation(session, qa, user_answer):
+    """
+    Look up an earlier evaluation of the same (or a near-identical) answer to this question
+    Returns: (cache key, evaluation or None, 'exact' | 'near' | None)
+    """
+    key = evaluation_cache_key(session, qa)
+    if key is None:
+        return None, None, None
+    
+    evaluation, match = get_evaluation_cache().get(key, user_answer)
+    return key, evaluation, match
+
+
+def evaluation_cache_key(session, qa):
+    """Cache key of a QA's question, or None when the cache is disabled"""
+    cache = get_evaluation_cache()
+    if not cache:
+        return None
+    return cache.question_key(qa.question, session.job_role, session.interview_type, qa.bank_question_id)
+
+
+def cache_evaluation(key, user_answer, evaluation):
+    """Remember a fresh LLM evaluation for later identical answers"""
+    if key is not None:
+        get_evaluation_cache().put(key, user_answer, evaluation)
+
+
+def prepare_interview(user_id, data):
+    """
+    Validate a start-interview request and load the candidate profile
+    Returns: (job_role, interview_type, skills, experience_level, error_response)
+    """
+    user = User.query.get(user_id)
+    
+    if not user or user.role != 'job_seeker':
+        return None, None, None, None, (jsonify({'error': 'Only job seekers can start interviews'}), 403)
+    
+    # Validate required fields
+    if not data or not all(k in data for k in ('job_role', 'interview_type')):
+        return None, None, None, None, (jsonify({'error': 'Missing required fields: job_role, interview_type'}), 400)
+    
+    job_role = data['job_role']
+    interview_type = data['interview_type']  # HR, Technical, Behavioral
+    
+    if interview_type not in ['HR', 'Technical', 'Behavioral']:
+        return None, None, None, None, (jsonify({'error': 'Invalid interview type'}), 400)
+    
+    if data.get('evaluation_mode', 'live') not in EVALUATION_MODES:
+        return None, None, None, None, (jsonify({'error': 'Invalid evaluation mode. Must be live or batch'}), 400)
+    
+    # Get user profile
+    skills, experience_level = get_ai_service().get_user_profile(user_id)
+    
+    if not skills:
+        return None, None, None, None, (jsonify({'error': 'Please upload a resume first'}), 400)
+    
+    error = check_token_budget(user_id)
+    if error:
+        return None, None, None, None, error
+    
+    return job_role, interview_type, skills, experience_level, None
+
+
+def session_profile(session):
+    """
+    Skills and experience level used for a session's questions
+    Uses the snapshot taken at start; older sessions fall back to the resume
+    """
+    if session.skills is not None:
+        return session.skills, session.difficulty_level
+    return get_ai_service().get_user_profile(session.user_id)
+
+
+def question_source(session, question_number, skills, experience_level):
+    """
+    Start obtaining a question: from the question bank when the user still has
+    unseen questions for this prompt signature, otherwise from the LLM
+    (prefetched if available)
+    Returns: (future, bank_entry_id, signature)
+    """
+    bank = get_question_bank()
+    signature = None
+    
+    if bank:
+        signature = bank.signature(session.job_role, skills, experience_level, session.interview_type)
+        entry = bank.pick(session.user_id, signature)
+        if entry:
+            future = Future()
+            future.set_result((entry.question, TokenUsage()))
+            return future, entry.id, signature
+    
+    future = get_pipeline().question_future(
+        session.id, question_number, session.job_role,
+        skills, experience_level, session.interview_type
+    )
+    return future, None, signature
+
+
+def resolve_question(session, source, skills, experience_level, question_number):
+    """
+    Wait for a question from question_source; LLM output tops up the bank
+    Returns: (question, bank_entry_id, TokenUsage)
+    """
+    future, bank_id, signature = source
+    question, usage = future.result()
+    if bank_id is None:
+        question, bank_id = bank_new_question(
+            session, question, signature, skills, experience_level, question_number, usage
+        )
+    return question, bank_id, usage
+
+
+def bank_new_question(session, question, signature, skills, experience_level, question_number, usage):
+    """
+    Add an LLM-generated question to the bank
+    When the LLM repeats a banked question the user was already asked, an unseen
+    banked question is served instead, or a new one is generated (tokens go on usage)
+    Returns: (question, bank_entry_id)
+    """
+    bank = get_question_bank()
+    if not bank:
+        return question, None
+    
+    asked = None
+    for attempt in range(QUESTION_RETRIES + 1):
+        try:
+            entry = bank.add(
+                signature, question, session.job_role, session.interview_type, experience_level, session.user_id
+            )
+            return question, entry.id if entry else None
+        except QuestionAlreadyAsked:
+            entry = bank.pick(session.user_id, signature)
+            if entry:
+                return entry.question, entry.id
+            if attempt == QUESTION_RETRIES:
+                break
+            
+            if asked is None:
+                asked = [qa.question for qa in InterviewQA.query.filter_by(session_id=session.id).with_entities(
+                    InterviewQA.question
+                )]
+            if question not in asked:
+                asked.append(question)
+            question = get_ai_service().generate_question(
+                session.job_role, skills, experience_level, session.interview_type, question_number,
+                usage=usage, avoid=asked
+            )
+    
+    # Nothing new for this candidate shape; serve the repeat rather than fail the interview
+    return question, None
+
+
+def prefetch_next_question(session, skills, experience_level, question_number):
+    """Start generating question_number in the background if the session will need it from the LLM"""
+    if question_number > MAX_QUESTIONS:
+        return
+    
+    bank = get_question_bank()
+    if bank and bank.has_unseen(session.user_id, bank.signature(
+        session.job_role, skills, experience_level, session.interview_type
+    )):
+        return
+    
+    get_pipeline().prefetch_question(
+        session.id, question_number, session.job_role,
+        skills, experience_level, session.interview_type
+    )
+
+
+def release_db_connection():
+    """
+    End the current transaction before waiting on the LLM, so the pooled
+    connection (and any row locks) is not held for the length of the call
+    """
+    db.session.commit()
+
+
+def discard_empty_session(session_id):
+    """
+    Delete a session whose first question could not be generated so the user can simply retry
+    Sessions with a stored question have been sent to the client and are kept
+    """
+    db.session.rollback()
+    has_questions = db.session.query(InterviewQA.query.filter_by(session_id=session_id).exists()).scalar()
+    if not has_questions:
+        InterviewSession.query.filter_by(id=session_id).delete()
+        db.session.commit()
+
+
+def load_answer_target(user_id, data):
+    """
+    Validate an answer submission
+    Returns: (session, qa, error_response)
+    """
+    if not data or not all(k in data for k in ('session_id', 'question_number', 'answer')):
+        return None, None, (jsonify({'error': 'Missing required fields'}), 400)
+    
+    session = InterviewSession.query.filter_by(id=data['session_id'], user_id=user_id).first()
+    if not session:
+        return None, None, (jsonify({'error': 'Session not found'}), 404)
+    
+    qa = InterviewQA.query.filter_by(
+        session_id=session.id,
+        question_number=data['question_number']
+    ).first()
+    if not qa:
+        return None, None, (jsonify({'error': 'Question not found'}), 404)
+    
+    error = check_token_budget(user_id)
+    if error:
+        return None, None, error
+    
+    return session, qa, None
+
+
+def collect_answers(session_id):
+    """
+    Gather answered Q&A for final feedback
+    Returns: (qa_pairs, total_score, answered_count)
+    """
+    qa_list = InterviewQA.query.filter_by(session_id=session_id).order_by(InterviewQA.question_number).all()
+    
+    qa_pairs = []
+    total_score = 0
+    answered_count = 0
+    
+    for qa in qa_list:
+        if qa.user_answer:
+            qa_pairs.append({
+                'question': qa.question,
+                'answer': qa.user_answer,
+                'score': float(qa.score) if qa.score else 0
+            })
+            total_score += float(qa.score) if qa.score else 0
+            answered_count += 1
+    
+    return qa_pairs, total_score, answered_count
+
+
+def record_offline_answers(session_id, answers):
+    """
+    Store answers submitted together at completion (batch sessions)
+    Returns: error response or None
+    """
+    if not answers:
+        return None
+    
+    if not isinstance(answers, list):
+        return jsonify({'error': 'answers must be a list of {question_number, answer}'}), 400
+    
+    qa_by_number = {qa.question_number: qa for qa in InterviewQA.query.filter_by(session_id=session_id)}
+    
+    for item in answers:
+        qa = qa_by_number.get(item.get('question_number')) if isinstance(item, dict) else None
+        if not qa or not item.get('answer'):
+            return jsonify({'error': f'Invalid answer entry: {item}'}), 400
+        qa.user_answer = item['answer']
+        qa.answered_at = datetime.utcnow()
+    
+    return None
+
+
+def grade_batch_session(session):
+    """
+    Grade every answer of a batch session and generate final feedback in one LLM call
+    Returns: completion response with per-question 'evaluations', or None if nothing was answered
+    """
+    qa_list = InterviewQA.query.filter(
+        InterviewQA.session_id == session.id,
+        InterviewQA.user_answer.isnot(None)
+    ).order_by(InterviewQA.question_number).all()
+    
+    if not qa_list:
+        return None
+    
+    session_data = {
+        'job_role': session.job_role,
+        'interview_type': session.interview_type,
+        'qa_pairs': [
+            {'question_number': qa.question_number, 'question': qa.question, 'answer': qa.user_answer}
+            for qa in qa_list
+        ]
+    }
+    release_db_connection()
+    
+    usage = TokenUsage()
+    evaluations, feedback, performance_level = get_ai_service().evaluate_session(session_data, usage=usage)
+    record_token_usage(session.user_id, session.id, usage)
+    
+    total_score = 0
+    payloads = []
+    for qa in qa_list:
+        evaluation = evaluations[qa.question_number]
+        store_evaluation(qa, qa.user_answer, evaluation)
+        cache_evaluation(evaluation_cache_key(session, qa), qa.user_answer, evaluation)
+        total_score += evaluation['score']
+        payloads.append({'question_number': qa.question_number, **evaluation_payload(evaluation)})
+    
+    result = finish_session(session, feedback, performance_level, total_score, len(qa_list))
+    result['evaluations'] = payloads
+    result['usage'] = usage.to_dict()
+    return result
+
+
+def finish_session(session, feedback, performance_level, total_score, answered_count):
+    """Store final results on the session and build the completion response"""
+    session.end_time = datetime.utcnow()
+    session.overall_score = total_score / answered_count
+    session.performance_level = performance_level
+    session.feedback_summary = feedback
+    analytics.record_completion(session)
+    
+    return {
+        'message': 'Interview completed successfully',
+        'overall_score': round(float(session.overall_score), 2),
+        'performance_level': performance_level,
+        'feedback': feedback,
+        'questions_answered': answered_count
+    }
+
+
 @interview_bp.route('/start', methods=['POST'])
 @jwt_required()
 def start_interview():
     """Start a new mock interview session"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
-        
-        if not user or user.role != 'job_seeker':
-            return jsonify({'error': 'Only job seekers can start interviews'}), 403
-        
         data = request.get_json()
         
-        # Validate required fields
-        if not all(k in data for k in ('job_role', 'interview_type')):
-            return jsonify({'error': 'Missing required fields: job_role, interview_type'}), 400
-        
-        job_role = data['job_role']
-        interview_type = data['interview_type']  # HR, Technical, Behavioral
-        
-        if interview_type not in ['HR', 'Technical', 'Behavioral']:
-            return jsonify({'error': 'Invalid interview type'}), 400
-        
-        # Get user profile
-        ai = get_ai_service()
-        skills, experience_level = ai.get_user_profile(user_id)
-        
-        if not skills:
-            return jsonify({'error': 'Please upload a resume first'}), 400
+        job_role, interview_type, skills, experience_level, error = prepare_interview(user_id, data)
+        if error:
+            return error
         
         # Create interview session
         session = InterviewSession(
@@ -61,35 +509,50 @@ def start_interview():
             job_role=job_role,
             interview_type=interview_type,
             difficulty_level=experience_level,
+            skills=skills,
+            evaluation_mode=data.get('evaluation_mode', 'live'),
             total_questions=0
         )
         
+        # Committed up front so no transaction is held open while the question is generated
         db.session.add(session)
-        db.session.flush()  # Get session ID
+        db.session.commit()
+        session_id = session.id
         
-        # Generate first question
-        question = ai.generate_question(
-            job_role, skills, experience_level, interview_type, 1
-        )
+        # First question from the question bank, or generated
+        try:
+            source = question_source(session, 1, skills, experience_level)
+            release_db_connection()
+            question, bank_id, usage = resolve_question(session, source, skills, experience_level, 1)
+        except Exception:
+            discard_empty_session(session_id)
+            raise
         
         # Store question
         qa = InterviewQA(
-            session_id=session.id,
+            session_id=session_id,
             question_number=1,
-            question=question
+            question=question,
+            bank_question_id=bank_id
         )
         
         db.session.add(qa)
+        record_token_usage(user_id, session_id, usage, qa)
         session.total_questions = 1
         db.session.commit()
         
+        # Question 2 is generated while the candidate answers question 1
+        prefetch_next_question(session, skills, experience_level, 2)
+        
         return jsonify({
             'message': 'Interview started successfully',
             'session_id': session.id,
             'question_number': 1,
             'question': question,
             'interview_type': interview_type,
-            'job_role': job_role
+            'job_role': job_role,
+            'evaluation_mode': session.evaluation_mode,
+            'usage': usage.to_dict()
         }), 201
         
     except Exception as e:
@@ -105,88 +568,73 @@ def submit_answer():
         user_id = int(get_jwt_identity())
         data = request.get_json()
         
-        # Validate required fields
-        if not all(k in data for k in ('session_id', 'question_number', 'answer')):
-            return jsonify({'error': 'Missing required fields'}), 400
+        session, qa, error = load_answer_target(user_id, data)
+        if error:
+            return error
         
-        session_id = data['session_id']
         question_number = data['question_number']
         user_answer = data['answer']
         
-        # Get session
-        session = InterviewSession.query.filter_by(id=session_id, user_id=user_id).first()
-        
-        if not session:
-            return jsonify({'error': 'Session not found'}), 404
-        
-        # Get question
-        qa = InterviewQA.query.filter_by(
-            session_id=session_id,
-            question_number=question_number
-        ).first()
-        
-        if not qa:
-            return jsonify({'error': 'Question not found'}), 404
-        
-        # Evaluate answer
-        ai = get_ai_service()
-        evaluation = ai.evaluate_answer(
-            qa.question, user_answer, session.job_role, session.interview_type
-        )
+        # Check if we should generate next question
+        generate_next = question_number < MAX_QUESTIONS
+        next_question_number = question_number + 1 if generate_next else None
         
-        # Update QA with answer and evaluation
-        qa.user_answer = user_answer
-        qa.score = evaluation['score']
-        qa.technical_correctness = evaluation['technical_correctness']
-        qa.clarity_score = evaluation['clarity_score']
-        qa.relevance_score = evaluation['relevance_score']
-        qa.feedback = evaluation['feedback']
-        qa.strengths = evaluation['strengths']
-        qa.improvements = evaluation['improvements']
-        qa.model_answer = evaluation['model_answer']
+        # Next question comes from the bank or a concurrent (possibly prefetched) LLM call
+        skills, experience_level = session_profile(session)
+        source = question_source(session, next_question_number, skills, experience_level) if generate_next else None
+        batch = session.evaluation_mode == 'batch'
+        release_db_connection()
         
-        # Check if we should generate next question
-        max_questions = 5  # Limit questions per session
-        generate_next = question_number < max_questions
+        usage = TokenUsage()
         
-        next_question = None
-        next_question_number = None
+        if batch:
+            # Graded together with the other answers at completion
+            qa.user_answer = user_answer
+            qa.answered_at = datetime.utcnow()
+        else:
+            # Evaluate answer (unless cached) while the next question is produced
+            cache_key, evaluation, cache_match = cached_evaluation(session, qa, user_answer)
+            if evaluation is None:
+                evaluation_usage = TokenUsage()
+                evaluation = get_ai_service().evaluate_answer(
+                    qa.question, user_answer, session.job_role, session.interview_type, usage=evaluation_usage
+                )
+                cache_evaluation(cache_key, user_answer, evaluation)
+                record_token_usage(user_id, session.id, evaluation_usage, qa)
+                usage.merge(evaluation_usage)
+            
+            # Update QA with answer and evaluation
+            store_evaluation(qa, user_answer, evaluation)
         
         if generate_next:
-            # Get user profile
-            skills, experience_level = ai.get_user_profile(user_id)
-            
-            # Generate next question
-            next_question_number = question_number + 1
-            next_question = ai.generate_question(
-                session.job_role, skills, experience_level,
-                session.interview_type, next_question_number
+            next_question, bank_id, question_usage = resolve_question(
+                session, source, skills, experience_level, next_question_number
             )
             
             # Store next question
             next_qa = InterviewQA(
                 session_id=session.id,
                 question_number=next_question_number,
-                question=next_question
+                question=next_question,
+                bank_question_id=bank_id
             )
             
             db.session.add(next_qa)
             session.total_questions = next_question_number
+            record_token_usage(user_id, session.id, question_usage, next_qa)
+            usage.merge(question_usage)
         
         db.session.commit()
         
-        response = {
-            'message': 'Answer submitted successfully',
-            'evaluation': {
-                'score': float(evaluation['score']),
-                'technical_correctness': float(evaluation['technical_correctness']),
-                'clarity': float(evaluation['clarity_score']),
-                'relevance': float(evaluation['relevance_score']),
-                'strengths': evaluation['strengths'],
-                'improvements': evaluation['improvements'],
-                'model_answer': evaluation['model_answer']
-            }
-        }
+        if generate_next:
+            prefetch_next_question(session, skills, experience_level, next_question_number + 1)
+        
+        response = {'message': 'Answer submitted successfully', 'usage': usage.to_dict()}
+        
+        if batch:
+            response['evaluation_pending'] = True
+        else:
+            response['evaluation'] = evaluation_payload(evaluation, cache_match)
         
         if generate_next:
             response['next_question'] = {
@@ -220,29 +668,31 @@ def complete_interview(session_id):
         if session.end_time:
             return jsonify({'error': 'Interview already completed'}), 400
         
-        # Get all Q&A
-        qa_list = InterviewQA.query.filter_by(session_id=session_id).order_by(InterviewQA.question_number).all()
+        error = check_token_budget(user_id)
+        if error:
+            return error
         
-        if not qa_list or not qa_list[0].user_answer:
-            return jsonify({'error': 'No answers submitted yet'}), 400
+        if session.evaluation_mode == 'batch':
+            error = record_offline_answers(session_id, (request.get_json(silent=True) or {}).get('answers'))
+            if error:
+                return error
+            
+            # All answers and the final feedback are graded in one LLM call
+            result = grade_batch_session(session)
+            if result is None:
+                return jsonify({'error': 'No answers submitted yet'}), 400
+            
+            db.session.commit()
+            get_pipeline().discard_session(session_id)
+            
+            return jsonify(result), 200
         
-        # Prepare data for final feedback
-        qa_pairs = []
-        total_score = 0
-        answered_count = 0
-        
-        for qa in qa_list:
-            if qa.user_answer:
-                qa_pairs.append({
-                    'question': qa.question,
-                    'answer': qa.user_answer,
-                    'score': float(qa.score) if qa.score else 0
-                })
-                total_score += float(qa.score) if qa.score else 0
-                answered_count += 1
+        qa_pairs, total_score, answered_count = collect_answers(session_id)
         
         if answered_count == 0:
-            return jsonify({'error': 'No answers to evaluate'}), 400
+            return jsonify({'error': 'No answers submitted yet'}), 400
+        
+        release_db_connection()
         
         # Generate final feedback
         ai = get_ai_service()
@@ -252,27 +702,301 @@ def complete_interview(session_id):
             'qa_pairs': qa_pairs
         }
         
-        feedback, performance_level = ai.generate_final_feedback(session_data)
+        usage = TokenUsage()
+        feedback, performance_level = ai.generate_final_feedback(session_data, usage=usage)
         
         # Update session
-        session.end_time = datetime.utcnow()
-        session.overall_score = total_score / answered_count
-        session.performance_level = performance_level
-        session.feedback_summary = feedback
+        result = finish_session(session, feedback, performance_level, total_score, answered_count)
+        result['usage'] = usage.to_dict()
+        record_token_usage(user_id, session_id, usage)
         
         db.session.commit()
+        get_pipeline().discard_session(session_id)
         
-        return jsonify({
-            'message': 'Interview completed successfully',
-            'overall_score': round(float(session.overall_score), 2),
-            'performance_level': performance_level,
-            'feedback': feedback,
-            'questions_answered': answered_count
-        }), 200
+        return jsonify(result), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@interview_bp.route('/start/stream', methods=['POST'])
+@jwt_required()
+def start_interview_stream():
+    """
+    Start a mock interview, streaming the first question as Server-Sent Events
+    Events: session, token, question, done (or error)
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        data = request.get_json()
+        
+        job_role, interview_type, skills, experience_level, error = prepare_interview(user_id, data)
+        if error:
+            return error
+        
+        # Commit the session up front so no write transaction is held open while streaming
+        session = InterviewSession(
+            user_id=user_id,
+            job_role=job_role,
+            interview_type=interview_type,
+            difficulty_level=experience_level,
+            skills=skills,
+            evaluation_mode=data.get('evaluation_mode', 'live'),
+            total_questions=0
+        )
+        db.session.add(session)
+        db.session.commit()
+        session_id = session.id
+        evaluation_mode = session.evaluation_mode
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
+    
+    def generate():
+        question_stored = False
+        try:
+            yield sse_event('session', {
+                'session_id': session_id,
+                'interview_type': interview_type,
+                'job_role': job_role,
+                'evaluation_mode': evaluation_mode
+            })
+            
+            bank = get_question_bank()
+            signature = bank.signature(job_role, skills, experience_level, interview_type) if bank else None
+            entry = bank.pick(user_id, signature) if bank else None
+            release_db_connection()
+            
+            usage = TokenUsage()
+            
+            if entry:
+                # Banked questions are sent whole
+                question, bank_id = entry.question, entry.id
+                yield sse_event('token', {'text': question})
+            else:
+                parts = []
+                for text in get_ai_service().stream_question(
+                    job_role, skills, experience_level, interview_type, 1, usage=usage
+                ):
+                    parts.append(text)
+                    yield sse_event('token', {'text': text})
+                question = ''.join(parts).strip()
+                # A question the user was already asked is replaced; the 'question' event has the final text
+                question, bank_id = bank_new_question(
+                    session, question, signature, skills, experience_level, 1, usage
+                )
+            
+            qa = InterviewQA(
+                session_id=session_id,
+                question_number=1,
+                question=question,
+                bank_question_id=bank_id
+            )
+            db.session.add(qa)
+            InterviewSession.query.filter_by(id=session_id).update({'total_questions': 1})
+            record_token_usage(user_id, session_id, usage, qa)
+            db.session.commit()
+            question_stored = True
+            
+            prefetch_next_question(session, skills, experience_level, 2)
+            
+            yield sse_event('question', {'question_number': 1, 'question': question})
+            yield sse_event('done', {'message': 'Interview started successfully', 'session_id': session_id})
+            
+        except Exception as e:
+            if question_stored:
+                db.session.rollback()
+            else:
+                discard_empty_session(session_id)
+            yield sse_event('error', {'error': str(e)})
+    
+    return sse_response(generate())
+
+
+@interview_bp.route('/answer/stream', methods=['POST'])
+@jwt_required()
+def submit_answer_stream():
+    """
+    Submit an answer and stream the evaluation as Server-Sent Events
+    The next question is generated concurrently (or taken from the prefetch)
+    Events: token, field, item, model_answer, evaluation,
+            next_question or interview_complete, done (or error)
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        data = request.get_json()
+        
+        session, qa, error = load_answer_target(user_id, data)
+        if error:
+            return error
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    question_number = data['question_number']
+    user_answer = data['answer']
+    
+    def generate():
+        try:
+            ai = get_ai_service()
+            
+            generate_next = question_number < MAX_QUESTIONS
+            skills, experience_level = session_profile(session)
+            
+            source = None
+            if generate_next:
+                source = question_source(session, question_number + 1, skills, experience_level)
+            release_db_connection()
+            
+            if session.evaluation_mode == 'batch':
+                # Graded together with the other answers at completion
+                qa.user_answer = user_answer
+                qa.answered_at = datetime.utcnow()
+                yield sse_event('evaluation_pending', {'question_number': question_number})
+            else:
+                cache_key, evaluation, cache_match = cached_evaluation(session, qa, user_answer)
+                if evaluation is not None:
+                    # Served from the cache - no tokens to stream
+                    yield sse_event('evaluation', evaluation_payload(evaluation, cache_match))
+                else:
+                    usage = TokenUsage()
+                    for event in ai.stream_evaluation(
+                        qa.question, user_answer, session.job_role, session.interview_type, usage=usage
+                    ):
+                        if event['event'] == 'evaluation':
+                            evaluation = event['data']
+                            yield sse_event('evaluation', evaluation_payload(evaluation))
+                        else:
+                            yield sse_event(event['event'], event['data'])
+                    
+                    cache_evaluation(cache_key, user_answer, evaluation)
+                    record_token_usage(user_id, session.id, usage, qa)
+                
+                store_evaluation(qa, user_answer, evaluation)
+            
+            if generate_next:
+                next_question_number = question_number + 1
+                next_question, bank_id, question_usage = resolve_question(
+                    session, source, skills, experience_level, next_question_number
+                )
+                
+                next_qa = InterviewQA(
+                    session_id=session.id,
+                    question_number=next_question_number,
+                    question=next_question,
+                    bank_question_id=bank_id
+                )
+                db.session.add(next_qa)
+                session.total_questions = next_question_number
+                record_token_usage(user_id, session.id, question_usage, next_qa)
+                db.session.commit()
+                
+                prefetch_next_question(session, skills, experience_level, next_question_number + 1)
+                
+                yield sse_event('next_question', {
+                    'question_number': next_question_number,
+                    'question': next_question
+                })
+            else:
+                db.session.commit()
+                yield sse_event('interview_complete', {
+                    'message': 'Interview complete! Call /complete to get final feedback.'
+                })
+            
+            yield sse_event('done', {'message': 'Answer submitted successfully'})
+            
+        except Exception as e:
+            db.session.rollback()
+            yield sse_event('error', {'error': str(e)})
+    
+    return sse_response(generate())
+
+
+@interview_bp.route('/<int:session_id>/complete/stream', methods=['POST'])
+@jwt_required()
+def complete_interview_stream(session_id):
+    """
+    Complete interview, streaming final feedback as Server-Sent Events
+    Events: token, complete, done (or error)
+    Batch sessions are graded in one call and emit an evaluation event per question instead of tokens
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        
+        session = InterviewSession.query.filter_by(id=session_id, user_id=user_id).first()
+        
+        if not session:
+            return jsonify({'error': 'Session not found'}), 404
+        
+        if session.end_time:
+            return jsonify({'error': 'Interview already completed'}), 400
+        
+        error = check_token_budget(user_id)
+        if error:
+            return error
+        
+        batch = session.evaluation_mode == 'batch'
+        if batch:
+            error = record_offline_answers(session_id, (request.get_json(silent=True) or {}).get('answers'))
+            if error:
+                return error
+        
+        qa_pairs, total_score, answered_count = collect_answers(session_id)
+        
+        if answered_count == 0:
+            return jsonify({'error': 'No answers submitted yet'}), 400
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+    
+    session_data = {
+        'job_role': session.job_role,
+        'interview_type': session.interview_type,
+        'qa_pairs': qa_pairs
+    }
+    release_db_connection()
+    
+    def generate():
+        try:
+            if batch:
+                result = grade_batch_session(session)
+                for evaluation in result['evaluations']:
+                    yield sse_event('evaluation', evaluation)
+                
+                db.session.commit()
+                get_pipeline().discard_session(session_id)
+                
+                yield sse_event('complete', result)
+                yield sse_event('done', {'message': result['message']})
+                return
+            
+            result = None
+            usage = TokenUsage()
+            for event in get_ai_service().stream_final_feedback(session_data, usage=usage):
+                if event['event'] == 'feedback':
+                    result = finish_session(
+                        session, event['data']['feedback'], event['data']['performance_level'],
+                        total_score, answered_count
+                    )
+                else:
+                    yield sse_event(event['event'], event['data'])
+            
+            result['usage'] = usage.to_dict()
+            record_token_usage(user_id, session_id, usage)
+            db.session.commit()
+            get_pipeline().discard_session(session_id)
+            
+            yield sse_event('complete', result)
+            yield sse_event('done', {'message': result['message']})
+            
+        except Exception as e:
+            db.session.rollback()
+            yield sse_event('error', {'error': str(e)})
+    
+    return sse_response(generate())
 
 
 @interview_bp.route('/<int:session_id>', methods=['GET'])
@@ -299,6 +1023,42 @@ def get_interview_session(session_id):
         return jsonify({'error': str(e)}), 500
 
 
+@interview_bp.route('/usage', methods=['GET'])
+@jwt_required()
+def get_token_usage():
+    """Get today's LLM token usage and limit for the current user"""
+    try:
+        user_id = int(get_jwt_identity())
+        
+        return jsonify(get_token_budget().usage(user_id)), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@interview_bp.route('/summary', methods=['GET'])
+@jwt_required()
+def get_interview_summary():
+    """
+    Get the user's progress summary from pre-aggregated scores
+    Query: interview_type (weekly trend for one type), weeks (trend length, default 12)
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        
+        summary = analytics.summary(
+            user_id,
+            interview_type=request.args.get('interview_type'),
+            weeks=min(request.args.get('weeks', 12, type=int), 104)
+        )
+        
+        return jsonify(summary), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
 @interview_bp.route('/history', methods=['GET'])
 @jwt_required()
 def get_interview_history():
@@ -1,15 +1,41 @@
 """
 Job routes for posting, searching, and managing jobs
 """
-from flask import Blueprint, request, jsonify
+import io
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
+from sqlalchemy.orm import joinedload
 from models import db
 from models.job import Job
 from models.user import User
 from models.application import Application, SavedJob
+from services.job_ingestion import JobIngestor
+from services.recommendation_engine import RecommendationEngine
+from services.job_search import JobSearch
+from utils.background import run_in_background
 
 jobs_bp = Blueprint('jobs', __name__)
+engine = None
+search = None
+
+# Job fields that feed into applicant match scores
+MATCH_SCORE_FIELDS = ('required_skills', 'experience_min', 'experience_max', 'location')
+
+APPLICATION_STATUSES = ('pending', 'reviewed', 'shortlisted', 'rejected', 'accepted')
+MAX_BULK_STATUS_UPDATES = 1000
+
+def get_engine():
+    global engine
+    if engine is None:
+        engine = RecommendationEngine()
+    return engine
+
+def get_search():
+    global search
+    if search is None:
+        search = JobSearch(cache_ttl=current_app.config['FACET_CACHE_TTL'])
+    return search
 
 
 @jobs_bp.route('/', methods=['POST'])
@@ -47,7 +73,11 @@ def create_job():
         )
         
         db.session.add(job)
+        db.session.flush()  # Get job ID
+        
+        JobIngestor.sync_skill_index({job.id: job.required_skills})
         db.session.commit()
+        get_search().invalidate()
         
         return jsonify({
             'message': 'Job created successfully',
@@ -59,6 +89,60 @@ def create_job():
         return jsonify({'error': str(e)}), 500
 
 
+@jobs_bp.route('/ingest', methods=['POST'])
+@jwt_required()
+def ingest_jobs():
+    """
+    Bulk upsert jobs from an external feed (recruiter only)
+    Accepts a JSON Lines / CSV file upload, or a JSON body with a 'jobs' list
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        user = User.query.get(user_id)
+        
+        if not user or user.role != 'recruiter':
+            return jsonify({'error': 'Only recruiters can ingest jobs'}), 403
+        
+        ingestor = JobIngestor(batch_size=current_app.config['INGEST_BATCH_SIZE'])
+        max_rows = current_app.config['INGEST_MAX_ROWS']
+        
+        if 'file' in request.files:
+            file = request.files['file']
+            source = request.form.get('source')
+            fmt = request.form.get('format') or JobIngestor.detect_format(file.filename or '')
+            
+            if not source or source == 'internal':
+                return jsonify({'error': 'A feed source other than "internal" is required'}), 400
+            if fmt not in ('jsonl', 'csv'):
+                return jsonify({'error': 'Unsupported feed format. Use jsonl or csv'}), 400
+            
+            stream = io.TextIOWrapper(file.stream, encoding='utf-8', newline='')
+            stats = ingestor.ingest_feed(stream, fmt, source, recruiter_id=user_id, max_rows=max_rows)
+        else:
+            data = request.get_json() or {}
+            source = data.get('source')
+            jobs = data.get('jobs')
+            
+            if not source or source == 'internal':
+                return jsonify({'error': 'A feed source other than "internal" is required'}), 400
+            if not isinstance(jobs, list):
+                return jsonify({'error': 'Provide a feed file or a "jobs" list'}), 400
+            
+            stats = ingestor.ingest(jobs, source, recruiter_id=user_id, max_rows=max_rows)
+        
+        get_search().invalidate()
+        
+        return jsonify({
+            'message': 'Feed ingested successfully',
+            'source': source,
+            **stats
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
 @jobs_bp.route('/', methods=['GET'])
 def get_jobs():
     """Get all jobs with pagination and filters"""
@@ -68,38 +152,10 @@ def get_jobs():
         per_page = request.args.get('per_page', 20, type=int)
         
         # Filters
-        location = request.args.get('location')
-        job_type = request.args.get('job_type')
-        skills = request.args.get('skills')  # Comma-separated
-        experience_min = request.args.get('experience_min', type=int)
-        search = request.args.get('search')  # Search in title/company
+        filters = JobSearch.parse_filters(request.args)
         
         # Build query
-        query = Job.query.filter_by(status='active')
-        
-        if location:
-            query = query.filter(Job.location.ilike(f'%{location}%'))
-        
-        if job_type:
-            query = query.filter_by(job_type=job_type)
-        
-        if skills:
-            # Skill filtering disabled for SQLite compatibility (requires Postgres ARRAY)
-            pass
-            # skill_list = [s.strip() for s in skills.split(',')]
-            # query = query.filter(Job.required_skills.overlap(skill_list))
-        
-        if experience_min is not None:
-            query = query.filter(Job.experience_min <= experience_min)
-        
-        if search:
-            search_pattern = f'%{search}%'
-            query = query.filter(
-                db.or_(
-                    Job.title.ilike(search_pattern),
-                    Job.company_name.ilike(search_pattern)
-                )
-            )
+        query = JobSearch.apply_filters(Job.query.filter_by(status='active'), filters)
         
         # Order by posted date (newest first)
         query = query.order_by(Job.posted_date.desc())
@@ -121,6 +177,24 @@ def get_jobs():
         return jsonify({'error': str(e)}), 500
 
 
+@jobs_bp.route('/facets', methods=['GET'])
+def get_job_facets():
+    """Get facet counts (location, job type, experience band, salary range) for the current filters"""
+    try:
+        filters = JobSearch.parse_filters(request.args)
+        data, cached = get_search().get_facets(filters)
+        
+        return jsonify({
+            'facets': data['facets'],
+            'total': data['total'],
+            'filters': filters,
+            'cached': cached
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @jobs_bp.route('/<int:job_id>', methods=['GET'])
 def get_job(job_id):
     """Get job details"""
@@ -160,6 +234,7 @@ def update_job(job_id):
             job.description = data['description']
         if 'required_skills' in data:
             job.required_skills = data['required_skills']
+            JobIngestor.sync_skill_index({job.id: job.required_skills})
         if 'experience_min' in data:
             job.experience_min = data['experience_min']
         if 'experience_max' in data:
@@ -178,6 +253,11 @@ def update_job(job_id):
             job.deadline = datetime.fromisoformat(data['deadline']) if data['deadline'] else None
         
         db.session.commit()
+        get_search().invalidate()
+        
+        # Rescore existing applicants off the request path
+        if any(field in data for field in MATCH_SCORE_FIELDS):
+            run_in_background(get_engine().refresh_job_match_scores, job.id)
         
         return jsonify({
             'message': 'Job updated successfully',
@@ -202,6 +282,7 @@ def delete_job(job_id):
         
         db.session.delete(job)
         db.session.commit()
+        get_search().invalidate()
         
         return jsonify({'message': 'Job deleted successfully'}), 200
         
@@ -243,6 +324,10 @@ def apply_to_job(job_id):
         )
         
         db.session.add(application)
+        db.session.flush()  # Get application ID
+        
+        # Compute match score once at apply time so recruiters can rank by it
+        application.match_score = get_engine().score_applications(job, [application])[application.id]
         db.session.commit()
         
         return jsonify({
@@ -289,10 +374,10 @@ def get_saved_jobs():
     try:
         user_id = int(get_jwt_identity())
         
-        saved_jobs = SavedJob.query.filter_by(user_id=user_id).all()
-        job_ids = [sj.job_id for sj in saved_jobs]
-        
-        jobs = Job.query.filter(Job.id.in_(job_ids)).all()
+        # Single joined query instead of saved-job lookup followed by job lookup
+        jobs = Job.query.join(SavedJob, SavedJob.job_id == Job.id).filter(
+            SavedJob.user_id == user_id
+        ).order_by(SavedJob.saved_date.desc()).all()
         
         return jsonify({
             'jobs': [job.to_dict(include_description=False) for job in jobs],
@@ -310,7 +395,10 @@ def get_my_applications():
     try:
         user_id = int(get_jwt_identity())
         
-        applications = Application.query.filter_by(user_id=user_id).order_by(Application.applied_date.desc()).all()
+        # Eager-load jobs in the same query to avoid one lazy load per application
+        applications = Application.query.options(joinedload(Application.job)).filter_by(
+            user_id=user_id
+        ).order_by(Application.applied_date.desc()).all()
         
         result = []
         for app in applications:
@@ -339,20 +427,46 @@ def get_job_applications(job_id):
         if not job:
             return jsonify({'error': 'Job not found or unauthorized'}), 404
         
-        # Get applications joined with user data
-        applications = db.session.query(Application, User).join(User).filter(Application.job_id == job_id).all()
+        # Filters
+        status = request.args.get('status')
+        min_score = request.args.get('min_score', type=float)
+        sort = request.args.get('sort', 'match_score')  # match_score, applied_date
+        limit = request.args.get('limit', type=int)
+        
+        # Get applications joined with only the applicant columns we return
+        query = db.session.query(
+            Application,
+            User.id, User.full_name, User.email, User.location, User.bio, User.profile_photo_url
+        ).join(User, User.id == Application.user_id).filter(Application.job_id == job_id)
+        
+        if status:
+            query = query.filter(Application.status == status)
+        
+        if min_score is not None:
+            query = query.filter(Application.match_score >= min_score)
+        
+        # Ranked by precomputed match score (served by the job_id, match_score index)
+        if sort == 'applied_date':
+            query = query.order_by(Application.applied_date.desc())
+        else:
+            query = query.order_by(db.nullslast(Application.match_score.desc()), Application.applied_date)
+        
+        if limit:
+            query = query.limit(limit)
+        
+        applications = query.all()
         
         result = []
-        for app, applicant in applications:
+        for app, applicant_id, full_name, email, location, bio, profile_photo_url in applications:
             app_dict = app.to_dict()
             # Add applicant details
             app_dict['applicant'] = {
-                'id': applicant.id,
-                'full_name': applicant.full_name,
-                'email': applicant.email,
-                'location': applicant.location,
-                'bio': applicant.bio,
-                'profile_photo_url': applicant.profile_photo_url
+                'id': applicant_id,
+                'full_name': full_name,
+                'email': email,
+                'location': location,
+                'bio': bio,
+                'profile_photo_url': profile_photo_url
             }
             result.append(app_dict)
             
@@ -398,3 +512,67 @@ def update_application_status(application_id):
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
+
+
+@jobs_bp.route('/applications/status', methods=['PUT'])
+@jwt_required()
+def bulk_update_application_status():
+    """Update status for many applications at once (recruiter only)"""
+    try:
+        user_id = int(get_jwt_identity())
+        data = request.get_json() or {}
+        new_status = data.get('status')
+        application_ids = data.get('application_ids')
+        
+        if not new_status:
+            return jsonify({'error': 'Status is required'}), 400
+        
+        if new_status not in APPLICATION_STATUSES:
+            return jsonify({'error': f"Invalid status. Must be one of: {', '.join(APPLICATION_STATUSES)}"}), 400
+        
+        if not isinstance(application_ids, list) or not application_ids:
+            return jsonify({'error': 'application_ids must be a non-empty list'}), 400
+        
+        if len(application_ids) > MAX_BULK_STATUS_UPDATES:
+            return jsonify({'error': f'At most {MAX_BULK_STATUS_UPDATES} applications per request'}), 400
+        
+        try:
+            application_ids = list(dict.fromkeys(int(app_id) for app_id in application_ids))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'application_ids must be integers'}), 400
+        
+        # Check ownership of every application with one join query
+        owners = dict(
+            db.session.query(Application.id, Job.recruiter_id)
+            .join(Job, Job.id == Application.job_id)
+            .filter(Application.id.in_(application_ids))
+        )
+        
+        results = {}
+        owned_ids = []
+        for app_id in application_ids:
+            if app_id not in owners:
+                results[app_id] = 'not_found'
+            elif owners[app_id] != user_id:
+                results[app_id] = 'unauthorized'
+            else:
+                results[app_id] = 'updated'
+                owned_ids.append(app_id)
+        
+        # Single UPDATE ... WHERE id IN (...)
+        if owned_ids:
+            Application.query.filter(Application.id.in_(owned_ids)).update(
+                {'status': new_status}, synchronize_session=False
+            )
+            db.session.commit()
+        
+        return jsonify({
+            'message': f'Status updated for {len(owned_ids)} applications',
+            'status': new_status,
+            'updated': len(owned_ids),
+            'results': [{'id': app_id, 'result': result} for app_id, result in results.items()]
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
@@ -1,24 +1,50 @@
 """
 Profile Analysis Routes
 """
-from flask import Blueprint, request, jsonify
+import os
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, timedelta
 from models import db
 from models.user import User
 from models.profile_links import ProfileLinks
+from models.application import Application
+from models.job import Job
 from services.profile_scraper import ProfileScraper
+from services.scrape_cache import create_scrape_cache
 from services.profile_analyzer import ProfileAnalyzer
+from services.profile_refresh import apply_profile_analysis, reanalyze_stored, ProfileAnalysisQueue, ranking
 
 profile_analysis_bp = Blueprint('profile_analysis', __name__)
 
 scraper = None
 analyzer = None
 
+def scrape_cache_path():
+    """SQLite scrape cache file: SCRAPE_CACHE_PATH, or scrape_cache.db in the instance folder"""
+    if current_app.config['SCRAPE_CACHE_PATH']:
+        return current_app.config['SCRAPE_CACHE_PATH']
+    os.makedirs(current_app.instance_path, exist_ok=True)
+    return os.path.join(current_app.instance_path, 'scrape_cache.db')
+
 def get_scraper():
     global scraper
     if scraper is None:
-        scraper = ProfileScraper()
+        cache_duration = timedelta(seconds=current_app.config['SCRAPE_CACHE_TTL'])
+        stale_duration = timedelta(seconds=current_app.config['SCRAPE_CACHE_STALE_TTL'])
+        scraper = ProfileScraper(
+            max_workers=current_app.config['SCRAPE_WORKERS'],
+            deadline=current_app.config['SCRAPE_DEADLINE'],
+            cache=create_scrape_cache(
+                current_app.config['SCRAPE_CACHE_BACKEND'],
+                max_age=(cache_duration + stale_duration).total_seconds(),
+                path=scrape_cache_path()
+            ),
+            cache_duration=cache_duration,
+            stale_duration=stale_duration,
+            max_repo_pages=current_app.config['SCRAPE_GITHUB_MAX_PAGES'],
+            repo_page_concurrency=current_app.config['SCRAPE_GITHUB_PAGE_CONCURRENCY']
+        )
     return scraper
 
 def get_analyzer():
@@ -28,6 +54,38 @@ def get_analyzer():
     return analyzer
 
 
+analysis_queue = None
+
+def get_analysis_queue():
+    """Lazy initialization of the background analysis queue for recruiter lookups"""
+    global analysis_queue
+    if analysis_queue is None:
+        analysis_queue = ProfileAnalysisQueue(
+            current_app._get_current_object(),
+            get_scraper(),
+            get_analyzer(),
+            max_workers=current_app.config['PROFILE_BATCH_WORKERS'],
+            ttl=timedelta(seconds=current_app.config['PROFILE_ANALYSIS_TTL'])
+        )
+    return analysis_queue
+
+
+MAX_BATCH_PROFILES = 100
+
+
+def analysis_summary(profile_links):
+    """Scores and recommendations of a stored analysis, without the raw scraped data"""
+    return {
+        'github_username': profile_links.github_username,
+        'leetcode_username': profile_links.leetcode_username,
+        'github_score': profile_links.github_score,
+        'leetcode_score': profile_links.leetcode_score,
+        'overall_score': profile_links.overall_score,
+        'recommendations': profile_links.recommendations or [],
+        'last_analyzed_at': profile_links.last_analyzed_at.isoformat() if profile_links.last_analyzed_at else None
+    }
+
+
 @profile_analysis_bp.route('/extract', methods=['POST'])
 @jwt_required()
 def extract_profile_links():
@@ -88,57 +146,150 @@ def scrape_and_analyze():
         if not profile_links:
             return jsonify({'error': 'No profile links found. Please add your profiles first.'}), 404
         
-        # Check if we need to re-scrape (cache for 24 hours)
+        # Check if we need to re-scrape (analyses are kept fresh by refresh_profiles.py)
         if profile_links.last_analyzed_at:
             time_since_analysis = datetime.utcnow() - profile_links.last_analyzed_at
-            if time_since_analysis < timedelta(hours=24):
+            if time_since_analysis < timedelta(seconds=current_app.config['PROFILE_ANALYSIS_TTL']):
                 return jsonify({
                     'message': 'Using cached analysis',
                     'profile': profile_links.to_dict(),
                     'cached': True
                 }), 200
         
-        # Scrape GitHub
-        github_data = {}
-        github_analysis = {'score': 0}
-        if profile_links.github_username:
-            github_data = get_scraper().scrape_github_profile(profile_links.github_username)
-            github_analysis = get_analyzer().analyze_github_profile(github_data)
-            profile_links.github_data = github_data
-            profile_links.github_score = github_analysis.get('score', 0)
-        
-        # Scrape LeetCode
-        leetcode_data = {}
-        leetcode_analysis = {'score': 0}
-        if profile_links.leetcode_username:
-            leetcode_data = get_scraper().scrape_leetcode_profile(profile_links.leetcode_username)
-            leetcode_analysis = get_analyzer().analyze_leetcode_profile(leetcode_data)
-            profile_links.leetcode_data = leetcode_data
-            profile_links.leetcode_score = leetcode_analysis.get('score', 0)
-        
-        # Calculate overall score
-        overall_score = get_analyzer().calculate_overall_score(github_analysis, leetcode_analysis)
-        profile_links.overall_score = overall_score
-        
-        # Generate AI recommendations
-        recommendations = get_analyzer().generate_improvement_recommendations(
-            github_data, 
-            leetcode_data
+        # Scrape GitHub and LeetCode concurrently (concurrent requests share one scrape)
+        started_at = datetime.utcnow()
+        scraped = get_scraper().scrape_profiles(
+            github_username=profile_links.github_username,
+            leetcode_username=profile_links.leetcode_username
         )
-        profile_links.recommendations = recommendations
         
-        # Update timestamp
-        profile_links.last_analyzed_at = datetime.utcnow()
+        # A concurrent request (another tab, a double click) may have stored the analysis meanwhile
+        db.session.refresh(profile_links)
+        if profile_links.last_analyzed_at and profile_links.last_analyzed_at >= started_at:
+            return jsonify({
+                'message': 'Using cached analysis',
+                'profile': profile_links.to_dict(),
+                'cached': True
+            }), 200
+        
+        analysis = apply_profile_analysis(
+            profile_links, get_analyzer(), scraped['github'] or {}, scraped['leetcode'] or {}
+        )
         
         db.session.commit()
         
         return jsonify({
             'message': 'Profile analysis completed successfully',
             'profile': profile_links.to_dict(),
-            'github_analysis': github_analysis,
-            'leetcode_analysis': leetcode_analysis,
-            'overall_score': overall_score,
-            'recommendations': recommendations
+            **analysis
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@profile_analysis_bp.route('/batch', methods=['POST'])
+@jwt_required()
+def batch_profile_analysis():
+    """
+    Profile scores for many applicants at once (recruiter only, applicants to own jobs)
+    Stored analyses are returned immediately; missing and stale ones are analyzed
+    in the background, one scrape per profile however many recruiters ask -
+    poll again for 'pending' entries
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        user = User.query.get(user_id)
+        
+        if not user or user.role != 'recruiter':
+            return jsonify({'error': 'Only recruiters can view applicant profiles'}), 403
+        
+        applicant_ids = (request.get_json() or {}).get('applicant_ids')
+        
+        if not isinstance(applicant_ids, list) or not applicant_ids:
+            return jsonify({'error': 'applicant_ids must be a non-empty list'}), 400
+        
+        if len(applicant_ids) > MAX_BATCH_PROFILES:
+            return jsonify({'error': f'At most {MAX_BATCH_PROFILES} applicants per request'}), 400
+        
+        try:
+            applicant_ids = list(dict.fromkeys(int(applicant_id) for applicant_id in applicant_ids))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'applicant_ids must be integers'}), 400
+        
+        # Only candidates who applied to one of this recruiter's jobs
+        visible_ids = {
+            applicant_id for (applicant_id,) in db.session.query(Application.user_id)
+            .join(Job, Job.id == Application.job_id)
+            .filter(Job.recruiter_id == user_id, Application.user_id.in_(applicant_ids))
+            .distinct()
+        }
+        
+        profiles = {
+            profile_links.user_id: profile_links
+            for profile_links in ProfileLinks.query.filter(ProfileLinks.user_id.in_(visible_ids))
+        } if visible_ids else {}
+        
+        # Standing among all profiles and within each candidate's skill segment, one query
+        analyzed = [profile_links for profile_links in profiles.values() if profile_links.last_analyzed_at]
+        distributions = ranking.distributions(
+            {'all'} | {profile_links.ranked_segment for profile_links in analyzed if profile_links.ranked_segment}
+        ) if analyzed else {}
+        
+        fresh_after = datetime.utcnow() - timedelta(seconds=current_app.config['PROFILE_ANALYSIS_TTL'])
+        results = []
+        for applicant_id in applicant_ids:
+            result = {'user_id': applicant_id}
+            profile_links = profiles.get(applicant_id)
+            
+            if applicant_id not in visible_ids:
+                result['status'] = 'unauthorized'
+            elif not profile_links or not (profile_links.github_username or profile_links.leetcode_username):
+                result['status'] = 'no_profile'
+            elif profile_links.last_analyzed_at and profile_links.last_analyzed_at >= fresh_after:
+                result['status'] = 'ready'
+            else:
+                scheduled = get_analysis_queue().schedule(profile_links.id)
+                if scheduled == 'failed':
+                    result['status'] = 'unavailable'
+                else:
+                    result['status'] = 'stale' if profile_links.last_analyzed_at else 'pending'
+            
+            if profile_links and profile_links.last_analyzed_at:
+                result['analysis'] = analysis_summary(profile_links)
+                result['analysis']['rankings'] = [
+                    distributions[segment].rank(profile_links.overall_score)
+                    for segment in ('all', profile_links.ranked_segment) if segment in distributions
+                ]
+            results.append(result)
+        
+        return jsonify({
+            'results': results,
+            'pending': sum(1 for result in results if result['status'] in ('pending', 'stale'))
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@profile_analysis_bp.route('/percentile', methods=['GET'])
+@jwt_required()
+def get_score_percentile():
+    """
+    Rank and percentile of the user's overall score among all analyzed profiles
+    and within their skill segment (primary GitHub language), or the `segment` given
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        
+        profile_links = ProfileLinks.query.filter_by(user_id=user_id).first()
+        if not profile_links or not profile_links.last_analyzed_at:
+            return jsonify({'error': 'No profile analysis found. Analyze your profiles first.'}), 404
+        
+        return jsonify({
+            'overall_score': profile_links.overall_score,
+            'rankings': ranking.rankings(profile_links, segment=request.args.get('segment'))
         }), 200
         
     except Exception as e:
@@ -146,11 +297,27 @@ def scrape_and_analyze():
         return jsonify({'error': str(e)}), 500
 
 
+@profile_analysis_bp.route('/segments', methods=['GET'])
+@jwt_required()
+def get_score_segments():
+    """
+    Skill segments available for percentile queries, with their profile counts
+    """
+    try:
+        min_profiles = request.args.get('min_profiles', 1, type=int)
+        return jsonify({'segments': ranking.segments(min_profiles=min_profiles)}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @profile_analysis_bp.route('/report', methods=['GET'])
 @jwt_required()
 def get_analysis_report():
     """
     Get comprehensive profile analysis report
+    Analyses are stored when profiles are scraped; they are only recomputed here
+    (once) when the analyzer version has changed since
     """
     try:
         user_id = int(get_jwt_identity())
@@ -159,19 +326,20 @@ def get_analysis_report():
         if not profile_links:
             return jsonify({'error': 'No profile analysis found'}), 404
         
-        # Re-analyze if needed
-        github_analysis = get_analyzer().analyze_github_profile(profile_links.github_data or {})
-        leetcode_analysis = get_analyzer().analyze_leetcode_profile(profile_links.leetcode_data or {})
+        if profile_links.last_analyzed_at and profile_links.analyzer_version != ProfileAnalyzer.VERSION:
+            reanalyze_stored(profile_links, get_analyzer())
+            db.session.commit()
         
         return jsonify({
             'profile': profile_links.to_dict(),
-            'github_analysis': github_analysis,
-            'leetcode_analysis': leetcode_analysis,
+            'github_analysis': profile_links.github_analysis,
+            'leetcode_analysis': profile_links.leetcode_analysis,
             'overall_score': profile_links.overall_score,
             'recommendations': profile_links.recommendations or []
         }), 200
         
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 
@@ -225,8 +393,11 @@ def refresh_analysis():
         if not profile_links:
             return jsonify({'error': 'No profile links found'}), 404
         
-        # Clear cache
-        get_scraper().clear_cache()
+        # Drop only this user's cached profiles
+        get_scraper().invalidate(
+            github_username=profile_links.github_username,
+            leetcode_username=profile_links.leetcode_username
+        )
         
         # Force re-scrape by setting last_analyzed_at to None
         profile_links.last_analyzed_at = None
@@ -0,0 +1,208 @@
+"""
+In-process cache of answer evaluations
+"""
+import copy
+import hashlib
+import re
+import struct
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+class EvaluationCache:
+    """
+    Reuse LLM evaluations for repeated answers to the same question
+
+    Entries are keyed on the question (bank entry id, or the normalized question
+    text) plus a fingerprint of the normalized answer:
+        exact - SHA-256 of the normalized answer
+        near  - MinHash of its word shingles, looked up through LSH bands and
+                accepted when the estimated Jaccard similarity >= `similarity`
+    Entries expire after `ttl` seconds; the least recently used entry is evicted
+    once `max_entries` is reached. Answers shorter than `min_answer_chars` once
+    normalized (empty, "idk", punctuation only) are never cached.
+    """
+
+    def __init__(self, max_entries=5000, ttl=86400, similarity=0.85,
+                 num_perm=128, bands=32, shingle_size=2, min_shingles=8, min_answer_chars=10):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_shingles = min_shingles  # Shorter answers only match exactly
+        self.min_answer_chars = min_answer_chars
+
+        # Fixed permutations (a*x + b mod p) so signatures are stable across processes
+        seeds = [hashlib.sha256(f'minhash-{i}'.encode('utf-8')).digest() for i in range(num_perm)]
+        self.permutations = [
+            (int.from_bytes(seed[:8], 'big') % (MERSENNE_PRIME - 1) + 1, int.from_bytes(seed[8:16], 'big') % MERSENNE_PRIME)
+            for seed in seeds
+        ]
+
+        self.entries = OrderedDict()                  # (question_key, answer_hash) -> entry, oldest first
+        self.buckets = defaultdict(set)               # (question_key, band, band_hash) -> entry keys
+        self.lock = threading.Lock()
+        self.counters = {'exact_hits': 0, 'near_hits': 0, 'misses': 0, 'skipped': 0, 'evictions': 0, 'expired': 0}
+
+    # ============================================
+    # FINGERPRINTS
+    # ============================================
+
+    @staticmethod
+    def question_key(question, job_role, interview_type, bank_question_id=None):
+        """Cache namespace for a question as asked for a role and interview type"""
+        question_part = f'bank:{bank_question_id}' if bank_question_id else ' '.join((question or '').lower().split())
+        raw = '|'.join([question_part, ' '.join((job_role or '').lower().split()), (interview_type or '').lower()])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def normalize(answer):
+        """Case-folded words (any script) without punctuation, single-spaced"""
+        return ' '.join(re.findall(r'\w+', (answer or '').casefold()))
+
+    def _shingles(self, normalized):
+        words = normalized.split()
+        if len(words) < self.shingle_size:
+            return {normalized} if normalized else set()
+        return {' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def _minhash(self, shingles):
+        """MinHash signature (num_perm values) of a shingle set"""
+        hashes = [struct.unpack('<I', hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest())[0] for s in shingles]
+        return tuple(
+            min(((a * h + b) % MERSENNE_PRIME) & MAX_HASH for h in hashes)
+            for a, b in self.permutations
+        )
+
+    def _band_keys(self, question_key, signature):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield (question_key, band, hash(signature[start:start + self.rows]))
+
+    @staticmethod
+    def _answer_hash(normalized):
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def _signature(self, normalized):
+        """MinHash signature, or None for answers too short to compare approximately"""
+        shingles = self._shingles(normalized)
+        return self._minhash(shingles) if len(shingles) >= self.min_shingles else None
+
+    # ============================================
+    # LOOKUP
+    # ============================================
+
+    def get(self, question_key, answer):
+        """
+        Cached evaluation for an answer to this question
+        Returns: (evaluation copy, 'exact' | 'near') or (None, None) on a miss
+        """
+        normalized = self.normalize(answer)
+        if len(normalized) < self.min_answer_chars:
+            with self.lock:
+                self.counters['skipped'] += 1
+            return None, None
+
+        key = (question_key, self._answer_hash(normalized))
+        now = time.monotonic()
+
+        with self.lock:
+            entry = self._live_entry(key, now)
+            if entry:
+                self.entries.move_to_end(key)
+                self.counters['exact_hits'] += 1
+                return copy.deepcopy(entry['evaluation']), 'exact'
+
+        # MinHash is only computed on an exact miss, outside the lock
+        signature = self._signature(normalized)
+
+        with self.lock:
+            if signature is not None:
+                match = self._nearest(question_key, signature, now)
+                if match:
+                    self.entries.move_to_end(match)
+                    self.counters['near_hits'] += 1
+                    return copy.deepcopy(self.entries[match]['evaluation']), 'near'
+
+            self.counters['misses'] += 1
+            return None, None
+
+    def _live_entry(self, key, now):
+        """Entry for key unless it has expired (expired entries are dropped)"""
+        entry = self.entries.get(key)
+        if entry and now - entry['created_at'] > self.ttl:
+            self._remove(key)
+            self.counters['expired'] += 1
+            return None
+        return entry
+
+    def _nearest(self, question_key, signature, now):
+        """Most similar live entry sharing an LSH band, if similar enough"""
+        candidates = set()
+        for band_key in self._band_keys(question_key, signature):
+            candidates.update(self.buckets.get(band_key, ()))
+
+        best_key, best_similarity = None, self.similarity
+        for key in candidates:
+            entry = self._live_entry(key, now)
+            if not entry:
+                continue
+            similarity = sum(x == y for x, y in zip(signature, entry['signature'])) / self.num_perm
+            if similarity >= best_similarity:
+                best_key, best_similarity = key, similarity
+        return best_key
+
+    # ============================================
+    # STORE
+    # ============================================
+
+    def put(self, question_key, answer, evaluation):
+        """Remember the evaluation of an answer to this question"""
+        normalized = self.normalize(answer)
+        if len(normalized) < self.min_answer_chars:
+            return
+
+        key = (question_key, self._answer_hash(normalized))
+        signature = self._signature(normalized)
+
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+
+            while len(self.entries) >= self.max_entries:
+                oldest = next(iter(self.entries))
+                self._remove(oldest)
+                self.counters['evictions'] += 1
+
+            self.entries[key] = {
+                'evaluation': copy.deepcopy(evaluation),
+                'signature': signature,
+                'created_at': time.monotonic()
+            }
+            if signature is not None:
+                for band_key in self._band_keys(question_key, signature):
+                    self.buckets[band_key].add(key)
+
+    def _remove(self, key):
+        entry = self.entries.pop(key)
+        if entry['signature'] is not None:
+            for band_key in self._band_keys(key[0], entry['signature']):
+                bucket = self.buckets.get(band_key)
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del self.buckets[band_key]
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'max_entries': self.max_entries, **self.counters}
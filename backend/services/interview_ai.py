@@ -1,22 +1,30 @@
 """
 AI-powered mock interview service
 """
+import json
 import os
 import re
-from openai import OpenAI
 from prompts.interview_prompts import InterviewPrompts
 from models.resume import Resume, Skill
+from services.llm_client import get_llm_client
 
 
 class InterviewAI:
-    """AI-powered interview system using LLM"""
+    """
+    AI-powered interview system using LLM
+    LLM methods take an optional `usage` (utils.tokens.TokenUsage) that the call's tokens are added to
+    """
     
-    def __init__(self):
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
-        
-        self.client = OpenAI(api_key=api_key)
+    PERFORMANCE_LEVELS = ('Beginner', 'Intermediate', 'Job-Ready')
+    
+    def __init__(self, client=None, model=None):
+        """
+        Args:
+            client: OpenAI-compatible chat client (default: the shared client from get_llm_client)
+            model: model name sent with every request (default: LLM_MODEL)
+        """
+        self.client = client or get_llm_client()
+        self.model = model or os.getenv('LLM_MODEL', 'gpt-3.5-turbo')  # Use gpt-4 for better quality
         self.prompts = InterviewPrompts()
     
     def get_user_profile(self, user_id):
@@ -41,55 +49,102 @@ class InterviewAI:
         
         return skill_names, experience_level
     
-    def generate_question(self, job_role, skills, experience_level, interview_type, question_number):
+    def _question_request(self, job_role, skills, experience_level, interview_type, question_number, avoid=None):
+        """Build chat completion arguments for question generation"""
+        prompt = self.prompts.generate_question_prompt(
+            job_role, skills, experience_level, interview_type, question_number, avoid
+        )
+        
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": "You are an expert interviewer."},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.7,
+            'max_tokens': 200
+        }
+    
+    def generate_question(self, job_role, skills, experience_level, interview_type, question_number,
+                          usage=None, avoid=None):
         """
         Generate interview question using LLM
+        avoid: questions the candidate has already been asked
         
         Returns: question text
         """
-        prompt = self.prompts.generate_question_prompt(
-            job_role, skills, experience_level, interview_type, question_number
-        )
+        request = self._question_request(job_role, skills, experience_level, interview_type, question_number, avoid)
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",  # Use gpt-4 for better quality
-                messages=[
-                    {"role": "system", "content": "You are an expert interviewer."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=200
-            )
-            
-            question = response.choices[0].message.content.strip()
-            return question
+            return self._complete(request, usage)
             
         except Exception as e:
             raise Exception(f"Error generating question: {str(e)}")
     
-    def evaluate_answer(self, question, user_answer, job_role, interview_type):
+    def stream_question(self, job_role, skills, experience_level, interview_type, question_number, usage=None):
         """
-        Evaluate user's answer using LLM
+        Stream interview question tokens as the LLM produces them
         
-        Returns: dict with scores and feedback
+        Yields: text chunks (join them for the full question)
         """
+        request = self._question_request(job_role, skills, experience_level, interview_type, question_number)
+        
+        try:
+            yield from self._stream_completion(request, usage)
+        except Exception as e:
+            raise Exception(f"Error generating question: {str(e)}")
+    
+    def _complete(self, request, usage=None):
+        """Run a chat completion, recording its tokens on usage; returns the reply text"""
+        response = self.client.chat.completions.create(**request)
+        
+        if usage is not None:
+            usage.add_response(request, response)
+        
+        return response.choices[0].message.content.strip()
+    
+    def _stream_completion(self, request, usage=None):
+        """Yield content deltas from a streaming chat completion (tokens are counted locally)"""
+        stream = self.client.chat.completions.create(**request, stream=True)
+        parts = []
+        
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content
+            if text:
+                parts.append(text)
+                yield text
+        
+        if usage is not None:
+            usage.add_estimate(request, ''.join(parts))
+    
+    def _evaluation_request(self, question, user_answer, job_role, interview_type):
+        """Build chat completion arguments for answer evaluation"""
         prompt = self.prompts.evaluate_answer_prompt(
             question, user_answer, job_role, interview_type
         )
         
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": "You are an expert interview evaluator."},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.5,
+            'max_tokens': 500
+        }
+    
+    def evaluate_answer(self, question, user_answer, job_role, interview_type, usage=None):
+        """
+        Evaluate user's answer using LLM
+        
+        Returns: dict with scores and feedback
+        """
+        request = self._evaluation_request(question, user_answer, job_role, interview_type)
+        
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert interview evaluator."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5,
-                max_tokens=500
-            )
-            
-            evaluation_text = response.choices[0].message.content.strip()
+            evaluation_text = self._complete(request, usage)
             
             # Parse the response
             evaluation = self._parse_evaluation(evaluation_text)
@@ -99,6 +154,30 @@ class InterviewAI:
         except Exception as e:
             raise Exception(f"Error evaluating answer: {str(e)}")
     
+    def stream_evaluation(self, question, user_answer, job_role, interview_type, usage=None):
+        """
+        Stream answer evaluation, parsing it incrementally
+        
+        Yields: event dicts {'event': ..., 'data': ...}
+            token        - raw text chunk
+            field        - a score line completed ({'name', 'value'})
+            item         - a strength/improvement bullet completed ({'section', 'text'})
+            model_answer - a model answer line completed ({'text'})
+            evaluation   - final structured evaluation (same shape as evaluate_answer)
+        """
+        request = self._evaluation_request(question, user_answer, job_role, interview_type)
+        parser = EvaluationStreamParser()
+        
+        try:
+            for text in self._stream_completion(request, usage):
+                yield {'event': 'token', 'data': {'text': text}}
+                yield from parser.feed(text)
+            yield from parser.close()
+        except Exception as e:
+            raise Exception(f"Error evaluating answer: {str(e)}")
+        
+        yield {'event': 'evaluation', 'data': self._parse_evaluation(parser.text.strip())}
+    
     def _parse_evaluation(self, evaluation_text):
         """Parse LLM evaluation response into structured format"""
         try:
@@ -148,7 +227,30 @@ class InterviewAI:
                 'feedback': evaluation_text
             }
     
-    def generate_final_feedback(self, session_data):
+    def _final_feedback_request(self, session_data):
+        """Build chat completion arguments for final feedback"""
+        prompt = self.prompts.final_feedback_prompt(session_data)
+        
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": "You are an expert career coach."},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.6,
+            'max_tokens': 800
+        }
+    
+    @staticmethod
+    def _performance_level(feedback):
+        """Determine performance level from feedback text"""
+        if "Job-Ready" in feedback:
+            return "Job-Ready"
+        elif "Intermediate" in feedback:
+            return "Intermediate"
+        return "Beginner"
+    
+    def generate_final_feedback(self, session_data, usage=None):
         """
         Generate final interview feedback
         
@@ -157,30 +259,194 @@ class InterviewAI:
         
         Returns: feedback text
         """
-        prompt = self.prompts.final_feedback_prompt(session_data)
+        request = self._final_feedback_request(session_data)
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert career coach."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.6,
-                max_tokens=800
-            )
-            
-            feedback = response.choices[0].message.content.strip()
-            
-            # Determine performance level from feedback
-            if "Job-Ready" in feedback:
-                performance_level = "Job-Ready"
-            elif "Intermediate" in feedback:
-                performance_level = "Intermediate"
-            else:
-                performance_level = "Beginner"
+            feedback = self._complete(request, usage)
             
-            return feedback, performance_level
+            return feedback, self._performance_level(feedback)
             
         except Exception as e:
             raise Exception(f"Error generating final feedback: {str(e)}")
+    
+    def stream_final_feedback(self, session_data, usage=None):
+        """
+        Stream final interview feedback
+        
+        Yields: event dicts - 'token' chunks, then 'feedback' with {'feedback', 'performance_level'}
+        """
+        request = self._final_feedback_request(session_data)
+        parts = []
+        
+        try:
+            for text in self._stream_completion(request, usage):
+                parts.append(text)
+                yield {'event': 'token', 'data': {'text': text}}
+        except Exception as e:
+            raise Exception(f"Error generating final feedback: {str(e)}")
+        
+        feedback = ''.join(parts).strip()
+        yield {'event': 'feedback', 'data': {
+            'feedback': feedback,
+            'performance_level': self._performance_level(feedback)
+        }}
+    
+    # ============================================
+    # BATCH EVALUATION
+    # ============================================
+    
+    def _session_evaluation_request(self, session_data):
+        """Build chat completion arguments for grading a whole session"""
+        prompt = self.prompts.batch_evaluation_prompt(session_data)
+        
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": "You are an expert interview evaluator and career coach. Respond with JSON only."},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.5,
+            'max_tokens': 800 + 400 * len(session_data['qa_pairs']),
+            'response_format': {'type': 'json_object'}
+        }
+    
+    def evaluate_session(self, session_data, usage=None):
+        """
+        Grade every answer and generate the final feedback in one structured LLM call
+        
+        Args:
+            session_data: Dict with job_role, interview_type, qa_pairs (question_number, question, answer)
+        
+        Returns: (evaluations keyed by question_number - same shape as evaluate_answer,
+                  feedback text, performance level)
+        """
+        request = self._session_evaluation_request(session_data)
+        
+        try:
+            result = self._parse_json(self._complete(request, usage))
+        except Exception as e:
+            raise Exception(f"Error evaluating session: {str(e)}")
+        
+        graded = {}
+        for item in result.get('evaluations') or []:
+            if isinstance(item, dict) and item.get('question_number') is not None:
+                try:
+                    graded[int(item['question_number'])] = item
+                except (TypeError, ValueError):
+                    continue
+        
+        evaluations = {
+            qa['question_number']: self._session_item_evaluation(graded.get(qa['question_number'], {}))
+            for qa in session_data['qa_pairs']
+        }
+        
+        feedback = str(result.get('feedback') or '').strip()
+        performance_level = result.get('performance_level')
+        if performance_level not in self.PERFORMANCE_LEVELS:
+            performance_level = self._performance_level(feedback)
+        
+        return evaluations, feedback, performance_level
+    
+    @staticmethod
+    def _parse_json(text):
+        """Parse a JSON object reply, tolerating a surrounding markdown code fence"""
+        text = text.strip()
+        if text.startswith('```'):
+            text = re.sub(r'^```(?:json)?\s*|\s*```$', '', text)
+        result = json.loads(text)
+        if not isinstance(result, dict):
+            raise ValueError("Expected a JSON object")
+        return result
+    
+    @staticmethod
+    def _session_item_evaluation(item):
+        """Convert one JSON evaluation item to the evaluate_answer shape (missing fields get neutral defaults)"""
+        def score(key):
+            try:
+                return min(10.0, max(0.0, float(item[key])))
+            except (KeyError, TypeError, ValueError):
+                return 5.0
+        
+        def bullets(key, default):
+            value = item.get(key)
+            if isinstance(value, list):
+                value = '\n'.join(str(v).strip() for v in value if str(v).strip())
+            return str(value).strip() if value else default
+        
+        return {
+            'score': score('score'),
+            'technical_correctness': score('technical_correctness'),
+            'clarity_score': score('clarity'),
+            'relevance_score': score('relevance'),
+            'strengths': bullets('strengths', "Answer provided"),
+            'improvements': bullets('improvements', "Continue practicing"),
+            'model_answer': str(item.get('model_answer') or '').strip(),
+            'feedback': json.dumps(item) if item else ''
+        }
+
+
+class EvaluationStreamParser:
+    """Incrementally parse the SCORE/.../MODEL_ANSWER evaluation format as tokens arrive"""
+    
+    SCORE_FIELDS = {
+        'SCORE': 'score',
+        'TECHNICAL': 'technical_correctness',
+        'CLARITY': 'clarity_score',
+        'RELEVANCE': 'relevance_score'
+    }
+    LIST_SECTIONS = {'STRENGTHS': 'strengths', 'IMPROVEMENTS': 'improvements'}
+    
+    SCORE_LINE = re.compile(r'^(SCORE|TECHNICAL|CLARITY|RELEVANCE):\s*(\d+(?:\.\d+)?)')
+    SECTION_LINE = re.compile(r'^(STRENGTHS|IMPROVEMENTS|MODEL_ANSWER):\s*(.*)$')
+    
+    def __init__(self):
+        self.text = ''
+        self.buffer = ''
+        self.section = None
+    
+    def feed(self, chunk):
+        """Consume a text chunk; returns events for every line it completed"""
+        self.text += chunk
+        self.buffer += chunk
+        
+        events = []
+        while '\n' in self.buffer:
+            line, self.buffer = self.buffer.split('\n', 1)
+            events.extend(self._parse_line(line))
+        return events
+    
+    def close(self):
+        """Flush the trailing partial line"""
+        events = self._parse_line(self.buffer) if self.buffer else []
+        self.buffer = ''
+        return events
+    
+    def _parse_line(self, line):
+        stripped = line.strip()
+        
+        score_match = self.SCORE_LINE.match(stripped)
+        if score_match:
+            self.section = None
+            return [{'event': 'field', 'data': {
+                'name': self.SCORE_FIELDS[score_match.group(1)],
+                'value': float(score_match.group(2))
+            }}]
+        
+        section_match = self.SECTION_LINE.match(stripped)
+        if section_match:
+            self.section = section_match.group(1)
+            rest = section_match.group(2).strip()
+            if self.section == 'MODEL_ANSWER' and rest:
+                return [{'event': 'model_answer', 'data': {'text': rest}}]
+            return []
+        
+        if self.section in self.LIST_SECTIONS and stripped.startswith('-'):
+            return [{'event': 'item', 'data': {
+                'section': self.LIST_SECTIONS[self.section],
+                'text': stripped.strip('- ').strip()
+            }}]
+        
+        if self.section == 'MODEL_ANSWER' and stripped:
+            return [{'event': 'model_answer', 'data': {'text': stripped}}]
+        
+        return []
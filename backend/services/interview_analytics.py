@@ -0,0 +1,191 @@
+"""
+Per-user interview score aggregates, maintained as answers are graded
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+from models import db
+from models.interview import InterviewSession, InterviewQA, InterviewStats
+
+ALL = 'all'
+
+# (evaluation key, InterviewQA column, InterviewStats sum column)
+DIMENSIONS = (
+    ('score', 'score', 'score_sum'),
+    ('technical_correctness', 'technical_correctness', 'technical_sum'),
+    ('clarity_score', 'clarity_score', 'clarity_sum'),
+    ('relevance_score', 'relevance_score', 'relevance_sum'),
+)
+
+
+class InterviewAnalytics:
+    """
+    Running totals per (user, interview type, week), plus 'all' rows for every type
+    and all time, so progress summaries read a handful of rows instead of every QA.
+    Answers and completions count towards the week their session started in.
+    A user's ('all', 'all') row marks totals that include every earlier session:
+    it is written by rebuild(), which runs before the user's first update.
+    """
+
+    # ============================================
+    # UPDATES (caller commits)
+    # ============================================
+
+    @staticmethod
+    def period_of(moment):
+        """Monday of the week containing moment, as YYYY-MM-DD"""
+        moment = moment or datetime.utcnow()
+        return (moment.date() - timedelta(days=moment.weekday())).isoformat()
+
+    def _scopes(self, session):
+        period = self.period_of(session.start_time)
+        interview_types = {ALL, session.interview_type or 'Unknown'}
+        return [(interview_type, p) for interview_type in interview_types for p in (ALL, period)]
+
+    def record_answer(self, session, previous, evaluation):
+        """
+        Add a graded answer to the session owner's totals
+
+        Args:
+            session: InterviewSession the answer belongs to
+            previous: {qa column: value} of an earlier grade of the same question (re-answer), or None
+            evaluation: evaluation dict as returned by InterviewAI
+        """
+        if self._ensure_rebuilt(session.user_id):
+            return
+
+        deltas = {'answers_count': 0 if previous else 1}
+        for evaluation_key, qa_column, sum_column in DIMENSIONS:
+            delta = float(evaluation.get(evaluation_key) or 0)
+            if previous:
+                delta -= float(previous.get(qa_column) or 0)
+            deltas[sum_column] = delta
+
+        self._increment(session.user_id, self._scopes(session), deltas)
+
+    def record_completion(self, session):
+        """Add a completed session's overall score to its owner's totals"""
+        if self._ensure_rebuilt(session.user_id):
+            return
+
+        self._increment(session.user_id, self._scopes(session), {
+            'sessions_completed': 1,
+            'overall_score_sum': float(session.overall_score or 0)
+        })
+
+    def _ensure_rebuilt(self, user_id):
+        """
+        Count a user's earlier sessions before their first incremental update
+        Returns: True if the totals were just rebuilt (they include the pending change)
+        """
+        if db.session.query(InterviewStats.query.filter_by(
+            user_id=user_id, interview_type=ALL, period=ALL
+        ).exists()).scalar():
+            return False
+
+        try:
+            with db.session.begin_nested():
+                self.rebuild(user_id)
+        except IntegrityError:
+            return False  # Rebuilt concurrently by a request that could not see this change
+        return True
+
+    @staticmethod
+    def _increment(user_id, scopes, deltas):
+        """Add deltas to each scope row in SQL, creating rows on first use"""
+        values = {
+            column: db.func.coalesce(getattr(InterviewStats, column), 0) + delta
+            for column, delta in deltas.items()
+        }
+        values['updated_at'] = datetime.utcnow()
+
+        for interview_type, period in scopes:
+            query = InterviewStats.query.filter_by(user_id=user_id, interview_type=interview_type, period=period)
+            if query.update(values, synchronize_session=False):
+                continue
+
+            # Another request may create the same row concurrently
+            try:
+                with db.session.begin_nested():
+                    db.session.add(InterviewStats(
+                        user_id=user_id, interview_type=interview_type, period=period, **deltas
+                    ))
+            except IntegrityError:
+                query.update(values, synchronize_session=False)
+
+    # ============================================
+    # READS
+    # ============================================
+
+    def summary(self, user_id, interview_type=None, weeks=12):
+        """
+        Progress summary: all-time averages, averages per interview type and a weekly trend
+        (for one interview type when given, otherwise across all types)
+        """
+        rows = InterviewStats.query.filter_by(user_id=user_id).all()
+        if not any(row.interview_type == ALL and row.period == ALL for row in rows):
+            rows = self.rebuild(user_id)
+            db.session.commit()
+
+        trend_type = interview_type or ALL
+        overall = next((row for row in rows if row.interview_type == ALL and row.period == ALL), None)
+        by_type = {
+            row.interview_type: row.to_dict()
+            for row in rows if row.interview_type != ALL and row.period == ALL
+        }
+        trend = sorted(
+            (row for row in rows if row.interview_type == trend_type and row.period != ALL),
+            key=lambda row: row.period
+        )[-weeks:] if weeks > 0 else []
+
+        return {
+            'overall': overall.to_dict() if overall else InterviewStats(interview_type=ALL, period=ALL).to_dict(),
+            'by_type': by_type,
+            'trend': [row.to_dict() for row in trend],
+            'trend_interview_type': trend_type
+        }
+
+    def rebuild(self, user_id):
+        """
+        Recompute a user's totals from their sessions (sessions from before the
+        aggregates existed, or after manual data fixes; caller commits)
+        Returns: list of InterviewStats, always including the ('all', 'all') row
+        """
+        totals = defaultdict(lambda: defaultdict(float))
+        totals[(ALL, ALL)]  # Written even without sessions, as the user's marker
+
+        graded = db.session.query(InterviewSession, InterviewQA).join(
+            InterviewQA, InterviewQA.session_id == InterviewSession.id
+        ).filter(
+            InterviewSession.user_id == user_id,
+            InterviewQA.score.isnot(None)
+        ).all()
+        for session, qa in graded:
+            for scope in self._scopes(session):
+                totals[scope]['answers_count'] += 1
+                for _, qa_column, sum_column in DIMENSIONS:
+                    totals[scope][sum_column] += float(getattr(qa, qa_column) or 0)
+
+        completed = InterviewSession.query.filter(
+            InterviewSession.user_id == user_id,
+            InterviewSession.end_time.isnot(None)
+        ).all()
+        for session in completed:
+            for scope in self._scopes(session):
+                totals[scope]['sessions_completed'] += 1
+                totals[scope]['overall_score_sum'] += float(session.overall_score or 0)
+
+        InterviewStats.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+        rows = [
+            InterviewStats(
+                user_id=user_id, interview_type=interview_type, period=period,
+                answers_count=int(values['answers_count']),
+                sessions_completed=int(values['sessions_completed']),
+                **{column: value for column, value in values.items()
+                   if column not in ('answers_count', 'sessions_completed')}
+            )
+            for (interview_type, period), values in totals.items()
+        ]
+        db.session.add_all(rows)
+        db.session.flush()
+        return rows
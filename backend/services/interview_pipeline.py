@@ -0,0 +1,81 @@
+"""
+Concurrent execution and question prefetching for interview LLM calls
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.tokens import TokenUsage
+
+
+class InterviewPipeline:
+    """Run independent interview LLM calls concurrently and prefetch upcoming questions"""
+
+    def __init__(self, ai, max_workers=8, prefetch=True, prefetch_ttl=1800):
+        self.ai = ai
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='interview-llm')
+        self.prefetch_enabled = prefetch
+        self.prefetch_ttl = prefetch_ttl
+        self.prefetched = {}  # (session_id, question_number) -> (future, created_at)
+        self.lock = threading.Lock()
+
+    def prefetch_question(self, session_id, question_number, job_role, skills, experience_level, interview_type):
+        """
+        Start generating a question before it is needed
+        Questions do not depend on previous answers, so question N+1 can be
+        generated while the candidate is still answering question N
+        """
+        if not self.prefetch_enabled:
+            return
+
+        key = (session_id, question_number)
+        with self.lock:
+            self._prune()
+            if key in self.prefetched:
+                return
+            future = self.executor.submit(
+                self._generate_question,
+                job_role, skills, experience_level, interview_type, question_number
+            )
+            self.prefetched[key] = (future, time.monotonic())
+
+    def question_future(self, session_id, question_number, job_role, skills, experience_level, interview_type):
+        """
+        Future for a question: the prefetched one if available, otherwise a new LLM call
+        Resolves to (question, TokenUsage)
+        """
+        with self.lock:
+            entry = self.prefetched.pop((session_id, question_number), None)
+
+        if entry:
+            future, _ = entry
+            # A failed prefetch is retried rather than surfaced
+            if not (future.done() and future.exception() is not None):
+                return future
+
+        return self.executor.submit(
+            self._generate_question,
+            job_role, skills, experience_level, interview_type, question_number
+        )
+
+    def _generate_question(self, job_role, skills, experience_level, interview_type, question_number):
+        """Generate a question along with the tokens it used"""
+        usage = TokenUsage()
+        question = self.ai.generate_question(
+            job_role, skills, experience_level, interview_type, question_number, usage=usage
+        )
+        return question, usage
+
+    def discard_session(self, session_id):
+        """Forget prefetched questions for a finished session"""
+        with self.lock:
+            for key in [key for key in self.prefetched if key[0] == session_id]:
+                future, _ = self.prefetched.pop(key)
+                future.cancel()
+
+    def _prune(self):
+        """Drop prefetched questions nobody collected (caller holds the lock)"""
+        now = time.monotonic()
+        expired = [key for key, (_, created_at) in self.prefetched.items() if now - created_at > self.prefetch_ttl]
+        for key in expired:
+            future, _ = self.prefetched.pop(key)
+            future.cancel()
@@ -0,0 +1,267 @@
+"""
+Bulk job ingestion service for external job feeds (JSON Lines / CSV)
+"""
+import csv
+import json
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+from models import db
+from models.job import Job, JobSkill
+
+
+class JobIngestor:
+    """Batched upsert of external job feeds keyed on (source, external_url)"""
+
+    # Columns written for every ingested row (all rows in a batch share the same keys
+    # so SQLAlchemy can send each batch as a single executemany)
+    JOB_FIELDS = (
+        'title', 'company_name', 'description', 'required_skills',
+        'experience_min', 'experience_max', 'location', 'job_type',
+        'salary_min', 'salary_max', 'deadline', 'status'
+    )
+    MAX_REPORTED_ERRORS = 50
+
+    def __init__(self, batch_size=500):
+        self.batch_size = batch_size
+
+    # ============================================
+    # FEED PARSING
+    # ============================================
+
+    @staticmethod
+    def detect_format(filename: str) -> Optional[str]:
+        """Guess feed format from file name"""
+        ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+        if ext in ('jsonl', 'ndjson', 'json'):
+            return 'jsonl'
+        if ext == 'csv':
+            return 'csv'
+        return None
+
+    def read_feed(self, stream: TextIO, fmt: str) -> Iterator[Dict]:
+        """
+        Lazily read raw rows from a feed
+        Yields: (line_number, row_dict) tuples
+        """
+        if fmt == 'csv':
+            reader = csv.DictReader(stream)
+            for line_number, row in enumerate(reader, start=2):  # Line 1 is the header
+                yield line_number, row
+        elif fmt == 'jsonl':
+            for line_number, line in enumerate(stream, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, ValueError(f'Invalid JSON: {e.msg}')
+        else:
+            raise ValueError(f'Unsupported feed format: {fmt}')
+
+    def normalize_row(self, row: Dict) -> Dict:
+        """
+        Convert a raw feed row into Job column values
+        Raises ValueError if the row cannot be ingested
+        """
+        if not isinstance(row, dict):
+            raise ValueError('Row must be an object')
+
+        title = str(row.get('title') or '').strip()
+        external_url = str(row.get('external_url') or row.get('url') or '').strip()
+        if not title:
+            raise ValueError('Missing title')
+        if not external_url:
+            raise ValueError('Missing external_url')
+
+        return {
+            'external_url': external_url,
+            'title': title[:255],
+            'company_name': (row.get('company_name') or row.get('company') or None),
+            'description': row.get('description') or None,
+            'required_skills': self._parse_skills(row.get('required_skills') or row.get('skills')),
+            'experience_min': self._parse_number(row.get('experience_min'), int),
+            'experience_max': self._parse_number(row.get('experience_max'), int),
+            'location': row.get('location') or None,
+            'job_type': row.get('job_type') or 'Full-time',
+            'salary_min': self._parse_number(row.get('salary_min'), float),
+            'salary_max': self._parse_number(row.get('salary_max'), float),
+            'deadline': datetime.fromisoformat(row['deadline']) if row.get('deadline') else None,
+            'status': row.get('status') or 'active'
+        }
+
+    @staticmethod
+    def _parse_skills(value) -> List[str]:
+        """Skills may arrive as a JSON list or a comma/semicolon separated string"""
+        if not value:
+            return []
+        if isinstance(value, str):
+            value = value.replace(';', ',').split(',')
+        return [str(s).strip() for s in value if str(s).strip()]
+
+    @staticmethod
+    def _parse_number(value, cast):
+        """Parse optional numeric field (CSV gives strings, JSON gives numbers)"""
+        if value is None or value == '':
+            return None
+        try:
+            return cast(float(value)) if cast is int else cast(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'Invalid number: {value!r}')
+
+    # ============================================
+    # INGESTION
+    # ============================================
+
+    def ingest_feed(self, stream: TextIO, fmt: str, source: str, recruiter_id=None, max_rows=None) -> Dict:
+        """Parse and ingest a feed stream"""
+        return self.ingest(self.read_feed(stream, fmt), source, recruiter_id, max_rows)
+
+    def ingest(self, rows: Iterable, source: str, recruiter_id=None, max_rows=None) -> Dict:
+        """
+        Upsert rows in batches of `batch_size`
+
+        Args:
+            rows: Iterable of (line_number, row_dict) tuples or plain row dicts
+            source: Feed name stored in Job.source
+            recruiter_id: Owner of ingested jobs (None for external feeds)
+            max_rows: Stop after this many rows
+
+        Returns: stats dict with inserted/updated/skipped counts and row errors
+        """
+        stats = {'processed': 0, 'inserted': 0, 'updated': 0, 'skipped': 0, 'failed': 0, 'errors': []}
+        batch = {}
+
+        for line_number, raw in self._numbered(rows):
+            if max_rows is not None and stats['processed'] >= max_rows:
+                break
+            stats['processed'] += 1
+
+            try:
+                if isinstance(raw, Exception):
+                    raise raw
+                job = self.normalize_row(raw)
+            except (ValueError, TypeError) as e:
+                stats['failed'] += 1
+                if len(stats['errors']) < self.MAX_REPORTED_ERRORS:
+                    stats['errors'].append({'line': line_number, 'error': str(e)})
+                continue
+
+            # Later rows for the same URL win within a batch
+            batch[job['external_url']] = job
+            if len(batch) >= self.batch_size:
+                self._flush(batch, source, recruiter_id, stats)
+                batch = {}
+
+        if batch:
+            self._flush(batch, source, recruiter_id, stats)
+
+        return stats
+
+    @staticmethod
+    def _numbered(rows: Iterable):
+        """Accept both (line_number, row) tuples and bare rows"""
+        for index, item in enumerate(rows, start=1):
+            if isinstance(item, tuple) and len(item) == 2:
+                yield item
+            else:
+                yield index, item
+
+    def _flush(self, batch: Dict[str, Dict], source: str, recruiter_id, stats: Dict):
+        """Write one batch and commit"""
+        try:
+            inserted, updated, skipped = self._upsert_batch(batch, source, recruiter_id)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        stats['inserted'] += inserted
+        stats['updated'] += updated
+        stats['skipped'] += skipped
+
+    def _upsert_batch(self, batch: Dict[str, Dict], source: str, recruiter_id):
+        """
+        Upsert one batch with a fixed number of statements:
+        one lookup, one bulk INSERT, one bulk UPDATE, one id lookup and
+        one skill index rewrite regardless of batch size
+        """
+        urls = list(batch.keys())
+        existing = {
+            url: (job_id, owner_id)
+            for url, job_id, owner_id in db.session.query(Job.external_url, Job.id, Job.recruiter_id)
+            .filter(Job.source == source, Job.external_url.in_(urls))
+        }
+
+        inserts = []
+        updates = []
+        job_skills = {}
+        skipped = 0
+        for url, job in batch.items():
+            if url in existing:
+                job_id, owner_id = existing[url]
+                if owner_id is not None and owner_id != recruiter_id:
+                    skipped += 1  # Never overwrite another recruiter's posting
+                    continue
+                updates.append({'id': job_id, **{field: job[field] for field in self.JOB_FIELDS}})
+                job_skills[job_id] = job['required_skills']
+            else:
+                inserts.append({**job, 'source': source, 'recruiter_id': recruiter_id})
+
+        if inserts:
+            db.session.execute(db.insert(Job), inserts)
+        if updates:
+            db.session.execute(db.update(Job), updates)
+
+        # Resolve ids of inserted rows so the skill index can be rebuilt in bulk
+        if inserts:
+            inserted_urls = [job['external_url'] for job in inserts]
+            for url, job_id in db.session.query(Job.external_url, Job.id).filter(
+                Job.source == source, Job.external_url.in_(inserted_urls)
+            ):
+                job_skills[job_id] = batch[url]['required_skills']
+
+        self.sync_skill_index(job_skills)
+
+        return len(inserts), len(updates), skipped
+
+    # ============================================
+    # SKILL INDEX
+    # ============================================
+
+    @staticmethod
+    def sync_skill_index(job_skills: Dict[int, List[str]]):
+        """
+        Replace skill index rows for the given jobs
+        Uses one DELETE and one bulk INSERT for the whole mapping (caller commits)
+        """
+        if not job_skills:
+            return
+
+        db.session.execute(db.delete(JobSkill).where(JobSkill.job_id.in_(list(job_skills.keys()))))
+
+        rows = []
+        for job_id, skills in job_skills.items():
+            for skill_name in {s.strip().lower()[:100] for s in (skills or []) if s and s.strip()}:
+                rows.append({'job_id': job_id, 'skill_name': skill_name})
+
+        if rows:
+            db.session.execute(db.insert(JobSkill), rows)
+
+    def rebuild_skill_index(self) -> int:
+        """Rebuild the skill index for every job (used after migrating existing data)"""
+        rebuilt = 0
+        last_id = 0
+        while True:
+            chunk = db.session.query(Job.id, Job.required_skills).filter(
+                Job.id > last_id
+            ).order_by(Job.id).limit(self.batch_size).all()
+            if not chunk:
+                break
+
+            self.sync_skill_index({job_id: skills for job_id, skills in chunk})
+            db.session.commit()
+            rebuilt += len(chunk)
+            last_id = chunk[-1][0]
+
+        return rebuilt
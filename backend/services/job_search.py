@@ -0,0 +1,193 @@
+"""
+Job board search filters and faceted counts
+"""
+import threading
+import time
+from typing import Dict, Iterable
+from models import db
+from models.job import Job, JobSkill
+
+
+class JobSearch:
+    """Shared job board filters plus cached facet aggregates"""
+
+    # (key, label, lower bound inclusive, upper bound exclusive) on Job.experience_min (years)
+    EXPERIENCE_BANDS = (
+        ('0-2', 'Entry level (0-2 yrs)', 0, 3),
+        ('3-5', 'Mid level (3-5 yrs)', 3, 6),
+        ('6-10', 'Senior (6-10 yrs)', 6, 11),
+        ('11+', 'Lead (11+ yrs)', 11, None),
+    )
+
+    # (key, label, lower bound inclusive, upper bound exclusive) on Job.salary_min
+    SALARY_RANGES = (
+        ('0-50k', 'Under 50k', 0, 50000),
+        ('50k-100k', '50k - 100k', 50000, 100000),
+        ('100k-150k', '100k - 150k', 100000, 150000),
+        ('150k+', '150k+', 150000, None),
+    )
+
+    def __init__(self, cache_ttl=60, max_cache_entries=256, location_limit=20):
+        self.cache_ttl = cache_ttl
+        self.max_cache_entries = max_cache_entries
+        self.location_limit = location_limit
+        self.cache = {}
+        self.lock = threading.Lock()
+
+    # ============================================
+    # FILTERS
+    # ============================================
+
+    @classmethod
+    def parse_filters(cls, args) -> Dict:
+        """Read filter values from request args, dropping empty ones"""
+        filters = {
+            'location': args.get('location'),
+            'job_type': args.get('job_type'),
+            'skills': args.get('skills'),  # Comma-separated
+            'experience_min': args.get('experience_min', type=int),
+            'search': args.get('search'),  # Search in title/company
+            'experience_band': args.get('experience_band'),
+            'salary_range': args.get('salary_range'),
+        }
+        return {key: value for key, value in filters.items() if value not in (None, '')}
+
+    @classmethod
+    def apply_filters(cls, query, filters: Dict, exclude: Iterable[str] = ()):
+        """Apply job board filters to a Job query, skipping keys in `exclude`"""
+        filters = {key: value for key, value in filters.items() if key not in exclude}
+
+        if filters.get('location'):
+            query = query.filter(Job.location.ilike(f"%{filters['location']}%"))
+
+        if filters.get('job_type'):
+            query = query.filter(Job.job_type == filters['job_type'])
+
+        if filters.get('skills'):
+            # Match any of the requested skills via the normalized skill index
+            skill_list = [s.strip().lower() for s in filters['skills'].split(',') if s.strip()]
+            if skill_list:
+                matching_jobs = db.session.query(JobSkill.job_id).filter(JobSkill.skill_name.in_(skill_list))
+                query = query.filter(Job.id.in_(matching_jobs))
+
+        if filters.get('experience_min') is not None:
+            query = query.filter(Job.experience_min <= filters['experience_min'])
+
+        if filters.get('search'):
+            search_pattern = f"%{filters['search']}%"
+            query = query.filter(
+                db.or_(
+                    Job.title.ilike(search_pattern),
+                    Job.company_name.ilike(search_pattern)
+                )
+            )
+
+        if filters.get('experience_band'):
+            query = cls._filter_bucket(query, Job.experience_min, cls.EXPERIENCE_BANDS, filters['experience_band'])
+
+        if filters.get('salary_range'):
+            query = cls._filter_bucket(query, Job.salary_min, cls.SALARY_RANGES, filters['salary_range'])
+
+        return query
+
+    @staticmethod
+    def _filter_bucket(query, column, buckets, key):
+        """Restrict column to the bounds of a named bucket (unknown keys match nothing)"""
+        for bucket_key, _, lower, upper in buckets:
+            if bucket_key == key:
+                query = query.filter(column >= lower)
+                if upper is not None:
+                    query = query.filter(column < upper)
+                return query
+        return query.filter(db.false())
+
+    @staticmethod
+    def _bucket_expression(column, buckets):
+        """SQL CASE mapping a column to bucket keys"""
+        whens = []
+        for key, _, lower, upper in buckets:
+            condition = column >= lower if upper is None else db.and_(column >= lower, column < upper)
+            whens.append((condition, key))
+        return db.case(*whens, else_='unspecified')
+
+    # ============================================
+    # FACETS
+    # ============================================
+
+    def get_facets(self, filters: Dict):
+        """
+        Facet counts for active jobs under the current filters
+        Each facet ignores its own filter so the sidebar can show alternatives
+        Returns: (facets dict, cached flag)
+        """
+        cache_key = tuple(sorted(filters.items()))
+        now = time.monotonic()
+
+        with self.lock:
+            entry = self.cache.get(cache_key)
+            if entry and now - entry['timestamp'] < self.cache_ttl:
+                return entry['data'], True
+
+        data = self._compute_facets(filters)
+
+        with self.lock:
+            if len(self.cache) >= self.max_cache_entries:
+                oldest = min(self.cache, key=lambda k: self.cache[k]['timestamp'])
+                del self.cache[oldest]
+            self.cache[cache_key] = {'data': data, 'timestamp': now}
+
+        return data, False
+
+    def _compute_facets(self, filters: Dict) -> Dict:
+        """Run one grouped query per facet plus one total count"""
+        base = Job.query.filter(Job.status == 'active')
+
+        total = self.apply_filters(base, filters).count()
+
+        location_count = db.func.count(Job.id)
+        locations = self.apply_filters(base, filters, exclude=('location',)).filter(
+            Job.location.isnot(None)
+        ).with_entities(Job.location, location_count).group_by(Job.location).order_by(
+            location_count.desc()
+        ).limit(self.location_limit).all()
+
+        job_types = self.apply_filters(base, filters, exclude=('job_type',)).with_entities(
+            Job.job_type, db.func.count(Job.id)
+        ).group_by(Job.job_type).all()
+
+        return {
+            'total': total,
+            'facets': {
+                'location': [{'value': value, 'count': count} for value, count in locations],
+                'job_type': [
+                    {'value': value, 'count': count}
+                    for value, count in sorted(job_types, key=lambda row: row[1], reverse=True)
+                    if value
+                ],
+                'experience_band': self._bucket_counts(
+                    base, filters, 'experience_band', Job.experience_min, self.EXPERIENCE_BANDS
+                ),
+                'salary_range': self._bucket_counts(
+                    base, filters, 'salary_range', Job.salary_min, self.SALARY_RANGES
+                ),
+            }
+        }
+
+    def _bucket_counts(self, base, filters, facet, column, buckets):
+        """Grouped count over a CASE bucket expression, returned in bucket order"""
+        bucket = self._bucket_expression(column, buckets)
+        counts = dict(
+            self.apply_filters(base, filters, exclude=(facet,))
+            .with_entities(bucket, db.func.count(Job.id))
+            .group_by(bucket)
+            .all()
+        )
+        return [
+            {'value': key, 'label': label, 'count': counts.get(key, 0)}
+            for key, label, _, _ in buckets
+        ]
+
+    def invalidate(self):
+        """Drop cached facets (call after job writes)"""
+        with self.lock:
+            self.cache = {}
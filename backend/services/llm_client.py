@@ -0,0 +1,302 @@
+"""
+Shared LLM client with concurrency limiting, retries and a circuit breaker
+"""
+import os
+import random
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+from openai import APIConnectionError, APITimeoutError
+from services.llm_providers import create_llm_client
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class LLMUnavailableError(Exception):
+    """The LLM cannot take the call right now (fail fast instead of piling up)"""
+
+
+class CircuitOpenError(LLMUnavailableError):
+    pass
+
+
+class LLMOverloadedError(LLMUnavailableError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+    closed    - calls pass; `failure_threshold` upstream failures in a row open it
+    open      - calls fail immediately for `reset_timeout` seconds
+    half_open - one trial call; success closes the circuit, failure re-opens it
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.trial_in_progress = False
+        self.lock = threading.Lock()
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go upstream now"""
+        with self.lock:
+            if self.state == 'open':
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    raise CircuitOpenError('LLM circuit is open after repeated upstream failures, try again shortly')
+                self.state = 'half_open'
+
+            if self.state == 'half_open':
+                if self.trial_in_progress:
+                    raise CircuitOpenError('LLM circuit is half-open and a trial call is in progress')
+                self.trial_in_progress = True
+
+    def record_success(self):
+        with self.lock:
+            self.state = 'closed'
+            self.failures = 0
+            self.trial_in_progress = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                if self.state != 'open':
+                    self.times_opened += 1
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+            self.trial_in_progress = False
+
+    def release(self):
+        """End a call that neither succeeded nor failed upstream (e.g. a 400)"""
+        with self.lock:
+            self.trial_in_progress = False
+
+
+class ResilientLLMClient:
+    """
+    Wrap an OpenAI-compatible client (client.chat.completions.create) with:
+        - a concurrency semaphore; callers wait at most `queue_timeout` for a slot
+        - a per-call deadline covering queueing, every attempt and backoff sleeps
+        - retries with full-jitter exponential backoff on 429, 5xx, timeouts and connection errors
+        - a circuit breaker that fails fast while the upstream is down
+    Streaming calls hold their slot until the stream is exhausted or closed.
+    """
+
+    def __init__(self, client, max_concurrency=32, queue_timeout=10, deadline=60,
+                 max_retries=3, backoff_base=0.5, backoff_max=8, breaker=None):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+        # Metrics
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.queued = 0
+        self.counters = {'calls': 0, 'succeeded': 0, 'failed': 0, 'retries': 0, 'rejected': 0, 'short_circuited': 0}
+        self.queue_waits = deque(maxlen=1000)
+
+    # ============================================
+    # CALLS
+    # ============================================
+
+    def create(self, stream=False, **request):
+        """Drop-in for client.chat.completions.create"""
+        started = time.monotonic()
+        deadline_at = started + self.deadline
+        self._count('calls')
+
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self._count('short_circuited')
+            raise
+
+        try:
+            self._acquire_slot(started, deadline_at)
+        except LLMOverloadedError:
+            self.breaker.release()
+            self._count('rejected')
+            raise
+
+        try:
+            response = self._call_with_retries(request, stream, deadline_at)
+        except Exception:
+            self._release_slot()
+            self._count('failed')
+            raise
+
+        if stream:
+            return self._stream_and_release(response)
+
+        self._release_slot()
+        self._count('succeeded')
+        return response
+
+    def _call_with_retries(self, request, stream, deadline_at):
+        attempt = 0
+        while True:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                self.breaker.release()
+                raise LLMUnavailableError(f'LLM call exceeded its {self.deadline}s deadline')
+
+            try:
+                if stream:
+                    response = self.client.chat.completions.create(**request, stream=True, timeout=remaining)
+                else:
+                    response = self.client.chat.completions.create(**request, timeout=remaining)
+            except Exception as e:
+                if not self._is_retryable(e):
+                    self.breaker.release()
+                    raise
+
+                self.breaker.record_failure()
+                attempt += 1
+                if attempt > self.max_retries or self.breaker.state == 'open':
+                    raise
+
+                delay = self._backoff(attempt, e)
+                if time.monotonic() + delay >= deadline_at:
+                    raise
+                self._count('retries')
+                time.sleep(delay)
+                self.breaker.before_call()
+                continue
+
+            if not stream:
+                self.breaker.record_success()  # A stream's outcome is recorded when it ends
+            return response
+
+    def _stream_and_release(self, stream):
+        """Yield stream chunks, releasing the concurrency slot when the stream ends"""
+        try:
+            yield from stream
+        except GeneratorExit:
+            self.breaker.release()  # Closed early by the caller
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            self._count('failed')
+            raise
+        else:
+            self.breaker.record_success()
+            self._count('succeeded')
+        finally:
+            self._release_slot()
+
+    @staticmethod
+    def _is_retryable(error):
+        if isinstance(error, (APIConnectionError, APITimeoutError)):
+            return True
+        return getattr(error, 'status_code', None) in RETRYABLE_STATUS_CODES
+
+    def _backoff(self, attempt, error):
+        """Full-jitter exponential backoff, honouring Retry-After when the upstream sends it"""
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    # ============================================
+    # CONCURRENCY
+    # ============================================
+
+    def _acquire_slot(self, started, deadline_at):
+        with self.lock:
+            self.queued += 1
+        try:
+            timeout = max(0, min(self.queue_timeout, deadline_at - time.monotonic()))
+            acquired = self.slots.acquire(timeout=timeout)
+        finally:
+            waited = time.monotonic() - started
+            with self.lock:
+                self.queued -= 1
+                self.queue_waits.append(waited)
+
+        if not acquired:
+            raise LLMOverloadedError(
+                f'All {self.max_concurrency} LLM slots busy for {waited:.1f}s, try again shortly'
+            )
+
+        with self.lock:
+            self.in_flight += 1
+
+    def _release_slot(self):
+        with self.lock:
+            self.in_flight -= 1
+        self.slots.release()
+
+    # ============================================
+    # METRICS
+    # ============================================
+
+    def _count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def metrics(self):
+        """Snapshot of in-flight calls, queueing delay, outcome counters and breaker state"""
+        with self.lock:
+            waits = sorted(self.queue_waits)
+            snapshot = {
+                'in_flight': self.in_flight,
+                'queued': self.queued,
+                'max_concurrency': self.max_concurrency,
+                **self.counters
+            }
+
+        snapshot['queue_wait_ms'] = {
+            'avg': round(sum(waits) / len(waits) * 1000, 1) if waits else 0,
+            'p95': round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1) if waits else 0,
+            'max': round(waits[-1] * 1000, 1) if waits else 0,
+        }
+        snapshot['circuit'] = {
+            'state': self.breaker.state,
+            'consecutive_failures': self.breaker.failures,
+            'times_opened': self.breaker.times_opened
+        }
+        return snapshot
+
+
+shared_client = None
+shared_client_lock = threading.Lock()
+
+def get_llm_client():
+    """Lazily build the process-wide LLM client (settings from LLM_* environment variables)"""
+    global shared_client
+    with shared_client_lock:
+        if shared_client is None:
+            shared_client = ResilientLLMClient(
+                create_llm_client(),
+                max_concurrency=int(os.getenv('LLM_MAX_CONCURRENCY', 32)),
+                queue_timeout=float(os.getenv('LLM_QUEUE_TIMEOUT', 10)),
+                deadline=float(os.getenv('LLM_TIMEOUT', 60)),
+                max_retries=int(os.getenv('LLM_MAX_RETRIES', 3)),
+                breaker=CircuitBreaker(
+                    failure_threshold=int(os.getenv('LLM_BREAKER_THRESHOLD', 5)),
+                    reset_timeout=float(os.getenv('LLM_BREAKER_RESET', 30))
+                )
+            )
+    return shared_client
+
+
+def llm_metrics():
+    """Metrics of the shared LLM client, or None before the first LLM call"""
+    return shared_client.metrics() if shared_client else None
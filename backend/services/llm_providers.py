@@ -0,0 +1,216 @@
+"""
+LLM client providers for the AI services
+
+Every provider exposes the OpenAI client interface (client.chat.completions.create),
+so services switch between OpenAI, an OpenAI-compatible local server and an
+offline fake through configuration only.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+import httpx
+from openai import OpenAI
+
+LLM_PROVIDERS = ('openai', 'local', 'fake')
+
+
+def create_llm_client(provider=None):
+    """
+    Build the chat completion client selected by LLM_PROVIDER
+
+    Providers:
+        openai - api.openai.com (requires OPENAI_API_KEY)
+        local  - any OpenAI-compatible server at LLM_BASE_URL (fake_llm_server.py, vLLM, Ollama, ...)
+        fake   - in-process deterministic replies, delayed by FAKE_LLM_LATENCY / FAKE_LLM_TOKEN_DELAY seconds
+    """
+    provider = (provider or os.getenv('LLM_PROVIDER', 'openai')).lower()
+
+    if provider == 'openai':
+        api_key = os.getenv('OPENAI_API_KEY')
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment variables")
+        return _openai_client(api_key=api_key)
+
+    if provider == 'local':
+        base_url = os.getenv('LLM_BASE_URL')
+        if not base_url:
+            raise ValueError("LLM_BASE_URL is required for the local LLM provider")
+        return _openai_client(base_url=base_url, api_key=os.getenv('LLM_API_KEY', 'local'))
+
+    if provider == 'fake':
+        return FakeLLMClient(FakeLLM(
+            latency=float(os.getenv('FAKE_LLM_LATENCY', 0)),
+            token_delay=float(os.getenv('FAKE_LLM_TOKEN_DELAY', 0))
+        ))
+
+    raise ValueError(f"Unknown LLM_PROVIDER '{provider}' (expected one of: {', '.join(LLM_PROVIDERS)})")
+
+
+def _openai_client(**kwargs):
+    """
+    OpenAI client with a bounded connection pool and explicit timeouts
+    (LLM_POOL_SIZE, LLM_TIMEOUT, LLM_CONNECT_TIMEOUT). Retries are left to
+    ResilientLLMClient so they share its deadline and circuit breaker.
+    """
+    pool_size = int(os.getenv('LLM_POOL_SIZE', 50))
+    timeout = httpx.Timeout(
+        float(os.getenv('LLM_TIMEOUT', 60)),
+        connect=float(os.getenv('LLM_CONNECT_TIMEOUT', 5))
+    )
+    http_client = httpx.Client(
+        limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        timeout=timeout
+    )
+    return OpenAI(timeout=timeout, max_retries=0, http_client=http_client, **kwargs)
+
+
+class FakeLLM:
+    """
+    Deterministic stand-in for a chat model: the same messages always get the same reply
+    Replies follow the formats the interview prompts ask for, so parsing code paths run unchanged
+    """
+
+    QUESTIONS = (
+        "Walk me through a project where you had to make a significant technical trade-off. What did you choose and why?",
+        "How would you design a service that needs to handle ten times its current traffic?",
+        "Describe how you debug an issue that only happens in production.",
+        "What steps do you take to make sure code you write is maintainable by others?",
+        "Explain a concept from your main skill area to someone without a technical background.",
+        "Tell me about a time you disagreed with a teammate on an implementation. How was it resolved?",
+        "How do you decide what to test, and at which level?",
+        "What would you look at first if an API endpoint suddenly became slow?",
+    )
+
+    PERFORMANCE_LEVELS = ('Beginner', 'Intermediate', 'Job-Ready')
+
+    def __init__(self, latency=0.0, token_delay=0.0, chunk_size=8):
+        self.latency = latency          # Seconds before the first token
+        self.token_delay = token_delay  # Seconds between streamed chunks
+        self.chunk_size = chunk_size    # Characters per streamed chunk
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def reply(self, messages):
+        """Reply text for a chat, chosen by the system role and a hash of the prompt"""
+        system = messages[0]['content'].lower() if len(messages) > 1 else ''
+        prompt = messages[-1]['content'] if messages else ''
+        digest = int(hashlib.sha256(prompt.encode('utf-8')).hexdigest(), 16)
+
+        if 'json' in system:
+            return self._session_evaluation(prompt, digest)
+        if 'evaluator' in system:
+            return self._evaluation(digest)
+        if 'interviewer' in system:
+            return self.QUESTIONS[digest % len(self.QUESTIONS)]
+        return self._feedback(digest)
+
+    def complete(self, messages):
+        """Full reply after the configured latency"""
+        self._start()
+        return self.reply(messages)
+
+    def stream(self, messages):
+        """Yield the reply in chunks after the configured latency"""
+        self._start()
+        text = self.reply(messages)
+        for i in range(0, len(text), self.chunk_size):
+            if i and self.token_delay:
+                time.sleep(self.token_delay)
+            yield text[i:i + self.chunk_size]
+
+    @staticmethod
+    def count_tokens(text):
+        """Rough token count (~4 characters per token)"""
+        return max(1, len(text) // 4)
+
+    def _start(self):
+        with self.lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    @staticmethod
+    def _evaluation(digest):
+        score = 4 + digest % 6
+        return (
+            f"SCORE: {score}\n"
+            f"TECHNICAL: {max(1, score - 1)}\n"
+            f"CLARITY: {min(10, score + 1)}\n"
+            f"RELEVANCE: {score}\n"
+            "STRENGTHS:\n"
+            "- Answer addresses the question directly\n"
+            "- Uses a concrete example\n"
+            "IMPROVEMENTS:\n"
+            "- Go deeper into the technical details\n"
+            "- Quantify the outcome\n"
+            "MODEL_ANSWER:\n"
+            "A strong answer states the context, the options considered, the decision and its measurable result."
+        )
+
+    def _session_evaluation(self, prompt, digest):
+        evaluations = []
+        for question_number in re.findall(r'^Q(\d+):', prompt, re.MULTILINE):
+            score = 4 + (digest + int(question_number)) % 6
+            evaluations.append({
+                'question_number': int(question_number),
+                'score': score,
+                'technical_correctness': max(1, score - 1),
+                'clarity': min(10, score + 1),
+                'relevance': score,
+                'strengths': ['Answer addresses the question directly', 'Uses a concrete example'],
+                'improvements': ['Go deeper into the technical details', 'Quantify the outcome'],
+                'model_answer': 'A strong answer states the context, the options considered, the decision and its measurable result.'
+            })
+
+        return json.dumps({
+            'evaluations': evaluations,
+            'feedback': self._feedback(digest),
+            'performance_level': self.PERFORMANCE_LEVELS[digest % len(self.PERFORMANCE_LEVELS)]
+        })
+
+    def _feedback(self, digest):
+        level = self.PERFORMANCE_LEVELS[digest % len(self.PERFORMANCE_LEVELS)]
+        return (
+            f"Overall performance: {level}\n\n"
+            "Strengths: consistent structure and relevant examples.\n"
+            "Areas to improve: technical depth and quantified results.\n"
+            "Next steps: practice explaining design decisions out loud."
+        )
+
+
+class FakeLLMClient:
+    """OpenAI-client-shaped wrapper around FakeLLM (client.chat.completions.create)"""
+
+    def __init__(self, llm=None):
+        self.llm = llm or FakeLLM()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, stream=False, **kwargs):
+        if stream:
+            return (
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+                for text in self.llm.stream(messages)
+            )
+
+        text = self.llm.complete(messages)
+        prompt_tokens = sum(self.llm.count_tokens(m['content']) for m in messages)
+        completion_tokens = self.llm.count_tokens(text)
+        return SimpleNamespace(
+            id=f"fake-{uuid.uuid4().hex}",
+            model=model,
+            choices=[SimpleNamespace(
+                index=0,
+                message=SimpleNamespace(role='assistant', content=text),
+                finish_reason='stop'
+            )],
+            usage=SimpleNamespace(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens
+            )
+        )
@@ -5,9 +5,36 @@ import os
 from typing import Dict, List
 from openai import OpenAI
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class ProfileAnalyzer:
     """Analyze social coding profiles and generate recommendations"""
     
+    # Stored analyses from an older version are recomputed on read - bump when
+    # scoring, insights, strengths or improvements change
+    VERSION = 1
+    
+    # Score tiers of analyze_github_profile / analyze_leetcode_profile for batch scoring:
+    # (ascending thresholds, points below the first threshold, then at or above each)
+    GITHUB_TIERS = {
+        'public_repos': ((5, 10, 20), (5, 10, 15, 20)),
+        'total_stars': ((20, 50, 100), (5, 15, 20, 25)),
+        'followers': ((10, 20, 50), (0, 5, 10, 15)),
+        'languages': ((2, 3, 5), (0, 10, 15, 20)),
+        'total_forks': ((5, 10, 20), (0, 5, 7, 10)),
+    }
+    GITHUB_ACCOUNT_POINTS = 10
+    LEETCODE_TIERS = {
+        'total': ((50, 100, 200, 300), (10, 20, 30, 35, 40)),
+        'hard_ratio': ((10, 15, 20), (0, 20, 25, 30)),
+        'medium': ((25, 50, 100), (0, 10, 15, 20)),
+    }
+    # Ranking is better when lower: (ascending upper bounds, points at or below each, then above the last)
+    LEETCODE_RANKING_TIERS = ((10000, 50000, 100000), (10, 7, 5, 0))
+    
     def __init__(self):
         self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
     
@@ -257,6 +284,102 @@ class ProfileAnalyzer:
         overall = (github_score * 0.6) + (leetcode_score * 0.4)
         return round(overall)
     
+    # ============================================
+    # BATCH SCORING
+    # ============================================
+    
+    @staticmethod
+    def _require_numpy():
+        if np is None:
+            raise ImportError("numpy is required for batch profile scoring (pip install numpy)")
+    
+    @classmethod
+    def github_columns(cls, profiles: List[Dict]) -> Dict:
+        """
+        Columnar metrics of scraped GitHub profiles for score_github_batch
+        Missing profiles (None) and scrape errors are marked invalid and score 0
+        """
+        cls._require_numpy()
+        profiles = [profile if profile is not None else {'error': 'missing'} for profile in profiles]
+        return {
+            'valid': np.array(['error' not in profile for profile in profiles], dtype=bool),
+            'public_repos': np.array([profile.get('public_repos', 0) for profile in profiles], dtype=np.int64),
+            'total_stars': np.array([profile.get('total_stars', 0) for profile in profiles], dtype=np.int64),
+            'followers': np.array([profile.get('followers', 0) for profile in profiles], dtype=np.int64),
+            'languages': np.array([len(profile.get('top_languages', [])) for profile in profiles], dtype=np.int64),
+            'total_forks': np.array([profile.get('total_forks', 0) for profile in profiles], dtype=np.int64),
+        }
+    
+    @classmethod
+    def leetcode_columns(cls, profiles: List[Dict]) -> Dict:
+        """
+        Columnar metrics of scraped LeetCode profiles for score_leetcode_batch
+        Unranked profiles get ranking 0
+        """
+        cls._require_numpy()
+        profiles = [profile if profile is not None else {'error': 'missing'} for profile in profiles]
+        problems = [profile.get('problems_solved', {}) for profile in profiles]
+        return {
+            'valid': np.array(['error' not in profile for profile in profiles], dtype=bool),
+            'total': np.array([p.get('total', 0) for p in problems], dtype=np.int64),
+            'medium': np.array([p.get('medium', 0) for p in problems], dtype=np.int64),
+            'hard': np.array([p.get('hard', 0) for p in problems], dtype=np.int64),
+            'ranking': np.array([profile.get('ranking') or 0 for profile in profiles], dtype=np.int64),
+        }
+    
+    @staticmethod
+    def _tier_points(values, tiers, right=False):
+        thresholds, points = tiers
+        return np.asarray(points, dtype=np.int64)[np.digitize(values, thresholds, right=right)]
+    
+    @classmethod
+    def score_github_batch(cls, columns: Dict):
+        """
+        GitHub scores of many profiles at once, identical to analyze_github_profile's
+        Returns: int64 array of scores
+        """
+        cls._require_numpy()
+        score = np.full(len(columns['valid']), cls.GITHUB_ACCOUNT_POINTS, dtype=np.int64)
+        for metric, tiers in cls.GITHUB_TIERS.items():
+            score += cls._tier_points(columns[metric], tiers)
+        return np.where(columns['valid'], np.minimum(score, 100), 0)
+    
+    @classmethod
+    def score_leetcode_batch(cls, columns: Dict):
+        """
+        LeetCode scores of many profiles at once, identical to analyze_leetcode_profile's
+        Returns: int64 array of scores
+        """
+        cls._require_numpy()
+        total = columns['total']
+        
+        # Same float operations as the scalar path, so tier boundaries agree exactly
+        hard_ratio = np.divide(
+            columns['hard'], total, out=np.zeros(len(total), dtype=np.float64), where=total > 0
+        ) * 100
+        
+        score = (
+            cls._tier_points(total, cls.LEETCODE_TIERS['total'])
+            + np.where(total > 0, cls._tier_points(hard_ratio, cls.LEETCODE_TIERS['hard_ratio']), 0)
+            + cls._tier_points(columns['medium'], cls.LEETCODE_TIERS['medium'])
+            + np.where(
+                columns['ranking'] != 0,
+                cls._tier_points(columns['ranking'], cls.LEETCODE_RANKING_TIERS, right=True), 0
+            )
+        )
+        return np.where(columns['valid'], np.minimum(score, 100), 0)
+    
+    @classmethod
+    def overall_score_batch(cls, github_scores, leetcode_scores):
+        """
+        Weighted overall scores (GitHub 60%, LeetCode 40%), identical to calculate_overall_score's
+        Returns: int64 array of scores
+        """
+        cls._require_numpy()
+        weights = np.array([0.6, 0.4])
+        overall = np.asarray(github_scores) * weights[0] + np.asarray(leetcode_scores) * weights[1]
+        return np.rint(overall).astype(np.int64)  # Rounds halves to even, like round()
+    
     # ============================================
     # AI RECOMMENDATIONS
     # ============================================
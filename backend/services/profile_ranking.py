@@ -0,0 +1,200 @@
+"""
+Percentile and rank of profile scores, from incrementally maintained score histograms
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from models import db
+from models.profile_links import ProfileLinks, ProfileScoreHistogram
+
+ALL = 'all'
+MAX_SCORE = 100
+
+
+class ScoreDistribution:
+    """One segment's score counts with cumulative totals, so each rank query is constant time"""
+
+    def __init__(self, segment, counts: List[int]):
+        self.segment = segment
+        self.counts = counts
+        self.at_or_below = []
+        running = 0
+        for count in counts:
+            running += count
+            self.at_or_below.append(running)
+        self.total = running
+
+    def rank(self, score) -> Dict:
+        """
+        Standing of a score in this segment
+        Returns: rank (1 = best), total, percentile (share scoring lower, ties count half)
+                 and top_percent ("top X%")
+        """
+        score = min(max(int(score or 0), 0), MAX_SCORE)
+        below = self.at_or_below[score - 1] if score > 0 else 0
+        equal = self.counts[score]
+        above = self.total - below - equal
+
+        return {
+            'segment': self.segment,
+            'score': score,
+            'rank': above + 1,
+            'total': self.total,
+            'percentile': round(100 * (below + equal / 2) / self.total, 1) if self.total else None,
+            'top_percent': round(100 * (above + 1) / self.total, 1) if self.total else None
+        }
+
+
+class ProfileRanking:
+    """
+    Count of analyzed profiles per overall score, for every profile ('all') and per
+    skill segment (primary GitHub language), kept in step with analyses. Scores are
+    integers 0-100, so a segment is at most 101 rows however many profiles there are.
+    ProfileLinks.ranked_score / ranked_segment record what each profile contributes,
+    so a re-analysis moves exactly that count. Profiles analyzed before the
+    histogram existed are counted by rebuild() (refresh_profiles.py runs it).
+    """
+
+    # ============================================
+    # UPDATES (caller commits)
+    # ============================================
+
+    @staticmethod
+    def segment_of(github_data: Optional[Dict]) -> Optional[str]:
+        """'lang:<primary GitHub language>', or None without GitHub data"""
+        github_data = github_data or {}
+        languages = github_data.get('top_languages') or []
+        if 'error' in github_data or not languages or not languages[0].get('language'):
+            return None
+        return f"lang:{languages[0]['language'].lower()}"[:100]
+
+    def record(self, profile_links: ProfileLinks):
+        """Move a profile's histogram entries to its current score and segment"""
+        score = profile_links.overall_score if profile_links.last_analyzed_at else None
+        segment = self.segment_of(profile_links.github_data) if score is not None else None
+        previous_score, previous_segment = profile_links.ranked_score, profile_links.ranked_segment
+        if (score, segment) == (previous_score, previous_segment):
+            return
+
+        if profile_links.id is None:
+            db.session.flush()
+
+        # Compare-and-set, so concurrent analyses of one profile cannot both move its count
+        claimed = ProfileLinks.query.filter(
+            ProfileLinks.id == profile_links.id,
+            ProfileLinks.ranked_score.is_(None) if previous_score is None else ProfileLinks.ranked_score == previous_score,
+            ProfileLinks.ranked_segment.is_(None) if previous_segment is None else ProfileLinks.ranked_segment == previous_segment
+        ).update({'ranked_score': score, 'ranked_segment': segment}, synchronize_session=False)
+        if not claimed:
+            return
+
+        deltas = defaultdict(int)
+        if previous_score is not None:
+            for bucket_segment in self._segments(previous_segment):
+                deltas[(bucket_segment, previous_score)] -= 1
+        if score is not None:
+            for bucket_segment in self._segments(segment):
+                deltas[(bucket_segment, score)] += 1
+        for (bucket_segment, bucket_score), delta in deltas.items():
+            if delta:
+                self._increment(bucket_segment, bucket_score, delta)
+
+        profile_links.ranked_score = score
+        profile_links.ranked_segment = segment
+
+    @staticmethod
+    def _segments(segment):
+        return [ALL, segment] if segment else [ALL]
+
+    @staticmethod
+    def _increment(segment, score, delta):
+        """Add delta to one histogram bucket in SQL, creating it on first use"""
+        query = ProfileScoreHistogram.query.filter_by(segment=segment, score=score)
+        values = {'count': db.func.coalesce(ProfileScoreHistogram.count, 0) + delta}
+        if query.update(values, synchronize_session=False):
+            return
+
+        # Another request may create the same bucket concurrently
+        try:
+            with db.session.begin_nested():
+                db.session.add(ProfileScoreHistogram(segment=segment, score=score, count=delta))
+        except IntegrityError:
+            query.update(values, synchronize_session=False)
+
+    # ============================================
+    # READS
+    # ============================================
+
+    def distributions(self, segments) -> Dict[str, ScoreDistribution]:
+        """Score distributions of the given segments, read in one query"""
+        segments = set(segments)
+        counts = {segment: [0] * (MAX_SCORE + 1) for segment in segments}
+        rows = ProfileScoreHistogram.query.filter(ProfileScoreHistogram.segment.in_(segments)).with_entities(
+            ProfileScoreHistogram.segment, ProfileScoreHistogram.score, ProfileScoreHistogram.count
+        ).all()
+        for segment, score, count in rows:
+            if 0 <= score <= MAX_SCORE:
+                counts[segment][score] = count or 0
+        return {segment: ScoreDistribution(segment, segment_counts) for segment, segment_counts in counts.items()}
+
+    def rankings(self, profile_links: ProfileLinks, segment: Optional[str] = None) -> List[Dict]:
+        """Rank of a profile among all profiles and within its own segment (or the one given)"""
+        segments = [ALL, segment or profile_links.ranked_segment or self.segment_of(profile_links.github_data)]
+        segments = list(dict.fromkeys(s for s in segments if s))
+        distributions = self.distributions(segments)
+        return [distributions[s].rank(profile_links.overall_score) for s in segments]
+
+    def segments(self, min_profiles=1) -> List[Dict]:
+        """Segments with at least min_profiles profiles, largest first"""
+        totals = db.session.query(
+            ProfileScoreHistogram.segment, db.func.sum(ProfileScoreHistogram.count)
+        ).group_by(ProfileScoreHistogram.segment).all()
+        return sorted(
+            ({'segment': segment, 'profiles': int(total or 0)} for segment, total in totals
+             if (total or 0) >= min_profiles),
+            key=lambda entry: -entry['profiles']
+        )
+
+    # ============================================
+    # BACKFILL (maintenance, not request paths)
+    # ============================================
+
+    @staticmethod
+    def has_unranked_profiles():
+        """Whether any analyzed profile is missing from the histograms"""
+        return db.session.query(
+            ProfileLinks.query.filter(
+                ProfileLinks.last_analyzed_at.isnot(None),
+                ProfileLinks.ranked_score.is_(None)
+            ).exists()
+        ).scalar()
+
+    def rebuild(self):
+        """
+        Recount every analyzed profile (profiles analyzed before the histogram
+        existed, or after manual data fixes)
+        Returns: number of profiles counted
+        """
+        counts = defaultdict(int)
+        ranked = []
+        profiles = ProfileLinks.query.with_entities(
+            ProfileLinks.id, ProfileLinks.overall_score, ProfileLinks.github_data, ProfileLinks.last_analyzed_at
+        ).all()
+        for profile_id, overall_score, github_data, last_analyzed_at in profiles:
+            score = overall_score if last_analyzed_at else None
+            segment = self.segment_of(github_data) if score is not None else None
+            if score is not None:
+                for bucket_segment in self._segments(segment):
+                    counts[(bucket_segment, score)] += 1
+            ranked.append({'id': profile_id, 'ranked_score': score, 'ranked_segment': segment})
+
+        ProfileScoreHistogram.query.delete(synchronize_session=False)
+        if ranked:
+            db.session.execute(update(ProfileLinks), ranked)
+        db.session.add_all([
+            ProfileScoreHistogram(segment=segment, score=score, count=count)
+            for (segment, score), count in counts.items()
+        ])
+        db.session.commit()
+        return sum(1 for entry in ranked if entry['ranked_score'] is not None)
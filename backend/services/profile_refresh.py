@@ -0,0 +1,318 @@
+"""
+Profile analysis refresh: shared by /scrape, the background refresh scheduler and recruiter batch lookups
+"""
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict
+from models import db
+from models.profile_links import ProfileLinks
+from services.profile_ranking import ProfileRanking
+
+logger = logging.getLogger(__name__)
+
+ranking = ProfileRanking()
+
+
+def score_profile(profile_links: ProfileLinks, analyzer, github_data: Dict, leetcode_data: Dict):
+    """
+    Run the analyzers and store their outputs and scores under the analyzer's version (caller commits)
+    Returns: (github_analysis, leetcode_analysis, overall_score)
+    """
+    github_analysis = {'score': 0}
+    if profile_links.github_username:
+        github_analysis = analyzer.analyze_github_profile(github_data)
+        profile_links.github_score = github_analysis.get('score', 0)
+
+    leetcode_analysis = {'score': 0}
+    if profile_links.leetcode_username:
+        leetcode_analysis = analyzer.analyze_leetcode_profile(leetcode_data)
+        profile_links.leetcode_score = leetcode_analysis.get('score', 0)
+
+    # Calculate overall score
+    overall_score = analyzer.calculate_overall_score(github_analysis, leetcode_analysis)
+    profile_links.overall_score = overall_score
+
+    profile_links.github_analysis = github_analysis
+    profile_links.leetcode_analysis = leetcode_analysis
+    profile_links.analyzer_version = analyzer.VERSION
+    return github_analysis, leetcode_analysis, overall_score
+
+
+def reanalyze_stored(profile_links: ProfileLinks, analyzer):
+    """
+    Recompute analyzer outputs and scores from the stored scraped data, without
+    scraping or new recommendations (after an analyzer version change; caller commits)
+    """
+    score_profile(profile_links, analyzer, profile_links.github_data or {}, profile_links.leetcode_data or {})
+    ranking.record(profile_links)
+
+
+def apply_profile_analysis(profile_links: ProfileLinks, analyzer, github_data: Dict, leetcode_data: Dict) -> Dict:
+    """
+    Analyze scraped data and store it with its analyses, scores and recommendations on
+    profile_links, updating the score histograms used for percentiles (caller commits)
+    Returns: {'github_analysis', 'leetcode_analysis', 'overall_score', 'recommendations'}
+    """
+    if profile_links.github_username:
+        profile_links.github_data = github_data
+    if profile_links.leetcode_username:
+        profile_links.leetcode_data = leetcode_data
+
+    github_analysis, leetcode_analysis, overall_score = score_profile(
+        profile_links, analyzer, github_data, leetcode_data
+    )
+
+    # Generate AI recommendations
+    recommendations = analyzer.generate_improvement_recommendations(github_data or {}, leetcode_data or {})
+    profile_links.recommendations = recommendations
+
+    profile_links.last_analyzed_at = datetime.utcnow()
+    ranking.record(profile_links)
+
+    return {
+        'github_analysis': github_analysis,
+        'leetcode_analysis': leetcode_analysis,
+        'overall_score': overall_score,
+        'recommendations': recommendations
+    }
+
+
+def rescrape_profile(profile_links: ProfileLinks, scraper, analyzer):
+    """
+    Scrape a profile afresh (bypassing the scrape cache) and store its analysis (caller commits)
+    Scrape errors leave the previous analysis in place
+    Returns: list of scrape errors, empty when the analysis was updated
+    """
+    scraper.invalidate(
+        github_username=profile_links.github_username,
+        leetcode_username=profile_links.leetcode_username
+    )
+    scraped = scraper.scrape_profiles(
+        github_username=profile_links.github_username,
+        leetcode_username=profile_links.leetcode_username
+    )
+
+    errors = [data['error'] for data in scraped.values() if data and data.get('error')]
+    if not errors:
+        apply_profile_analysis(profile_links, analyzer, scraped['github'] or {}, scraped['leetcode'] or {})
+    return errors
+
+
+class ProfileRefreshScheduler:
+    """
+    Re-analyze profiles before their analysis goes stale, so /scrape can answer from the database
+
+    Due profiles (last_analyzed_at older than `ttl`, never-analyzed first) go
+    through a priority queue, oldest analysis first. A profile is only taken
+    when every platform it needs has quota: GitHub keeps `github_reserve` calls
+    of its X-RateLimit window for user-facing requests, on top of a worst-case
+    scrape (every repository page), and waits for the reset below that; LeetCode, which sends no quota headers, is paced at one call per
+    `leetcode_interval` seconds and backs off on 429. Profiles blocked on one
+    platform wait while profiles on the other keep going.
+    """
+
+    def __init__(self, scraper, analyzer, ttl=timedelta(hours=20), batch_size=50,
+                 github_reserve=100, leetcode_interval=2.0, idle_interval=300, retry_delay=3600):
+        self.scraper = scraper
+        self.analyzer = analyzer
+        self.ttl = ttl
+        self.batch_size = batch_size
+        self.github_reserve = github_reserve
+        self.leetcode_interval = leetcode_interval
+        self.idle_interval = idle_interval  # seconds between scans when nothing is due
+        self.retry_delay = retry_delay  # seconds before retrying a profile whose scrape failed
+
+        self.queue = []  # (priority, profile_links_id, needs_github, needs_leetcode)
+        self.queued = set()
+        self.failed_until = {}  # profile_links_id -> epoch seconds
+        self.stats = {'refreshed': 0, 'failed': 0, 'deferred': 0}
+
+    # ============================================
+    # QUEUE
+    # ============================================
+
+    def enqueue_due(self):
+        """Queue profiles whose analysis is older than the TTL; returns how many were added"""
+        cutoff = datetime.utcnow() - self.ttl
+        now = time.time()
+
+        due = ProfileLinks.query.filter(
+            db.or_(ProfileLinks.github_username.isnot(None), ProfileLinks.leetcode_username.isnot(None)),
+            db.or_(ProfileLinks.last_analyzed_at.is_(None), ProfileLinks.last_analyzed_at < cutoff)
+        ).with_entities(
+            ProfileLinks.id, ProfileLinks.github_username, ProfileLinks.leetcode_username,
+            ProfileLinks.last_analyzed_at
+        ).all()
+
+        added = 0
+        for profile_id, github_username, leetcode_username, last_analyzed_at in due:
+            if profile_id in self.queued or self.failed_until.get(profile_id, 0) > now:
+                continue
+            priority = last_analyzed_at.timestamp() if last_analyzed_at else 0.0
+            heapq.heappush(self.queue, (priority, profile_id, bool(github_username), bool(leetcode_username)))
+            self.queued.add(profile_id)
+            added += 1
+        return added
+
+    @property
+    def github_calls_per_profile(self):
+        """Most GitHub requests one scrape can make: the user, then up to max_repo_pages of repositories"""
+        return 1 + self.scraper.max_repo_pages
+
+    def _wait_time(self, needs_github, needs_leetcode):
+        """Seconds until every platform the profile needs has quota"""
+        wait = 0.0
+        if needs_github:
+            wait = max(wait, self.scraper.rate_limits['github'].wait_time(
+                reserve=self.github_reserve + self.github_calls_per_profile
+            ))
+        if needs_leetcode:
+            wait = max(wait, self.scraper.rate_limits['leetcode'].wait_time(min_interval=self.leetcode_interval))
+        return wait
+
+    # ============================================
+    # REFRESH
+    # ============================================
+
+    def run_once(self):
+        """
+        Refresh up to batch_size due profiles that fit in the current quotas
+        Returns: (profiles refreshed, seconds until the next queued profile could run or None)
+        """
+        self.enqueue_due()
+
+        refreshed = 0
+        deferred = []
+        next_wait = None
+        while self.queue and refreshed < self.batch_size:
+            item = heapq.heappop(self.queue)
+            wait = self._wait_time(item[2], item[3])
+            if wait > 0:
+                deferred.append(item)
+                next_wait = wait if next_wait is None else min(next_wait, wait)
+                continue
+
+            self.queued.discard(item[1])
+            if self.refresh(item[1]):
+                refreshed += 1
+
+        self.stats['deferred'] += len(deferred)
+        for item in deferred:
+            heapq.heappush(self.queue, item)
+        if self.queue and next_wait is None:
+            next_wait = 0.0
+
+        return refreshed, next_wait
+
+    def refresh(self, profile_links_id):
+        """
+        Scrape and re-analyze one profile, bypassing the scrape cache
+        Failed scrapes keep the previous analysis and are retried after retry_delay
+        Returns: True if the analysis was updated
+        """
+        try:
+            profile_links = ProfileLinks.query.get(profile_links_id)
+            if not profile_links:
+                return False
+            if profile_links.last_analyzed_at and profile_links.last_analyzed_at >= datetime.utcnow() - self.ttl:
+                return False  # Refreshed by the user since it was queued
+
+            errors = rescrape_profile(profile_links, self.scraper, self.analyzer)
+            if errors:
+                self.failed_until[profile_links_id] = time.time() + self.retry_delay
+                self.stats['failed'] += 1
+                logger.warning(f"Profile refresh {profile_links_id} failed: {'; '.join(errors)}")
+                return False
+
+            db.session.commit()
+
+            self.failed_until.pop(profile_links_id, None)
+            self.stats['refreshed'] += 1
+            return True
+
+        except Exception as e:
+            db.session.rollback()
+            self.failed_until[profile_links_id] = time.time() + self.retry_delay
+            self.stats['failed'] += 1
+            logger.exception(f"Profile refresh {profile_links_id} failed: {e}")
+            return False
+
+    def run_forever(self, stop_event: threading.Event = None):
+        """Refresh due profiles until stop_event is set, sleeping while quotas recover"""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            refreshed, next_wait = self.run_once()
+            if refreshed:
+                logger.info(f"Refreshed {refreshed} profiles ({len(self.queue)} queued)")
+
+            delay = self.idle_interval if next_wait is None else min(max(next_wait, 0.1), self.idle_interval)
+            stop_event.wait(delay)
+
+
+class ProfileAnalysisQueue:
+    """
+    Analyze profiles in the background on behalf of other users (recruiters)
+    Requests for a profile already queued or in flight share its future, so any
+    number of viewers of one candidate cause a single upstream scrape. Failed
+    scrapes are not retried for `retry_delay` seconds.
+    """
+
+    def __init__(self, app, scraper, analyzer, max_workers=4, ttl=timedelta(hours=24), retry_delay=600):
+        self.app = app
+        self.scraper = scraper
+        self.analyzer = analyzer
+        self.ttl = ttl
+        self.retry_delay = retry_delay
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='profile-analysis')
+        self.in_flight = {}  # profile_links_id -> Future
+        self.failed_until = {}  # profile_links_id -> epoch seconds
+        self.lock = threading.Lock()
+        self.stats = {'scheduled': 0, 'coalesced': 0, 'failed': 0}
+
+    def schedule(self, profile_links_id):
+        """
+        Queue a profile for analysis unless it is already queued or recently failed
+        Returns: 'scheduled', 'in_progress' (coalesced with an earlier request) or 'failed'
+        """
+        with self.lock:
+            if profile_links_id in self.in_flight:
+                self.stats['coalesced'] += 1
+                return 'in_progress'
+            if self.failed_until.get(profile_links_id, 0) > time.time():
+                return 'failed'
+
+            future = self.executor.submit(self._analyze, profile_links_id)
+            self.in_flight[profile_links_id] = future
+            self.stats['scheduled'] += 1
+
+        future.add_done_callback(lambda _: self._done(profile_links_id))
+        return 'scheduled'
+
+    def _done(self, profile_links_id):
+        with self.lock:
+            self.in_flight.pop(profile_links_id, None)
+
+    def _analyze(self, profile_links_id):
+        with self.app.app_context():
+            try:
+                profile_links = ProfileLinks.query.get(profile_links_id)
+                if not profile_links:
+                    return
+                if profile_links.last_analyzed_at and profile_links.last_analyzed_at >= datetime.utcnow() - self.ttl:
+                    return  # Analyzed by someone else meanwhile
+
+                errors = rescrape_profile(profile_links, self.scraper, self.analyzer)
+                if errors:
+                    raise Exception('; '.join(errors))
+                db.session.commit()
+
+            except Exception as e:
+                db.session.rollback()
+                with self.lock:
+                    self.failed_until[profile_links_id] = time.time() + self.retry_delay
+                    self.stats['failed'] += 1
+                logger.warning(f"Profile analysis {profile_links_id} failed: {e}")
@@ -3,60 +3,407 @@ Profile scraper service for GitHub, LeetCode, and LinkedIn
 """
 import requests
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.utils import parse_header_links
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 import os
+from requests.adapters import HTTPAdapter
+from services.scrape_cache import MemoryScrapeCache
+from services.single_flight import SingleFlight
+
+class RateLimit:
+    """
+    Upstream quota as last reported by the API
+    GitHub sends X-RateLimit-Remaining / X-RateLimit-Reset on every response;
+    throttled responses (403/429) may carry Retry-After instead
+    """
+    
+    def __init__(self):
+        self.remaining = None  # Calls left in the current window, None until known
+        self.reset_at = 0.0  # Epoch seconds when the window resets
+        self.blocked_until = 0.0  # Epoch seconds, after a throttled response
+        self.last_call = 0.0
+        self.lock = threading.Lock()
+    
+    def update(self, response):
+        """Record the quota headers of a response"""
+        headers = response.headers
+        now = time.time()
+        with self.lock:
+            self.last_call = now
+            if headers.get('X-RateLimit-Remaining') is not None:
+                self.remaining = int(headers['X-RateLimit-Remaining'])
+            if headers.get('X-RateLimit-Reset') is not None:
+                self.reset_at = float(headers['X-RateLimit-Reset'])
+            
+            if response.status_code in (403, 429):
+                try:
+                    self.blocked_until = now + float(headers.get('Retry-After', ''))
+                except ValueError:
+                    if self.remaining == 0:
+                        self.blocked_until = self.reset_at
+                    elif response.status_code == 429:
+                        self.blocked_until = now + 60
+    
+    def wait_time(self, reserve=0, min_interval=0):
+        """
+        Seconds until a call may be made (0 = now)
+        
+        Args:
+            reserve: calls to leave in the window (e.g. for user-facing requests)
+            min_interval: minimum seconds between calls, for APIs without quota headers
+        """
+        now = time.time()
+        with self.lock:
+            wait = max(0.0, self.blocked_until - now, self.last_call + min_interval - now)
+            if self.remaining is not None and self.remaining <= reserve and self.reset_at > now:
+                wait = max(wait, self.reset_at - now)
+        return wait
+    
+    def to_dict(self):
+        return {
+            'remaining': self.remaining,
+            'reset_at': datetime.fromtimestamp(self.reset_at).isoformat() if self.reset_at else None,
+            'blocked_for': round(max(0.0, self.blocked_until - time.time()), 1)
+        }
+
 
 class ProfileScraper:
     """Scrape and analyze social coding profiles"""
     
-    def __init__(self):
+    # platform -> (fetch name, fetch method) for every upstream call it needs
+    FETCHES = {
+        'github': (('github_user', '_fetch_github_user'), ('github_repos', '_fetch_github_repos')),
+        'leetcode': (('leetcode', '_fetch_leetcode'),),
+    }
+    
+    # Repository fields kept for top repositories
+    GITHUB_REPO_FIELDS = ('name', 'description', 'stargazers_count', 'forks_count', 'language', 'html_url')
+    GITHUB_REPOS_PER_PAGE = 100
+    REMOTE_POLL_INTERVAL = 0.2  # seconds between checks for a profile another worker is scraping
+    
+    def __init__(self, max_workers=8, deadline=15, request_timeout=10,
+                 cache=None, cache_duration=timedelta(hours=24), stale_duration=timedelta(days=7),
+                 max_repo_pages=100, repo_page_concurrency=4):
         self.github_token = os.getenv('GITHUB_TOKEN')  # Optional, increases rate limit
-        self.cache = {}
-        self.cache_duration = timedelta(hours=24)
+        
+        # Data younger than cache_duration is served as is; for stale_duration after
+        # that it is still served while a background refresh replaces it
+        self.cache = cache or MemoryScrapeCache()
+        self.cache_duration = cache_duration
+        self.stale_duration = stale_duration
+        self.revalidating = set()
+        self.revalidating_lock = threading.Lock()
+        self.rate_limits = {'github': RateLimit(), 'leetcode': RateLimit()}
+        self.conditional_stats = {'modified': 0, 'not_modified': 0}  # GitHub 200s vs free 304s
+        
+        # Upstream calls fan out over a bounded pool sharing one keep-alive connection pool
+        self.deadline = deadline  # seconds for a whole scrape, however many calls it makes
+        self.request_timeout = request_timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='profile-scrape')
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers + repo_page_concurrency)
+        self.http.mount('https://', adapter)
+        self.http.mount('http://', adapter)
+        
+        # Repository pages 2..n of one user, on their own pool so a repos fetch
+        # running on the main pool never waits on work queued behind it
+        self.max_repo_pages = max_repo_pages
+        self.page_executor = ThreadPoolExecutor(max_workers=repo_page_concurrency, thread_name_prefix='github-pages')
+        
+        # Concurrent scrapes of one (platform, username) share a single upstream fetch,
+        # in this process and, through the cache's lock table, across workers
+        self.flights = SingleFlight(locks=self.cache, lock_ttl=deadline * 2)
+    
+    # ============================================
+    # CONCURRENT FETCHING
+    # ============================================
+    
+    def scrape_profiles(self, github_username: Optional[str] = None,
+                        leetcode_username: Optional[str] = None) -> Dict:
+        """
+        Scrape GitHub and LeetCode concurrently
+        Every upstream call (GitHub user, GitHub repos, LeetCode) runs at once,
+        bounded by one overall deadline, so latency is that of the slowest call.
+        A profile another request is already scraping is not fetched again: this
+        call waits for that scrape and returns its result.
+        Returns: {'github': data or None, 'leetcode': data or None}
+        """
+        usernames = {'github': github_username, 'leetcode': leetcode_username}
+        results = {'github': None, 'leetcode': None}
+        
+        flights = {}
+        for platform, username in usernames.items():
+            if username and self._cache_lookup(f"{platform}_{username}")[1] is None:
+                flights[platform] = self.flights.join(f"{platform}_{username}")
+        
+        leading = [platform for platform, flight in flights.items() if flight.leader]
+        try:
+            # Another flight may have cached the profile between the lookup and taking the lock
+            fetches = {}
+            for platform in leading:
+                cached, _ = self._cache_lookup(f"{platform}_{usernames[platform]}")
+                if cached is not None:
+                    results[platform] = cached
+                else:
+                    fetches.update(self._platform_fetches(platform, usernames[platform]))
+            
+            fetched = self._run_concurrently(fetches)
+            for platform in leading:
+                if results[platform] is None:
+                    results[platform] = self._scrape(platform, usernames[platform], fetched)
+        finally:
+            for platform in leading:
+                self.flights.finish(flights[platform], results[platform])
+        
+        for platform, flight in flights.items():
+            if flight.role == 'remote':
+                try:
+                    results[platform] = self._await_remote(platform, usernames[platform], flight)
+                finally:
+                    self.flights.finish(flight, results[platform])
+            elif flight.role == 'follower':
+                results[platform] = self.flights.wait(flight, timeout=self.deadline) or {
+                    'error': f"No response within the {self.deadline}s scrape deadline",
+                    'username': usernames[platform]
+                }
+        
+        for platform, username in usernames.items():
+            if username and platform not in flights:
+                results[platform] = self._scrape(platform, username)
+        return results
+    
+    def _scrape(self, platform: str, username: str, fetched: Optional[Dict] = None, use_cache: bool = True) -> Dict:
+        if platform == 'github':
+            return self.scrape_github_profile(username, fetched, use_cache=use_cache)
+        return self.scrape_leetcode_profile(username, fetched, use_cache=use_cache)
+    
+    def _await_remote(self, platform: str, username: str, flight) -> Dict:
+        """
+        Wait for another worker's scrape of a profile to land in the shared cache
+        If that worker gives up without caching a result (upstream error, crash),
+        this worker takes the lock and scrapes the profile itself
+        """
+        key = f"{platform}_{username}"
+        give_up_at = time.time() + self.deadline
+        while time.time() < give_up_at:
+            entry = self.cache.get(key)
+            if entry is not None and entry[1] >= flight.started_at:
+                return entry[0]
+            if self.flights.take_over(flight):
+                cached, _ = self._cache_lookup(key)
+                return cached if cached is not None else self._scrape(platform, username, use_cache=False)
+            time.sleep(self.REMOTE_POLL_INTERVAL)
+        
+        return {'error': f"No response within the {self.deadline}s scrape deadline", 'username': username}
+    
+    def _run_concurrently(self, fetches: Dict) -> Dict:
+        """
+        Run {name: (func, arg)} on the pool within the deadline
+        Returns: {name: result or the exception it raised}
+        """
+        if not fetches:
+            return {}
+        
+        futures = {name: self.executor.submit(func, arg) for name, (func, arg) in fetches.items()}
+        done, _ = wait(futures.values(), timeout=self.deadline)
+        
+        results = {}
+        for name, future in futures.items():
+            if future in done:
+                error = future.exception()
+                results[name] = error if error else future.result()
+            else:
+                future.cancel()
+                results[name] = requests.exceptions.Timeout(
+                    f"No response within the {self.deadline}s scrape deadline"
+                )
+        return results
+    
+    def _platform_fetches(self, platform: str, username: str) -> Dict:
+        """{name: (func, arg)} of the upstream calls for one platform"""
+        return {name: (getattr(self, method), username) for name, method in self.FETCHES[platform]}
+    
+    @staticmethod
+    def _result(fetched: Dict, name: str):
+        """Result of a concurrent fetch, re-raising its exception"""
+        value = fetched[name]
+        if isinstance(value, Exception):
+            raise value
+        return value
     
     # ============================================
     # GITHUB API INTEGRATION
     # ============================================
     
-    def scrape_github_profile(self, username: str) -> Dict:
+    def _github_headers(self) -> Dict:
+        headers = {}
+        if self.github_token:
+            headers['Authorization'] = f'token {self.github_token}'
+        return headers
+    
+    def _github_get(self, url: str, compact=None, with_link=False):
+        """
+        Conditional GET against the GitHub API
+        The ETag / Last-Modified of the previous 200 are sent as If-None-Match /
+        If-Modified-Since; a 304 (which GitHub does not count against the rate
+        limit) reuses the payload stored with them
+        
+        Args:
+            compact: function reducing the JSON payload to the fields used, before it is stored
+            with_link: return (payload, Link header) for paginated endpoints
+        """
+        validator_key = f"validators_{url}"
+        stored = self.cache.get(validator_key)
+        stored = stored[0] if stored else None
+        
+        headers = self._github_headers()
+        if stored:
+            if stored.get('etag'):
+                headers['If-None-Match'] = stored['etag']
+            if stored.get('last_modified'):
+                headers['If-Modified-Since'] = stored['last_modified']
+        
+        response = self.http.get(url, headers=headers, timeout=self.request_timeout)
+        self.rate_limits['github'].update(response)
+        
+        if response.status_code == 304 and stored:
+            self.conditional_stats['not_modified'] += 1
+            self.cache.set(validator_key, stored)  # Keep validators of unchanged resources from expiring
+            return (stored['payload'], stored.get('link')) if with_link else stored['payload']
+        
+        response.raise_for_status()
+        payload = response.json()
+        if compact:
+            payload = compact(payload)
+        
+        self.conditional_stats['modified'] += 1
+        link = response.headers.get('Link')
+        if response.headers.get('ETag') or response.headers.get('Last-Modified'):
+            self.cache.set(validator_key, {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'link': link,
+                'payload': payload
+            })
+        return (payload, link) if with_link else payload
+    
+    def _fetch_github_user(self, username: str) -> Dict:
+        """GitHub user profile"""
+        user_url = f'https://api.github.com/users/{username}'
+        return self._github_get(user_url)
+    
+    def _fetch_github_repos(self, username: str) -> Dict:
+        """
+        Aggregate statistics over all of a user's repositories
+        The first page's Link header gives the page count; the remaining pages
+        (up to max_repo_pages) are fetched concurrently, and each page is reduced
+        to a fixed-size summary as it arrives, so memory does not grow with the
+        number of repositories
+        Returns: merged repository summary (see _summarize_repos)
+        """
+        def page_url(page):
+            return (f'https://api.github.com/users/{username}/repos'
+                    f'?per_page={self.GITHUB_REPOS_PER_PAGE}&sort=updated&page={page}')
+        
+        first_page, link = self._github_get(page_url(1), compact=self._summarize_repos, with_link=True)
+        last_page = min(self._last_page(link), self.max_repo_pages)
+        summaries = {1: first_page}
+        
+        if last_page > 1:
+            futures = {
+                self.page_executor.submit(self._github_get, page_url(page), self._summarize_repos): page
+                for page in range(2, last_page + 1)
+            }
+            done, pending = wait(futures, timeout=self.deadline)
+            for future in pending:
+                future.cancel()
+            if pending:
+                raise requests.exceptions.Timeout(
+                    f"{len(pending)} of {last_page} repository pages not fetched within {self.deadline}s"
+                )
+            for future in done:
+                summaries[futures[future]] = future.result()
+        
+        # Merge in page order so ties keep the most recently updated repositories first
+        return self._merge_repo_summaries(summaries[page] for page in sorted(summaries))
+    
+    @staticmethod
+    def _last_page(link: Optional[str]) -> int:
+        """Page number of rel="last" in a GitHub Link header (1 when unpaginated)"""
+        for entry in parse_header_links(link or ''):
+            if entry.get('rel') == 'last':
+                match = re.search(r'[?&]page=(\d+)', entry.get('url', ''))
+                if match:
+                    return int(match.group(1))
+        return 1
+    
+    @classmethod
+    def _summarize_repos(cls, repos: list) -> Dict:
+        """Fixed-size summary of one page of repositories"""
+        languages = {}
+        for repo in repos:
+            if repo.get('language'):
+                languages[repo['language']] = languages.get(repo['language'], 0) + 1
+        
+        top_repos = sorted(repos, key=lambda x: x.get('stargazers_count', 0), reverse=True)[:5]
+        return {
+            'count': len(repos),
+            'stars': sum(repo.get('stargazers_count', 0) for repo in repos),
+            'forks': sum(repo.get('forks_count', 0) for repo in repos),
+            'languages': languages,
+            'top_repos': [
+                {field: repo[field] for field in cls.GITHUB_REPO_FIELDS if field in repo} for repo in top_repos
+            ]
+        }
+    
+    @staticmethod
+    def _merge_repo_summaries(summaries) -> Dict:
+        merged = {'count': 0, 'stars': 0, 'forks': 0, 'languages': {}, 'top_repos': []}
+        for summary in summaries:
+            merged['count'] += summary['count']
+            merged['stars'] += summary['stars']
+            merged['forks'] += summary['forks']
+            for language, count in summary['languages'].items():
+                merged['languages'][language] = merged['languages'].get(language, 0) + count
+            merged['top_repos'] = sorted(
+                merged['top_repos'] + summary['top_repos'],
+                key=lambda x: x.get('stargazers_count', 0), reverse=True
+            )[:5]
+        return merged
+    
+    def scrape_github_profile(self, username: str, fetched: Optional[Dict] = None, use_cache: bool = True) -> Dict:
         """
         Scrape GitHub profile using official API
         Returns comprehensive GitHub statistics
+        
+        Args:
+            fetched: results of scrape_profiles' concurrent fetches; the user and
+                     repos calls are made concurrently here when not given
+            use_cache: False to ignore cached data (background revalidation)
         """
         cache_key = f"github_{username}"
-        if self._is_cached(cache_key):
-            return self.cache[cache_key]['data']
+        if use_cache:
+            cached = self._cached(cache_key, 'github', username)
+            if cached is not None:
+                return cached
         
         try:
-            headers = {}
-            if self.github_token:
-                headers['Authorization'] = f'token {self.github_token}'
+            if fetched is None or 'github_user' not in fetched:
+                fetched = self._run_concurrently(self._platform_fetches('github', username))
             
-            # Get user profile
-            user_url = f'https://api.github.com/users/{username}'
-            user_response = requests.get(user_url, headers=headers, timeout=10)
-            user_response.raise_for_status()
-            user_data = user_response.json()
+            user_data = self._result(fetched, 'github_user')
+            repos_summary = self._result(fetched, 'github_repos')
             
-            # Get repositories
-            repos_url = f'https://api.github.com/users/{username}/repos?per_page=100&sort=updated'
-            repos_response = requests.get(repos_url, headers=headers, timeout=10)
-            repos_response.raise_for_status()
-            repos_data = repos_response.json()
-            
-            # Calculate statistics
-            total_stars = sum(repo.get('stargazers_count', 0) for repo in repos_data)
-            total_forks = sum(repo.get('forks_count', 0) for repo in repos_data)
-            
-            # Get language statistics
-            languages = {}
-            for repo in repos_data:
-                if repo.get('language'):
-                    languages[repo['language']] = languages.get(repo['language'], 0) + 1
+            # Statistics aggregated over every repository page
+            total_stars = repos_summary['stars']
+            total_forks = repos_summary['forks']
             
             # Sort languages by frequency
-            top_languages = sorted(languages.items(), key=lambda x: x[1], reverse=True)[:5]
+            top_languages = sorted(repos_summary['languages'].items(), key=lambda x: x[1], reverse=True)[:5]
             
             # Get contribution data (last year)
             # Note: This requires GraphQL API for detailed contribution graph
@@ -73,6 +420,7 @@ class ProfileScraper:
                 'total_stars': total_stars,
                 'total_forks': total_forks,
                 'top_languages': [{'language': lang, 'count': count} for lang, count in top_languages],
+                'repos_scanned': repos_summary['count'],
                 'created_at': user_data.get('created_at'),
                 'updated_at': user_data.get('updated_at'),
                 'top_repos': [
@@ -84,7 +432,7 @@ class ProfileScraper:
                         'language': repo.get('language'),
                         'url': repo.get('html_url')
                     }
-                    for repo in sorted(repos_data, key=lambda x: x.get('stargazers_count', 0), reverse=True)[:5]
+                    for repo in repos_summary['top_repos']
                 ],
                 'scraped_at': datetime.now().isoformat()
             }
@@ -100,59 +448,72 @@ class ProfileScraper:
     # LEETCODE INTEGRATION (GraphQL)
     # ============================================
     
-    def scrape_leetcode_profile(self, username: str) -> Dict:
+    def _fetch_leetcode(self, username: str) -> Dict:
+        """LeetCode GraphQL user profile and submission stats"""
+        # LeetCode GraphQL endpoint
+        url = 'https://leetcode.com/graphql'
+        
+        # GraphQL query for user stats
+        query = """
+        query getUserProfile($username: String!) {
+            matchedUser(username: $username) {
+                username
+                profile {
+                    realName
+                    aboutMe
+                    userAvatar
+                    reputation
+                    ranking
+                }
+                submitStats {
+                    acSubmissionNum {
+                        difficulty
+                        count
+                    }
+                }
+                badges {
+                    id
+                    displayName
+                    icon
+                }
+            }
+        }
+        """
+        
+        payload = {
+            'query': query,
+            'variables': {'username': username}
+        }
+        
+        headers = {
+            'Content-Type': 'application/json',
+            'Referer': f'https://leetcode.com/{username}/'
+        }
+        
+        response = self.http.post(url, json=payload, headers=headers, timeout=self.request_timeout)
+        self.rate_limits['leetcode'].update(response)
+        response.raise_for_status()
+        return response.json()
+    
+    def scrape_leetcode_profile(self, username: str, fetched: Optional[Dict] = None, use_cache: bool = True) -> Dict:
         """
         Scrape LeetCode profile using GraphQL API
         Returns problem-solving statistics
+        
+        Args:
+            fetched: results of scrape_profiles' concurrent fetches
+            use_cache: False to ignore cached data (background revalidation)
         """
         cache_key = f"leetcode_{username}"
-        if self._is_cached(cache_key):
-            return self.cache[cache_key]['data']
+        if use_cache:
+            cached = self._cached(cache_key, 'leetcode', username)
+            if cached is not None:
+                return cached
         
         try:
-            # LeetCode GraphQL endpoint
-            url = 'https://leetcode.com/graphql'
-            
-            # GraphQL query for user stats
-            query = """
-            query getUserProfile($username: String!) {
-                matchedUser(username: $username) {
-                    username
-                    profile {
-                        realName
-                        aboutMe
-                        userAvatar
-                        reputation
-                        ranking
-                    }
-                    submitStats {
-                        acSubmissionNum {
-                            difficulty
-                            count
-                        }
-                    }
-                    badges {
-                        id
-                        displayName
-                        icon
-                    }
-                }
-            }
-            """
-            
-            payload = {
-                'query': query,
-                'variables': {'username': username}
-            }
-            
-            headers = {
-                'Content-Type': 'application/json',
-                'Referer': f'https://leetcode.com/{username}/'
-            }
-            
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            if fetched is None or 'leetcode' not in fetched:
+                fetched = self._run_concurrently(self._platform_fetches('leetcode', username))
+            data = self._result(fetched, 'leetcode')
             
             if 'errors' in data or not data.get('data', {}).get('matchedUser'):
                 return {'error': 'User not found', 'username': username}
@@ -266,25 +627,73 @@ class ProfileScraper:
     # CACHE MANAGEMENT
     # ============================================
     
-    def _is_cached(self, key: str) -> bool:
-        """Check if data is in cache and not expired"""
-        if key not in self.cache:
-            return False
-        
-        cached_time = self.cache[key]['timestamp']
-        if datetime.now() - cached_time > self.cache_duration:
-            del self.cache[key]
-            return False
+    def _cache_lookup(self, key: str):
+        """
+        Returns: (data, 'fresh' | 'stale'), or (None, None) when missing or too old to serve
+        """
+        entry = self.cache.get(key)
+        if entry is None:
+            return None, None
         
-        return True
+        data, stored_at = entry
+        age = time.time() - stored_at
+        if age <= self.cache_duration.total_seconds():
+            return data, 'fresh'
+        if age <= (self.cache_duration + self.stale_duration).total_seconds():
+            return data, 'stale'
+        return None, None
+    
+    def _cached(self, key: str, platform: str, username: str):
+        """Cached data to serve, refreshing stale data in the background (stale-while-revalidate)"""
+        data, state = self._cache_lookup(key)
+        if state == 'stale':
+            self._revalidate_in_background(platform, username)
+        return data
+    
+    def _revalidate_in_background(self, platform: str, username: str):
+        """Re-scrape one profile on the pool, at most once at a time per profile"""
+        key = f"{platform}_{username}"
+        with self.revalidating_lock:
+            if key in self.revalidating:
+                return
+            self.revalidating.add(key)
+        self.executor.submit(self._revalidate, platform, username)
+    
+    def _revalidate(self, platform: str, username: str):
+        flight = None
+        try:
+            # Skip profiles another request or worker is already scraping
+            flight = self.flights.try_lead(f"{platform}_{username}")
+            if flight is None:
+                return
+            
+            # Already on the pool: fetch in this thread rather than queueing more work behind it
+            fetched = {}
+            for name, (func, arg) in self._platform_fetches(platform, username).items():
+                try:
+                    fetched[name] = func(arg)
+                except Exception as e:
+                    fetched[name] = e
+            
+            # Errors are not cached, so a failed refresh keeps serving the stale data
+            flight.result = self._scrape(platform, username, fetched, use_cache=False)
+        finally:
+            if flight is not None:
+                self.flights.finish(flight, flight.result)
+            with self.revalidating_lock:
+                self.revalidating.discard(f"{platform}_{username}")
     
     def _cache_data(self, key: str, data: Dict):
         """Cache data with timestamp"""
-        self.cache[key] = {
-            'data': data,
-            'timestamp': datetime.now()
-        }
+        self.cache.set(key, data)
+    
+    def invalidate(self, github_username: Optional[str] = None, leetcode_username: Optional[str] = None):
+        """Drop cached data for these profiles only"""
+        if github_username:
+            self.cache.delete(f"github_{github_username}")
+        if leetcode_username:
+            self.cache.delete(f"leetcode_{leetcode_username}")
     
     def clear_cache(self):
         """Clear all cached data"""
-        self.cache = {}
+        self.cache.clear()
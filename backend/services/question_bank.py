@@ -0,0 +1,117 @@
+"""
+Shared interview question bank
+"""
+import hashlib
+from sqlalchemy.exc import IntegrityError
+from models import db
+from models.interview import InterviewSession, InterviewQA, QuestionBankEntry
+from prompts.interview_prompts import InterviewPrompts
+
+
+class QuestionAlreadyAsked(Exception):
+    """A generated question matches a banked one the user has already been asked"""
+
+
+class QuestionBank:
+    """
+    Serve previously generated questions to candidates with the same prompt signature
+    The LLM is only needed when a user has already seen every question in the pool
+    """
+
+    def __init__(self, max_pool_size=200):
+        self.max_pool_size = max_pool_size
+        self.prompts = InterviewPrompts()
+
+    def signature(self, job_role, skills, experience_level, interview_type):
+        """Prompt signature shared by equivalent candidate shapes"""
+        return self.prompts.question_signature(job_role, skills, experience_level, interview_type)
+
+    @staticmethod
+    def _question_hash(question):
+        """Hash of the normalized question text (case and whitespace insensitive)"""
+        normalized = ' '.join(question.lower().split())
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _seen(user_id):
+        """Query of bank entry ids the user has been asked"""
+        return db.session.query(InterviewQA.bank_question_id).join(
+            InterviewSession, InterviewSession.id == InterviewQA.session_id
+        ).filter(
+            InterviewSession.user_id == user_id,
+            InterviewQA.bank_question_id.isnot(None)
+        )
+
+    def _unseen(self, user_id, signature):
+        """Query of bank entries for a signature the user has not been asked yet"""
+        return QuestionBankEntry.query.filter(
+            QuestionBankEntry.signature == signature,
+            QuestionBankEntry.id.notin_(self._seen(user_id))
+        )
+
+    def has_unseen(self, user_id, signature):
+        """Whether pick() would return a banked question"""
+        return db.session.query(self._unseen(user_id, signature).exists()).scalar()
+
+    def pick(self, user_id, signature):
+        """
+        Least-served question for this signature the user has not been asked yet
+        Returns: QuestionBankEntry or None when the pool needs topping up
+        """
+        entry = self._unseen(user_id, signature).order_by(
+            QuestionBankEntry.times_served, db.func.random()
+        ).first()
+
+        if entry:
+            self._served(entry)
+
+        return entry
+
+    @staticmethod
+    def _served(entry):
+        """Count one more serving of a banked question"""
+        QuestionBankEntry.query.filter_by(id=entry.id).update(
+            {'times_served': QuestionBankEntry.times_served + 1}, synchronize_session=False
+        )
+
+    def add(self, signature, question, job_role, interview_type, difficulty_level, user_id):
+        """
+        Store a freshly generated question for user_id (caller commits)
+        The LLM may repeat a banked question; that entry is served instead, unless
+        the user has already been asked it (QuestionAlreadyAsked, nothing is counted)
+        Returns: QuestionBankEntry, or None when the pool is full
+        """
+        question_hash = self._question_hash(question)
+
+        existing = QuestionBankEntry.query.filter_by(signature=signature, question_hash=question_hash).first()
+        if existing:
+            asked = db.session.query(self._seen(user_id).filter(
+                InterviewQA.bank_question_id == existing.id
+            ).exists()).scalar()
+            if asked:
+                raise QuestionAlreadyAsked(question)
+            self._served(existing)
+            return existing
+
+        pool_size = QuestionBankEntry.query.filter_by(signature=signature).count()
+        if pool_size >= self.max_pool_size:
+            return None
+
+        entry = QuestionBankEntry(
+            signature=signature,
+            question=question,
+            question_hash=question_hash,
+            job_role=job_role,
+            interview_type=interview_type,
+            difficulty_level=difficulty_level,
+            times_served=1
+        )
+
+        # Another worker may have stored the same question concurrently
+        try:
+            with db.session.begin_nested():
+                db.session.add(entry)
+        except IntegrityError:
+            return QuestionBankEntry.query.filter_by(signature=signature, question_hash=question_hash).first()
+
+        return entry
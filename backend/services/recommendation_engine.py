@@ -13,8 +13,11 @@ try:
 except ImportError:
     HAS_SKLEARN = False
 from datetime import datetime, timedelta
+from models import db
 from models.job import Job
 from models.resume import Resume, Skill
+from models.user import User
+from models.application import Application
 
 
 class RecommendationEngine:
@@ -254,3 +257,113 @@ class RecommendationEngine:
         
         # Return top N recommendations
         return recommendations[:limit]
+    
+    # ============================================
+    # APPLICANT MATCH SCORES
+    # ============================================
+    
+    def calculate_candidate_score(self, user_skills, user_experience, user_location, job):
+        """
+        Calculate how well a candidate fits a job
+        Uses the recommendation components except job freshness, which is the same
+        for every applicant of a job; the remaining weights are renormalized
+        Returns: score (0-1)
+        """
+        skill_score = self.calculate_skill_match(user_skills, job.required_skills or [])
+        exp_score = self.calculate_experience_match(user_experience, job.experience_min, job.experience_max)
+        location_score = self.calculate_location_match(user_location, job.location)
+        
+        candidate_weight = self.skill_weight + self.experience_weight + self.location_weight
+        
+        return (
+            skill_score * self.skill_weight +
+            exp_score * self.experience_weight +
+            location_score * self.location_weight
+        ) / candidate_weight
+    
+    def get_applicant_profiles(self, applications):
+        """
+        Load skills, experience and location for many applicants with three queries
+        Uses the resume attached to each application, falling back to the active resume
+        Returns: dict application_id -> (skills, experience_months, location), None if no resume
+        """
+        if not applications:
+            return {}
+        
+        user_ids = {app.user_id for app in applications}
+        attached_ids = {app.resume_id for app in applications if app.resume_id}
+        
+        resumes = Resume.query.filter(db.or_(
+            Resume.id.in_(attached_ids),
+            db.and_(Resume.user_id.in_(user_ids), Resume.is_active == True)
+        )).all()
+        resumes_by_id = {resume.id: resume for resume in resumes}
+        active_by_user = {resume.user_id: resume for resume in resumes if resume.is_active}
+        
+        skills_by_resume = {}
+        for resume_id, skill_name in db.session.query(Skill.resume_id, Skill.skill_name).filter(
+            Skill.resume_id.in_(resumes_by_id.keys())
+        ):
+            skills_by_resume.setdefault(resume_id, []).append(skill_name)
+        
+        locations = dict(db.session.query(User.id, User.location).filter(User.id.in_(user_ids)))
+        
+        profiles = {}
+        for app in applications:
+            resume = resumes_by_id.get(app.resume_id)
+            if not resume or resume.user_id != app.user_id:
+                resume = active_by_user.get(app.user_id)
+            
+            if not resume:
+                profiles[app.id] = None
+                continue
+            
+            profiles[app.id] = (
+                skills_by_resume.get(resume.id, []),
+                resume.total_experience_months or 0,
+                locations.get(app.user_id)
+            )
+        
+        return profiles
+    
+    def score_applications(self, job, applications):
+        """
+        Compute match scores for applications to one job
+        Returns: dict application_id -> percentage (0-100), None for applicants without a resume
+        """
+        profiles = self.get_applicant_profiles(applications)
+        
+        scores = {}
+        for app in applications:
+            profile = profiles.get(app.id)
+            if profile is None:
+                scores[app.id] = None
+                continue
+            
+            skills, experience, location = profile
+            scores[app.id] = round(self.calculate_candidate_score(skills, experience, location, job) * 100, 2)
+        
+        return scores
+    
+    def refresh_job_match_scores(self, job_id):
+        """
+        Recompute and store match scores for every application to a job
+        Writes all scores with a single bulk UPDATE
+        Returns: number of applications rescored
+        """
+        job = Job.query.get(job_id)
+        if not job:
+            return 0
+        
+        applications = Application.query.filter_by(job_id=job_id).all()
+        if not applications:
+            return 0
+        
+        scores = self.score_applications(job, applications)
+        db.session.execute(
+            db.update(Application),
+            [{'id': app_id, 'match_score': score} for app_id, score in scores.items()]
+        )
+        db.session.commit()
+        
+        return len(scores)
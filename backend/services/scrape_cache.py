@@ -0,0 +1,234 @@
+"""
+Cache backends for scraped profile data
+
+Every backend stores JSON-serializable values with the time they were stored and
+exposes get / set / delete / clear, so ProfileScraper can decide freshness itself
+(fresh, stale-while-revalidate, expired) whatever the storage.
+
+Backends also keep a lock table (acquire_lock / release_lock) with the same reach
+as the cache, so only one worker scrapes a profile at a time while the others
+wait for the result it caches.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+SCRAPE_CACHE_BACKENDS = ('memory', 'sqlite', 'redis')
+
+
+def create_scrape_cache(backend=None, max_age=None, path=None):
+    """
+    Build the cache selected by SCRAPE_CACHE_BACKEND
+
+    Backends:
+        memory - per-process LRU bounded by SCRAPE_CACHE_MAX_ENTRIES
+        sqlite - file at path (default SCRAPE_CACHE_PATH) shared by every worker on the host
+        redis  - SCRAPE_CACHE_URL (or REDIS_URL), shared by every host; requires the redis package
+    Entries older than max_age seconds may be dropped by the backend.
+    """
+    backend = (backend or os.getenv('SCRAPE_CACHE_BACKEND', 'sqlite')).lower()
+    max_entries = int(os.getenv('SCRAPE_CACHE_MAX_ENTRIES', 10000))
+
+    if backend == 'memory':
+        return MemoryScrapeCache(max_entries=max_entries)
+
+    if backend == 'sqlite':
+        path = path or os.getenv('SCRAPE_CACHE_PATH')
+        if not path:
+            raise ValueError("A path or SCRAPE_CACHE_PATH is required for the sqlite scrape cache")
+        return SQLiteScrapeCache(path, max_entries=max_entries, max_age=max_age)
+
+    if backend == 'redis':
+        url = os.getenv('SCRAPE_CACHE_URL') or os.getenv('REDIS_URL')
+        if not url:
+            raise ValueError("SCRAPE_CACHE_URL or REDIS_URL is required for the redis scrape cache")
+        return RedisScrapeCache(url, max_age=max_age)
+
+    raise ValueError(
+        f"Unknown SCRAPE_CACHE_BACKEND '{backend}' (expected one of: {', '.join(SCRAPE_CACHE_BACKENDS)})"
+    )
+
+
+class MemoryScrapeCache:
+    """Thread-safe in-process LRU cache"""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (value, stored_at), least recently used first
+        self.locks = {}  # key -> (token, expires_at)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Returns: (value, stored_at epoch seconds) or None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (value, time.time())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def acquire_lock(self, key, token, ttl):
+        """Take the lock on key for ttl seconds unless someone else holds it; True if taken"""
+        now = time.time()
+        with self.lock:
+            held = self.locks.get(key)
+            if held and held[1] > now:
+                return False
+            self.locks[key] = (token, now + ttl)
+            return True
+
+    def release_lock(self, key, token):
+        with self.lock:
+            if self.locks.get(key, (None,))[0] == token:
+                del self.locks[key]
+
+
+class SQLiteScrapeCache:
+    """
+    Cache in a local SQLite file (WAL mode), shared by all gunicorn workers on one host
+    Rows beyond max_entries (least recently stored) and older than max_age are pruned on write
+    """
+
+    PRUNE_EVERY = 100  # writes
+
+    def __init__(self, path, max_entries=10000, max_age=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.local = threading.local()
+        self.writes = 0
+
+        with self._connection() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS scrape_cache ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS idx_scrape_cache_stored_at ON scrape_cache(stored_at)')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS scrape_locks ('
+                'key TEXT PRIMARY KEY, token TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+
+    def _connection(self):
+        """One connection per thread (sqlite3 connections are not shareable across threads)"""
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            self.local.connection = connection
+        return connection
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT value, stored_at FROM scrape_cache WHERE key = ?', (key,)
+        ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def set(self, key, value):
+        with self._connection() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO scrape_cache (key, value, stored_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value), time.time())
+            )
+
+        self.writes += 1
+        if self.writes % self.PRUNE_EVERY == 0:
+            self._prune()
+
+    def _prune(self):
+        with self._connection() as connection:
+            if self.max_age:
+                connection.execute('DELETE FROM scrape_cache WHERE stored_at < ?', (time.time() - self.max_age,))
+            connection.execute(
+                'DELETE FROM scrape_cache WHERE key IN ('
+                'SELECT key FROM scrape_cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+
+    def delete(self, key):
+        with self._connection() as connection:
+            connection.execute('DELETE FROM scrape_cache WHERE key = ?', (key,))
+
+    def clear(self):
+        with self._connection() as connection:
+            connection.execute('DELETE FROM scrape_cache')
+
+    def acquire_lock(self, key, token, ttl):
+        now = time.time()
+        with self._connection() as connection:
+            # Locks left by a crashed worker expire; the primary key makes the insert the atomic test
+            connection.execute('DELETE FROM scrape_locks WHERE key = ? AND expires_at < ?', (key, now))
+            inserted = connection.execute(
+                'INSERT OR IGNORE INTO scrape_locks (key, token, expires_at) VALUES (?, ?, ?)',
+                (key, token, now + ttl)
+            ).rowcount
+        return inserted == 1
+
+    def release_lock(self, key, token):
+        with self._connection() as connection:
+            connection.execute('DELETE FROM scrape_locks WHERE key = ? AND token = ?', (key, token))
+
+
+class RedisScrapeCache:
+    """Cache in Redis, shared across hosts; keys expire after max_age"""
+
+    PREFIX = 'scrape:'
+    LOCK_PREFIX = 'scrape-lock:'
+
+    # Delete the lock only if it still holds our token (it may have expired and been retaken)
+    RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+    def __init__(self, url, max_age=None):
+        if redis is None:
+            raise ImportError("The redis package is required for SCRAPE_CACHE_BACKEND=redis (pip install redis)")
+        self.client = redis.Redis.from_url(url)
+        self.max_age = int(max_age) if max_age else None
+
+    def get(self, key):
+        raw = self.client.get(self.PREFIX + key)
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        return entry['value'], entry['stored_at']
+
+    def set(self, key, value):
+        self.client.set(
+            self.PREFIX + key,
+            json.dumps({'value': value, 'stored_at': time.time()}),
+            ex=self.max_age
+        )
+
+    def delete(self, key):
+        self.client.delete(self.PREFIX + key)
+
+    def clear(self):
+        for key in self.client.scan_iter(f'{self.PREFIX}*'):
+            self.client.delete(key)
+
+    def acquire_lock(self, key, token, ttl):
+        return bool(self.client.set(self.LOCK_PREFIX + key, token, nx=True, px=int(ttl * 1000)))
+
+    def release_lock(self, key, token):
+        self.client.eval(self.RELEASE_SCRIPT, 1, self.LOCK_PREFIX + key, token)
@@ -0,0 +1,122 @@
+"""
+Single-flight coalescing of concurrent work on the same key
+"""
+import threading
+import time
+import uuid
+
+
+class Flight:
+    """One unit of in-flight work and the callers sharing it"""
+
+    def __init__(self, key):
+        self.key = key
+        self.role = None  # 'leader', 'follower' or 'remote'
+        self.token = None  # Cross-worker lock token held by the leader
+        self.shared = None  # A follower's leader flight
+        self.started_at = time.time()
+        self.result = None
+        self.done = threading.Event()
+
+    @property
+    def leader(self):
+        return self.role == 'leader'
+
+
+class SingleFlight:
+    """
+    Let one caller per key do the work while concurrent callers wait for its result
+
+    Within a process the first caller of a key leads and later callers follow,
+    waiting on its result. Across processes the leader also holds a lock in
+    `locks` (any object with acquire_lock / release_lock, such as a scrape cache
+    backend); a process that finds the lock held gets a 'remote' flight, waits
+    for the other worker to publish its result in shared storage, and hands it
+    on to its own followers through finish().
+    """
+
+    def __init__(self, locks=None, lock_ttl=30):
+        self.locks = locks
+        self.lock_ttl = lock_ttl  # seconds before a lock left by a dead worker expires
+        self.flights = {}
+        self.lock = threading.Lock()
+        self.stats = {'led': 0, 'followed': 0, 'remote': 0}
+
+    def join(self, key):
+        """
+        Flight for key; its role says what the caller must do:
+            leader   - do the work, then finish()
+            follower - wait() for the leader in this process
+            remote   - another worker leads: wait for its result (or take_over()), then finish()
+        """
+        with self.lock:
+            flight = self.flights.get(key)
+            if flight is not None:
+                self.stats['followed'] += 1
+                follower = Flight(key)
+                follower.role = 'follower'
+                follower.shared = flight
+                return follower
+
+            flight = Flight(key)
+            self.flights[key] = flight
+
+        if self.take_over(flight):
+            self.stats['led'] += 1
+        else:
+            flight.role = 'remote'
+            self.stats['remote'] += 1
+        return flight
+
+    def try_lead(self, key):
+        """
+        Leader flight for key, or None if this process or another worker is already
+        on it; unlike join(), nothing is registered unless the caller leads, so no
+        follower ever waits on work that will not be done
+        """
+        with self.lock:
+            if key in self.flights:
+                return None
+
+        flight = Flight(key)
+        if not self.take_over(flight):
+            return None
+
+        with self.lock:
+            if key not in self.flights:
+                self.flights[key] = flight
+                self.stats['led'] += 1
+                return flight
+
+        # A caller joined meanwhile (and waits for this lock when there is one); let it lead
+        if self.locks is not None:
+            self.locks.release_lock(key, flight.token)
+        return None
+
+    def take_over(self, flight):
+        """Try to acquire the cross-worker lock for a flight; True if it now leads"""
+        token = uuid.uuid4().hex
+        if self.locks is not None and not self.locks.acquire_lock(flight.key, token, self.lock_ttl):
+            return False
+        flight.role = 'leader'
+        flight.token = token
+        return True
+
+    def finish(self, flight, result):
+        """Publish the result of a leader or remote flight to its followers and release its lock"""
+        flight.result = result
+        with self.lock:
+            if self.flights.get(flight.key) is flight:
+                del self.flights[flight.key]
+        flight.done.set()
+
+        if flight.leader and self.locks is not None:
+            self.locks.release_lock(flight.key, flight.token)
+
+    @staticmethod
+    def wait(flight, timeout=None):
+        """Result shared by a follower's leader, or None if it did not finish within timeout"""
+        shared = flight.shared
+        if not shared.done.wait(timeout):
+            return None
+        return shared.result
@@ -0,0 +1,98 @@
+"""
+Daily LLM token budgets for mock interviews
+"""
+import threading
+import time
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from models import db
+from models.interview import InterviewTokenUsage
+
+
+class TokenBudgetExceeded(Exception):
+    """A user or the whole service has used up its daily LLM token budget"""
+
+
+class TokenBudget:
+    """
+    Enforce per-user and global daily token limits (0 disables a limit)
+    Spend is counted per user and UTC day as tokens are recorded, so a session
+    running past midnight charges the day it used them; the global total is
+    cached for `cache_ttl` seconds
+    """
+
+    def __init__(self, user_daily_limit=0, global_daily_limit=0, cache_ttl=30):
+        self.user_daily_limit = user_daily_limit
+        self.global_daily_limit = global_daily_limit
+        self.cache_ttl = cache_ttl
+        self.global_spend = None  # (day, tokens, fetched_at)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _today():
+        return datetime.utcnow().date()
+
+    @classmethod
+    def record(cls, user_id, prompt_tokens, completion_tokens):
+        """Add tokens to the user's count for today in SQL (caller commits)"""
+        day = cls._today()
+        query = InterviewTokenUsage.query.filter_by(user_id=user_id, day=day)
+        values = {
+            'prompt_tokens': db.func.coalesce(InterviewTokenUsage.prompt_tokens, 0) + prompt_tokens,
+            'completion_tokens': db.func.coalesce(InterviewTokenUsage.completion_tokens, 0) + completion_tokens
+        }
+        if query.update(values, synchronize_session=False):
+            return
+
+        # Another request may create the same row concurrently
+        try:
+            with db.session.begin_nested():
+                db.session.add(InterviewTokenUsage(
+                    user_id=user_id, day=day, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+                ))
+        except IntegrityError:
+            query.update(values, synchronize_session=False)
+
+    @staticmethod
+    def spent_on(day, user_id=None):
+        """Prompt + completion tokens recorded on a UTC day (optionally for one user)"""
+        query = db.session.query(db.func.coalesce(db.func.sum(
+            db.func.coalesce(InterviewTokenUsage.prompt_tokens, 0)
+            + db.func.coalesce(InterviewTokenUsage.completion_tokens, 0)
+        ), 0)).filter(InterviewTokenUsage.day == day)
+
+        if user_id is not None:
+            query = query.filter(InterviewTokenUsage.user_id == user_id)
+
+        return int(query.scalar())
+
+    def global_spent_today(self):
+        day = self._today()
+        now = time.monotonic()
+
+        with self.lock:
+            cached = self.global_spend
+            if cached and cached[0] == day and now - cached[2] < self.cache_ttl:
+                return cached[1]
+
+        tokens = self.spent_on(day)
+        with self.lock:
+            self.global_spend = (day, tokens, now)
+        return tokens
+
+    def check(self, user_id):
+        """Raise TokenBudgetExceeded if the user or the service is over today's budget"""
+        if self.user_daily_limit and self.spent_on(self._today(), user_id) >= self.user_daily_limit:
+            raise TokenBudgetExceeded('Daily interview limit reached, please try again tomorrow')
+
+        if self.global_daily_limit and self.global_spent_today() >= self.global_daily_limit:
+            raise TokenBudgetExceeded('Mock interviews are temporarily unavailable, please try again later')
+
+    def usage(self, user_id):
+        """Today's spend and limits for a user"""
+        spent = self.spent_on(self._today(), user_id)
+        return {
+            'tokens_used_today': spent,
+            'daily_limit': self.user_daily_limit or None,
+            'tokens_remaining': max(0, self.user_daily_limit - spent) if self.user_daily_limit else None
+        }
@@ -0,0 +1,62 @@
+"""
+Shared fixtures: a fresh app and database per test, and helpers to create users
+"""
+import pytest
+from app import create_app
+from models import db
+
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def register(client):
+    """Register a user; returns (auth headers, user id)"""
+    def register_user(email, role='job_seeker'):
+        response = client.post('/api/auth/register', json={
+            'email': email, 'password': 'Password123', 'role': role, 'full_name': email
+        })
+        assert response.status_code == 201, response.get_json()
+        body = response.get_json()
+        return {'Authorization': f"Bearer {body['access_token']}"}, body['user']['id']
+    return register_user
+
+
+@pytest.fixture
+def interview_env(monkeypatch):
+    """Interview routes backed by the deterministic fake LLM, with fresh per-test singletons"""
+    import routes.interview
+    import services.llm_client
+
+    monkeypatch.setenv('LLM_PROVIDER', 'fake')
+    monkeypatch.setattr(services.llm_client, 'shared_client', None)
+    for name in ('ai_service', 'pipeline', 'question_bank', 'token_budget', 'evaluation_cache'):
+        monkeypatch.setattr(routes.interview, name, None)
+    return routes.interview
+
+
+@pytest.fixture
+def job_seeker(register):
+    """Register a job seeker with an active resume; returns (auth headers, user id)"""
+    from models.resume import Resume, Skill
+
+    def create(email='seeker@example.com', skills=('Python', 'SQL')):
+        headers, user_id = register(email)
+        resume = Resume(user_id=user_id, file_name='resume.pdf', total_experience_months=24, is_active=True)
+        db.session.add(resume)
+        db.session.flush()
+        db.session.add_all([Skill(resume_id=resume.id, skill_name=skill) for skill in skills])
+        db.session.commit()
+        return headers, user_id
+    return create
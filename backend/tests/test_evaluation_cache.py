@@ -0,0 +1,27 @@
+"""
+Answer fingerprinting of the evaluation cache
+"""
+import pytest
+from services.evaluation_cache import EvaluationCache
+
+QUESTION = EvaluationCache.question_key('What is an index?', 'Backend Engineer', 'Technical')
+
+
+@pytest.mark.parametrize('cached, other', [
+    ('Индекс ускоряет поиск строк по значению столбца', 'Я бы сначала посмотрел план выполнения запроса'),
+    ('索引可以加快按列值查找行的速度', '我会先查看查询的执行计划再决定'),
+])
+def test_different_non_latin_answers_do_not_share_an_entry(cached, other):
+    cache = EvaluationCache()
+    cache.put(QUESTION, cached, {'score': 9})
+
+    assert cache.get(QUESTION, other) == (None, None)
+    assert cache.get(QUESTION, cached.upper()) == ({'score': 9}, 'exact')
+
+
+def test_short_answers_are_not_cached():
+    cache = EvaluationCache()
+    cache.put(QUESTION, '?!', {'score': 1})
+
+    assert cache.get(QUESTION, '...') == (None, None)
+    assert cache.stats()['entries'] == 0
@@ -0,0 +1,86 @@
+"""
+Mock interview flows against the fake LLM
+"""
+import json
+from models import db
+from models.interview import InterviewSession, InterviewQA, QuestionBankEntry
+from services.llm_providers import FakeLLM
+
+
+def sse_events(response):
+    """(event, data) pairs of a Server-Sent Events response"""
+    events = []
+    for block in response.get_data(as_text=True).split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.splitlines() if ': ' in line)
+        if 'event' in lines:
+            events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+def test_stream_start_keeps_session_once_question_is_stored(client, interview_env, job_seeker, monkeypatch):
+    headers, _ = job_seeker()
+
+    def failing_prefetch(*args, **kwargs):
+        raise RuntimeError('prefetch failed')
+    monkeypatch.setattr(interview_env, 'prefetch_next_question', failing_prefetch)
+
+    response = client.post('/api/interview/start/stream', headers=headers, json={
+        'job_role': 'Backend Engineer', 'interview_type': 'Technical'
+    })
+    events = sse_events(response)
+
+    session_id = events[0][1]['session_id']
+    assert events[-1][0] == 'error'
+    db.session.expire_all()
+    assert InterviewSession.query.get(session_id) is not None
+    assert InterviewQA.query.filter_by(session_id=session_id).count() == 1
+
+
+def test_stream_start_discards_session_without_question(client, interview_env, job_seeker, monkeypatch):
+    headers, _ = job_seeker()
+
+    def failing_stream(*args, **kwargs):
+        raise RuntimeError('LLM unavailable')
+        yield
+    monkeypatch.setattr(interview_env.get_ai_service(), 'stream_question', failing_stream)
+    monkeypatch.setattr(interview_env, 'get_question_bank', lambda: None)
+
+    response = client.post('/api/interview/start/stream', headers=headers, json={
+        'job_role': 'Backend Engineer', 'interview_type': 'Technical'
+    })
+    events = sse_events(response)
+
+    session_id = events[0][1]['session_id']
+    assert events[-1][0] == 'error'
+    db.session.expire_all()
+    assert InterviewSession.query.get(session_id) is None
+
+
+def test_repeated_llm_question_is_not_asked_twice(client, interview_env, job_seeker, monkeypatch):
+    headers, _ = job_seeker()
+    first, second, third = FakeLLM.QUESTIONS[:3]
+    replies = iter([first, first, second, second, third])
+    prompts = []
+
+    def scripted_question(*args, avoid=None, **kwargs):
+        prompts.append(avoid)
+        return next(replies)
+    monkeypatch.setattr(interview_env.get_ai_service(), 'generate_question', scripted_question)
+    monkeypatch.setattr(interview_env, 'prefetch_next_question', lambda *args: None)
+
+    response = client.post('/api/interview/start', headers=headers, json={
+        'job_role': 'Backend Engineer', 'interview_type': 'Technical'
+    })
+    session_id = response.get_json()['session_id']
+    for question_number in (1, 2):
+        response = client.post('/api/interview/answer', headers=headers, json={
+            'session_id': session_id, 'question_number': question_number, 'answer': 'I would profile it first.'
+        })
+        assert response.status_code == 200
+
+    questions = [qa.question for qa in InterviewQA.query.filter_by(session_id=session_id).order_by(
+        InterviewQA.question_number
+    )]
+    assert questions == [first, second, third]
+    assert prompts[2] == [first]
+    assert QuestionBankEntry.query.filter_by(question=first).one().times_served == 1
@@ -0,0 +1,54 @@
+"""
+Interview score aggregates include sessions graded before the aggregates existed
+"""
+from models import db
+from models.interview import InterviewSession, InterviewQA, InterviewStats
+
+ANSWER = 'I would look at the query plan and add an index.'
+
+
+def legacy_graded_session(user_id, score=8):
+    """A session graded before interview_stats existed (no aggregate rows)"""
+    session = InterviewSession(user_id=user_id, job_role='Backend Engineer', interview_type='Technical',
+                               skills=['Python'], difficulty_level='Intermediate', total_questions=1)
+    db.session.add(session)
+    db.session.flush()
+    db.session.add(InterviewQA(
+        session_id=session.id, question_number=1, question='What is an index?', user_answer='A lookup structure.',
+        score=score, technical_correctness=score, clarity_score=score, relevance_score=score
+    ))
+    db.session.commit()
+    return session.id
+
+
+def test_summary_counts_legacy_answers_after_a_new_answer(client, interview_env, job_seeker):
+    headers, user_id = job_seeker()
+    legacy_graded_session(user_id)
+
+    response = client.post('/api/interview/start', headers=headers, json={
+        'job_role': 'Backend Engineer', 'interview_type': 'Technical'
+    })
+    response = client.post('/api/interview/answer', headers=headers, json={
+        'session_id': response.get_json()['session_id'], 'question_number': 1, 'answer': ANSWER
+    })
+    assert response.status_code == 200
+
+    summary = client.get('/api/interview/summary', headers=headers).get_json()
+    assert summary['overall']['answers'] == 2
+    assert summary['by_type']['Technical']['answers'] == 2
+
+
+def test_regrading_a_legacy_answer_replaces_its_grade(client, interview_env, job_seeker):
+    headers, user_id = job_seeker()
+    session_id = legacy_graded_session(user_id, score=2)
+
+    response = client.post('/api/interview/answer', headers=headers, json={
+        'session_id': session_id, 'question_number': 1, 'answer': ANSWER
+    })
+    assert response.status_code == 200
+    new_score = response.get_json()['evaluation']['score']
+
+    summary = client.get('/api/interview/summary', headers=headers).get_json()
+    assert summary['overall']['answers'] == 1
+    assert summary['overall']['average_score'] == new_score
+    assert InterviewStats.query.filter(InterviewStats.score_sum < 0).count() == 0
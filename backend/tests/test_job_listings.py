@@ -0,0 +1,59 @@
+"""
+Application and saved-job listings stay at a fixed number of queries however many rows they return
+"""
+from models import db
+from models.job import Job
+from models.application import Application, SavedJob
+from utils.query_counter import assert_max_queries
+
+LISTED = 5
+
+
+def create_jobs(recruiter_id, count):
+    jobs = [Job(title=f'Engineer {i}', company_name='Acme', recruiter_id=recruiter_id) for i in range(count)]
+    db.session.add_all(jobs)
+    db.session.flush()
+    return jobs
+
+
+def test_my_applications_query_count(client, register):
+    _, recruiter_id = register('recruiter@example.com', 'recruiter')
+    headers, seeker_id = register('seeker@example.com')
+    for job in create_jobs(recruiter_id, LISTED):
+        db.session.add(Application(user_id=seeker_id, job_id=job.id))
+    db.session.commit()
+
+    with assert_max_queries(2):
+        response = client.get('/api/jobs/my-applications', headers=headers)
+
+    assert response.status_code == 200
+    assert response.get_json()['count'] == LISTED
+
+
+def test_saved_jobs_query_count(client, register):
+    _, recruiter_id = register('recruiter@example.com', 'recruiter')
+    headers, seeker_id = register('seeker@example.com')
+    for job in create_jobs(recruiter_id, LISTED):
+        db.session.add(SavedJob(user_id=seeker_id, job_id=job.id))
+    db.session.commit()
+
+    with assert_max_queries(2):
+        response = client.get('/api/jobs/saved', headers=headers)
+
+    assert response.status_code == 200
+    assert response.get_json()['count'] == LISTED
+
+
+def test_job_applications_query_count(client, register):
+    headers, recruiter_id = register('recruiter@example.com', 'recruiter')
+    job_id = create_jobs(recruiter_id, 1)[0].id
+    for i in range(LISTED):
+        _, seeker_id = register(f'seeker{i}@example.com')
+        db.session.add(Application(user_id=seeker_id, job_id=job_id))
+    db.session.commit()
+
+    with assert_max_queries(2):
+        response = client.get(f'/api/jobs/{job_id}/applications', headers=headers)
+
+    assert response.status_code == 200
+    assert response.get_json()['count'] == LISTED
@@ -0,0 +1,23 @@
+"""
+Job board facet buckets
+"""
+from models import db
+from models.job import Job
+
+
+def test_experience_bands_match_their_labels(client, register):
+    headers, recruiter_id = register('recruiter@example.com', 'recruiter')
+    for years in (2, 5, 10, 11):
+        db.session.add(Job(title=f'{years} years', company_name='Acme', recruiter_id=recruiter_id, experience_min=years))
+    db.session.commit()
+
+    response = client.get('/api/jobs/facets', headers=headers)
+
+    assert response.status_code == 200
+    bands = {band['value']: band for band in response.get_json()['facets']['experience_band']}
+    assert [band['count'] for band in bands.values()] == [1, 1, 1, 1]
+    assert bands['6-10']['label'] == 'Senior (6-10 yrs)'
+    assert bands['11+']['label'] == 'Lead (11+ yrs)'
+
+    response = client.get('/api/jobs/?experience_band=6-10', headers=headers)
+    assert [job['title'] for job in response.get_json()['jobs']] == ['10 years']
@@ -0,0 +1,44 @@
+"""
+Circuit breaker bookkeeping of the resilient LLM client
+"""
+from types import SimpleNamespace
+import pytest
+from services.llm_client import CircuitBreaker, ResilientLLMClient
+
+
+def upstream(chunks, error=None):
+    """OpenAI-shaped client whose streams yield chunks, then raise error if given"""
+    def stream():
+        yield from chunks
+        if error:
+            raise error
+
+    def create(**request):
+        return stream()
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def test_stream_failing_midway_counts_as_breaker_failure():
+    breaker = CircuitBreaker(failure_threshold=2)
+    client = ResilientLLMClient(upstream(['a', 'b'], ConnectionResetError('dropped')), breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionResetError):
+            list(client.create(stream=True, model='m', messages=[]))
+
+    assert breaker.state == 'open'
+    assert client.counters['failed'] == 2
+
+
+def test_completed_stream_closes_half_open_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    client = ResilientLLMClient(upstream(['a', 'b']), breaker=breaker)
+
+    stream = client.create(stream=True, model='m', messages=[])
+    assert next(stream) == 'a'
+    assert breaker.state == 'half_open'
+
+    assert list(stream) == ['b']
+    assert breaker.state == 'closed'
+    assert client.counters['succeeded'] == 1
@@ -0,0 +1,46 @@
+"""
+Profile score percentiles are read-only; profiles analyzed before the histograms are counted by rebuild()
+"""
+from datetime import datetime
+from models import db
+from models.profile_links import ProfileLinks, ProfileScoreHistogram
+from services.profile_refresh import ranking
+from utils.query_counter import assert_max_queries
+
+
+def analyzed_profile(user_id, score, language='Python'):
+    profile_links = ProfileLinks(
+        user_id=user_id, github_username=f'user{user_id}', overall_score=score,
+        github_data={'top_languages': [{'language': language}]}, last_analyzed_at=datetime.utcnow()
+    )
+    db.session.add(profile_links)
+    return profile_links
+
+
+def test_percentile_does_not_backfill(client, register):
+    headers, user_id = register('seeker@example.com')
+    _, other_id = register('other@example.com')
+    analyzed_profile(user_id, 70)
+    analyzed_profile(other_id, 40)
+    db.session.commit()
+
+    with assert_max_queries(2):
+        response = client.get('/api/profile-analysis/percentile', headers=headers)
+
+    assert response.status_code == 200
+    assert ProfileScoreHistogram.query.count() == 0
+    assert ranking.has_unranked_profiles()
+
+
+def test_rebuild_counts_unranked_profiles(client, register):
+    headers, user_id = register('seeker@example.com')
+    _, other_id = register('other@example.com')
+    analyzed_profile(user_id, 70)
+    analyzed_profile(other_id, 40)
+    db.session.commit()
+
+    assert ranking.rebuild() == 2
+    assert not ranking.has_unranked_profiles()
+
+    rankings = client.get('/api/profile-analysis/percentile', headers=headers).get_json()['rankings']
+    assert [(r['segment'], r['rank'], r['total']) for r in rankings] == [('all', 1, 2), ('lang:python', 1, 2)]
@@ -0,0 +1,21 @@
+"""
+The refresh scheduler keeps GitHub's rate-limit reserve for user-facing requests
+"""
+import time
+from types import SimpleNamespace
+from services.profile_refresh import ProfileRefreshScheduler
+from services.profile_scraper import RateLimit
+
+
+def scheduler_with_quota(remaining, max_repo_pages, github_reserve=100):
+    github = RateLimit()
+    github.remaining = remaining
+    github.reset_at = time.time() + 600
+    scraper = SimpleNamespace(max_repo_pages=max_repo_pages, rate_limits={'github': github, 'leetcode': RateLimit()})
+    return ProfileRefreshScheduler(scraper, analyzer=None, github_reserve=github_reserve)
+
+
+def test_github_profile_waits_unless_a_full_scrape_fits_above_the_reserve():
+    # A scrape may request the user and up to 10 repository pages
+    assert scheduler_with_quota(remaining=110, max_repo_pages=10)._wait_time(True, False) > 0
+    assert scheduler_with_quota(remaining=112, max_repo_pages=10)._wait_time(True, False) == 0
@@ -0,0 +1,74 @@
+"""
+Vectorized batch scoring agrees with the scalar profile analysis
+"""
+import random
+import numpy  # noqa: F401 - required: the batch path must be checked, never skipped
+import pytest
+from services.profile_analyzer import ProfileAnalyzer
+
+# Values on and either side of every tier threshold, plus a wide random range
+BOUNDARIES = sorted({
+    value + offset
+    for tiers in (*ProfileAnalyzer.GITHUB_TIERS.values(), *ProfileAnalyzer.LEETCODE_TIERS.values(),
+                  ProfileAnalyzer.LEETCODE_RANKING_TIERS)
+    for value in tiers[0] for offset in (-1, 0, 1)
+} | {0})
+
+
+def metric(rng):
+    return rng.choice(BOUNDARIES) if rng.random() < 0.5 else rng.randint(0, 150000)
+
+
+def random_github(rng):
+    if rng.random() < 0.05:
+        return {}
+    if rng.random() < 0.05:
+        return {'error': 'User not found'}
+    return {
+        'public_repos': metric(rng),
+        'total_stars': metric(rng),
+        'followers': metric(rng),
+        'total_forks': metric(rng),
+        'top_languages': [{'language': f'lang{i}'} for i in range(rng.randint(0, 7))],
+    }
+
+
+def random_leetcode(rng):
+    if rng.random() < 0.05:
+        return {}
+    if rng.random() < 0.05:
+        return {'error': 'User not found'}
+    total = metric(rng) % 3000
+    hard = rng.randint(0, total)
+    return {
+        'problems_solved': {'total': total, 'hard': hard, 'medium': rng.randint(0, total - hard)},
+        'ranking': rng.choice([None, 0, metric(rng)]),
+    }
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test')
+    return ProfileAnalyzer()
+
+
+def test_batch_scores_match_scalar_scores(analyzer):
+    rng = random.Random(48)
+    github = [random_github(rng) for _ in range(5000)]
+    leetcode = [random_leetcode(rng) for _ in range(5000)]
+
+    github_scores = ProfileAnalyzer.score_github_batch(ProfileAnalyzer.github_columns(github))
+    leetcode_scores = ProfileAnalyzer.score_leetcode_batch(ProfileAnalyzer.leetcode_columns(leetcode))
+    overall_scores = ProfileAnalyzer.overall_score_batch(github_scores, leetcode_scores)
+
+    for i, (github_data, leetcode_data) in enumerate(zip(github, leetcode)):
+        github_analysis = analyzer.analyze_github_profile(github_data)
+        leetcode_analysis = analyzer.analyze_leetcode_profile(leetcode_data)
+        assert github_scores[i] == github_analysis['score'], github_data
+        assert leetcode_scores[i] == leetcode_analysis['score'], leetcode_data
+        assert overall_scores[i] == analyzer.calculate_overall_score(github_analysis, leetcode_analysis)
+
+
+def test_missing_profiles_score_zero():
+    assert ProfileAnalyzer.score_github_batch(ProfileAnalyzer.github_columns([None])).tolist() == [0]
+    assert ProfileAnalyzer.score_leetcode_batch(ProfileAnalyzer.leetcode_columns([None])).tolist() == [0]
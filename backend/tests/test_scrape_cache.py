@@ -0,0 +1,24 @@
+"""
+Where the SQLite scrape cache lives
+"""
+import os
+import pytest
+from routes.profile_analysis import scrape_cache_path
+from services.scrape_cache import create_scrape_cache
+
+
+def test_sqlite_cache_defaults_to_the_instance_folder(app, tmp_path):
+    app.config['SCRAPE_CACHE_PATH'] = None
+    app.instance_path = str(tmp_path / 'instance')
+
+    assert scrape_cache_path() == os.path.join(app.instance_path, 'scrape_cache.db')
+    assert os.path.isdir(app.instance_path)
+
+    app.config['SCRAPE_CACHE_PATH'] = str(tmp_path / 'shared.db')
+    assert scrape_cache_path() == str(tmp_path / 'shared.db')
+
+
+def test_sqlite_cache_needs_a_path(monkeypatch):
+    monkeypatch.delenv('SCRAPE_CACHE_PATH', raising=False)
+    with pytest.raises(ValueError):
+        create_scrape_cache('sqlite')
@@ -0,0 +1,37 @@
+"""
+Single-flight coalescing, in process and across workers
+"""
+from services.single_flight import SingleFlight
+
+
+class HeldLocks:
+    """Cross-worker lock table where another worker holds every lock"""
+
+    def acquire_lock(self, key, token, ttl):
+        return False
+
+    def release_lock(self, key, token):
+        pass
+
+
+def test_try_lead_registers_nothing_when_another_worker_leads():
+    flights = SingleFlight(locks=HeldLocks())
+
+    assert flights.try_lead('github_octocat') is None
+    assert flights.flights == {}
+
+    # A later caller is not left following a flight nobody runs
+    assert flights.join('github_octocat').role == 'remote'
+
+
+def test_try_lead_skips_keys_already_in_flight():
+    flights = SingleFlight()
+    leader = flights.join('github_octocat')
+
+    assert flights.try_lead('github_octocat') is None
+    flights.finish(leader, {'username': 'octocat'})
+
+    flight = flights.try_lead('github_octocat')
+    follower = flights.join('github_octocat')
+    flights.finish(flight, {'username': 'octocat', 'fresh': True})
+    assert flights.wait(follower, timeout=1) == {'username': 'octocat', 'fresh': True}
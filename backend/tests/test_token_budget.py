@@ -0,0 +1,28 @@
+"""
+Daily LLM token budgets for mock interviews
+"""
+from datetime import datetime, timedelta
+from models import db
+from models.interview import InterviewSession
+
+
+def test_tokens_count_on_the_day_they_are_spent(client, interview_env, job_seeker):
+    headers, _ = job_seeker()
+    response = client.post('/api/interview/start', headers=headers, json={
+        'job_role': 'Backend Engineer', 'interview_type': 'Technical'
+    })
+    session_id = response.get_json()['session_id']
+
+    # The session started before midnight; answering it now spends today's budget
+    InterviewSession.query.filter_by(id=session_id).update({'start_time': datetime.utcnow() - timedelta(days=1)})
+    db.session.commit()
+    response = client.post('/api/interview/answer', headers=headers, json={
+        'session_id': session_id, 'question_number': 1, 'answer': 'I would add an index.'
+    })
+    assert response.status_code == 200
+
+    session = db.session.get(InterviewSession, session_id)
+    spent = session.prompt_tokens + session.completion_tokens
+    usage = client.get('/api/interview/usage', headers=headers).get_json()
+    assert spent > 0
+    assert usage['tokens_used_today'] == spent
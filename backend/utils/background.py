@@ -0,0 +1,25 @@
+"""
+Background task utilities
+"""
+import threading
+from flask import current_app
+
+
+def run_in_background(func, *args, **kwargs):
+    """
+    Run func(*args, **kwargs) in a daemon thread inside a fresh app context
+    The thread gets its own database session; exceptions are logged, not raised
+    Returns: the started Thread
+    """
+    app = current_app._get_current_object()
+
+    def runner():
+        with app.app_context():
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                app.logger.exception(f"Background task {func.__name__} failed: {e}")
+
+    thread = threading.Thread(target=runner, name=f"bg-{func.__name__}", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,59 @@
+"""
+SQL query counting utilities for catching N+1 query regressions
+"""
+from contextlib import contextmanager
+from sqlalchemy import event
+from models import db
+
+
+class QueryCounter:
+    """Collects SQL statements executed while active"""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries():
+    """
+    Count SQL statements issued through the app's engine
+    Must be used inside an app context
+
+    Usage:
+        with count_queries() as counter:
+            client.get('/api/jobs/my-applications', headers=headers)
+        print(counter.count)
+    """
+    counter = QueryCounter()
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', counter._record)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', counter._record)
+
+
+@contextmanager
+def assert_max_queries(max_queries):
+    """
+    Fail if the wrapped block issues more than max_queries SQL statements
+
+    Usage:
+        with assert_max_queries(2):
+            client.get('/api/jobs/my-applications', headers=headers)
+    """
+    with count_queries() as counter:
+        yield counter
+
+    if counter.count > max_queries:
+        executed = '\n'.join(f'  {statement}' for statement in counter.statements)
+        raise AssertionError(
+            f'Expected at most {max_queries} queries, got {counter.count}:\n{executed}'
+        )
@@ -0,0 +1,100 @@
+"""
+LLM token counting, prompt compaction and usage accounting
+"""
+import threading
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Don't load the encoding at module level - do it lazily when needed
+encoding = None
+TRUNCATION_MARKER = ' [...] '
+
+
+def get_encoding():
+    """cl100k_base encoding, or None when tiktoken (or its data file) is unavailable"""
+    global encoding
+    if encoding is None and tiktoken is not None:
+        try:
+            encoding = tiktoken.get_encoding('cl100k_base')
+        except Exception:
+            encoding = False
+    return encoding or None
+
+
+def count_tokens(text):
+    """Token count of text (tiktoken when installed, otherwise ~4 characters per token)"""
+    if not text:
+        return 0
+    enc = get_encoding()
+    if enc:
+        return len(enc.encode(text))
+    return max(1, len(text) // 4)
+
+
+def truncate_to_tokens(text, max_tokens):
+    """
+    Compact text to roughly max_tokens, keeping the beginning and the end
+    (answers usually open with the approach and close with the result)
+    """
+    if not text or count_tokens(text) <= max_tokens:
+        return text
+
+    # Characters per token for this text, so the cut lands near the budget
+    ratio = len(text) / count_tokens(text)
+    keep = max(1, int(max_tokens * ratio)) - len(TRUNCATION_MARKER)
+    head_chars = int(keep * 2 / 3)
+    tail_chars = keep - head_chars
+
+    head = text[:head_chars].rsplit(' ', 1)[0] if ' ' in text[:head_chars] else text[:head_chars]
+    tail = text[-tail_chars:].split(' ', 1)[-1] if tail_chars > 0 else ''
+    return f"{head.rstrip()}{TRUNCATION_MARKER}{tail.lstrip()}"
+
+
+class TokenUsage:
+    """Thread-safe prompt/completion token tally for one unit of work (a QA turn, a session completion)"""
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    @property
+    def total_tokens(self):
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, prompt_tokens, completion_tokens):
+        with self.lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.calls += 1
+
+    def add_response(self, request, response):
+        """Record a chat completion, using the API's usage block when it has one"""
+        usage = getattr(response, 'usage', None)
+        if usage is not None and getattr(usage, 'prompt_tokens', None) is not None:
+            self.add(usage.prompt_tokens, usage.completion_tokens or 0)
+        else:
+            self.add_estimate(request, response.choices[0].message.content or '')
+
+    def add_estimate(self, request, completion_text):
+        """Record a call without a usage block (e.g. streamed) from counted prompt and output text"""
+        prompt_tokens = sum(count_tokens(message['content']) for message in request['messages'])
+        self.add(prompt_tokens, count_tokens(completion_text))
+
+    def merge(self, other):
+        if other is not None and other.calls:
+            with self.lock:
+                self.prompt_tokens += other.prompt_tokens
+                self.completion_tokens += other.completion_tokens
+                self.calls += other.calls
+
+    def to_dict(self):
+        return {
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'total_tokens': self.total_tokens
+        }
@@ -137,6 +137,22 @@ class APIClient {
         });
     }
 
+    async getApplicantProfiles(applicantIds) {
+        return this.request('/profile-analysis/batch', {
+            method: 'POST',
+            body: JSON.stringify({ applicant_ids: applicantIds })
+        });
+    }
+
+    async getProfilePercentile(segment = null) {
+        const query = segment ? `?segment=${encodeURIComponent(segment)}` : '';
+        return this.request(`/profile-analysis/percentile${query}`);
+    }
+
+    async getProfileSegments(minProfiles = 1) {
+        return this.request(`/profile-analysis/segments?min_profiles=${minProfiles}`);
+    }
+
     // Resume endpoints
     async uploadResume(file) {
         const formData = new FormData();
@@ -167,6 +183,11 @@ class APIClient {
         return this.request(`/jobs/?${params}`);
     }
 
+    async getJobFacets(filters = {}) {
+        const params = new URLSearchParams(filters);
+        return this.request(`/jobs/facets?${params}`);
+    }
+
     async getJob(jobId) {
         return this.request(`/jobs/${jobId}`);
     }
@@ -210,6 +231,13 @@ class APIClient {
         });
     }
 
+    async bulkUpdateApplicationStatus(applicationIds, status) {
+        return this.request('/jobs/applications/status', {
+            method: 'PUT',
+            body: JSON.stringify({ application_ids: applicationIds, status })
+        });
+    }
+
     // Recommendations endpoints
     async getRecommendations(limit = 20) {
         return this.request(`/recommendations/?limit=${limit}`);
@@ -220,10 +248,11 @@ class APIClient {
     }
 
     // Interview endpoints
-    async startInterview(jobRole, interviewType) {
+    // evaluationMode: 'live' grades each answer, 'batch' grades all answers at completion
+    async startInterview(jobRole, interviewType, evaluationMode = 'live') {
         return this.request('/interview/start', {
             method: 'POST',
-            body: JSON.stringify({ job_role: jobRole, interview_type: interviewType })
+            body: JSON.stringify({ job_role: jobRole, interview_type: interviewType, evaluation_mode: evaluationMode })
         });
     }
 
@@ -238,15 +267,81 @@ class APIClient {
         });
     }
 
-    async completeInterview(sessionId) {
+    // answers (batch sessions only): [{ question_number, answer }] answered offline
+    async completeInterview(sessionId, answers = null) {
         return this.request(`/interview/${sessionId}/complete`, {
-            method: 'POST'
+            method: 'POST',
+            body: JSON.stringify(answers ? { answers } : {})
         });
     }
 
     async getInterviewHistory() {
         return this.request('/interview/history');
     }
+
+    async getInterviewUsage() {
+        return this.request('/interview/usage');
+    }
+
+    async getInterviewSummary(interviewType = null, weeks = 12) {
+        const params = new URLSearchParams({ weeks });
+        if (interviewType) params.set('interview_type', interviewType);
+        return this.request(`/interview/summary?${params}`);
+    }
+
+    // Streaming interview endpoints (Server-Sent Events over POST)
+    async stream(endpoint, body, onEvent) {
+        const response = await fetch(`${API_BASE_URL}${endpoint}`, {
+            method: 'POST',
+            headers: this.getHeaders(),
+            body: JSON.stringify(body || {})
+        });
+
+        if (!response.ok) {
+            const data = await response.json();
+            throw new Error(data.error || 'Request failed');
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const raw = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let event = 'message';
+                let data = '';
+                for (const line of raw.split('\n')) {
+                    if (line.startsWith('event: ')) event = line.slice(7);
+                    else if (line.startsWith('data: ')) data += line.slice(6);
+                }
+                onEvent(event, data ? JSON.parse(data) : null);
+            }
+        }
+    }
+
+    async startInterviewStream(jobRole, interviewType, onEvent) {
+        return this.stream('/interview/start/stream', { job_role: jobRole, interview_type: interviewType }, onEvent);
+    }
+
+    async submitAnswerStream(sessionId, questionNumber, answer, onEvent) {
+        return this.stream('/interview/answer/stream', {
+            session_id: sessionId,
+            question_number: questionNumber,
+            answer: answer
+        }, onEvent);
+    }
+
+    async completeInterviewStream(sessionId, onEvent) {
+        return this.stream(`/interview/${sessionId}/complete/stream`, {}, onEvent);
+    }
 }
 
 // Helper functions